@@ -0,0 +1,120 @@
+"""
+메트릭 집계 벤치마크
+파드 N개의 최신 메트릭을 StorageService에 채운 뒤 집계 경로별 소요 시간 비교
+- 평균: statistics.mean 기반 이전 구현 / 정수 합계 기반 calculate_average_metrics / 컬럼 배열 커널
+- 합계/평균/최솟값/최댓값 + 네임스페이스/디플로이먼트/노드별 합계 한 번에 (aggregate_pod_batch):
+  순수 Python 경로 / NumPy 커널 (dict -> 컬럼 변환 포함) / 저장소 컬럼 표 스냅샷 + 커널 (/api/summary 경로) / 커널만
+
+사용법 (api-server 디렉터리에서):
+    python benchmarks/aggregation.py --pods 10000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import kernels
+from services.compute import MetricsComputer
+from services.storage import storage_service
+
+
+def pod_metrics(index: int, pods_per_node: int) -> Dict:
+    return {
+        'namespace': f"ns-{index % 50}",
+        'pod_name': f"app{index % 500}-{index}",
+        'node_name': f"node-{index // pods_per_node}",
+        'owner_kind': 'Deployment',
+        'owner_name': f"app{index % 500}",
+        'cpu_millicores': random.randint(0, 2000),
+        'memory_bytes': random.randint(0, 2 ** 32),
+        'disk_io': {'read_bytes': random.randint(0, 10 ** 6), 'write_bytes': random.randint(0, 10 ** 6)},
+        'network_io': {'bytes_sent': random.randint(0, 10 ** 6), 'bytes_recv': random.randint(0, 10 ** 6)}
+    }
+
+
+def preload(total_pods: int, pods_per_node: int):
+    """파드 total_pods개의 최신 메트릭을 노드별 배치로 저장"""
+    for begin in range(0, total_pods, pods_per_node):
+        pods = [pod_metrics(index, pods_per_node) for index in range(begin, min(begin + pods_per_node, total_pods))]
+        node_name = pods[0]['node_name']
+        storage_service.store_batch_metrics(node_name, None, pods)
+
+
+def best_of(function: Callable, repeat: int) -> float:
+    """repeat회 실행 중 최소 소요 시간 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - began)
+    return min(timings) * 1000
+
+
+def statistics_average(metrics_list: List[Dict]) -> Dict:
+    """statistics.mean을 쓰던 이전 calculate_average_metrics() 평균 계산 (비교 기준)"""
+    def mean(values):
+        return int(statistics.mean(values)) if values else 0
+    return kernels.to_metrics([mean(list(column)) for column in zip(*kernels.metric_rows(metrics_list))])
+
+
+def python_batch(pods: List[Dict], labels: Dict[str, List]) -> Dict:
+    """aggregate_pod_batch()의 순수 Python 경로 (numpy 미설치 시)"""
+    numpy_module, kernels.np = kernels.np, None
+    try:
+        return MetricsComputer.aggregate_pod_batch(pods, labels)
+    finally:
+        kernels.np = numpy_module
+
+
+def main():
+    parser = argparse.ArgumentParser(description='메트릭 집계 벤치마크')
+    parser.add_argument('--pods', type=int, default=10000, help='파드 수')
+    parser.add_argument('--pods-per-node', type=int, default=100, help='노드당 파드 수')
+    parser.add_argument('--repeat', type=int, default=20, help='측정 반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+
+    if not kernels.available():
+        print("numpy가 설치되어 있지 않아 비교할 수 없습니다 (pip install numpy)")
+        return
+
+    preload(args.pods, args.pods_per_node)
+    pods = storage_service.get_all_pods()
+    _, codes, values = storage_service.latest_pod_columns()
+    # dict 입력 경로는 파드별 라벨 목록, 저장소 컬럼 표 경로는 그룹 번호(GroupCodes)로 집계
+    labels = {name: group.decode() for name, group in codes.items()}
+    print(f"{len(pods)} pods, {len(set(labels['namespace']))} namespaces, "
+          f"{len(set(labels['deployment']))} deployments, {len(set(labels['node']))} nodes")
+
+    # 경로별 결과가 같은지 먼저 확인
+    assert MetricsComputer.calculate_average_metrics(pods) == statistics_average(pods)
+    batch = python_batch(pods, labels)
+    assert MetricsComputer.aggregate_pod_batch(pods, labels) == batch
+    assert MetricsComputer.aggregate_columns(values, codes) == batch
+
+    def from_storage():
+        _, storage_labels, storage_values = storage_service.latest_pod_columns()
+        return MetricsComputer.aggregate_columns(storage_values, storage_labels)
+
+    cases = [
+        ('average: statistics.mean', lambda: statistics_average(pods)),
+        ('average: calculate_average_metrics', lambda: MetricsComputer.calculate_average_metrics(pods)),
+        ('average: column kernel', lambda: kernels.summarize(values)['mean']),
+        ('batch: pure Python', lambda: python_batch(pods, labels)),
+        ('batch: numpy (dict input)', lambda: MetricsComputer.aggregate_pod_batch(pods, labels)),
+        ('batch: latest_pod_columns + kernel', from_storage),
+        ('batch: kernel on columns', lambda: MetricsComputer.aggregate_columns(values, codes))
+    ]
+
+    print(f"{'case':<38} {'ms':>8}")
+    for name, function in cases:
+        print(f"{name:<38} {best_of(function, args.repeat):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
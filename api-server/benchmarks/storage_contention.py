@@ -0,0 +1,148 @@
+"""
+StorageService 동시성 벤치마크
+threaded WSGI 서버(werkzeug)에 API 서버를 띄우고 HTTP로 부하를 걸어 측정
+- 배치 수집(POST /api/nodes/<node>/batch) 스레드 수를 늘려가며 처리량/지연 측정
+- 전체 파드 시계열 조회(GET /api/pods/timeseries)를 동시에 걸었을 때 수집 지연 변화 측정
+
+사용법 (api-server 디렉터리에서):
+    python benchmarks/storage_contention.py --pods 2000 --duration 5
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import http.client
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+
+from main import app
+from services.storage import storage_service
+
+
+def pod_metrics(namespace: str, pod_name: str, node_name: str) -> Dict:
+    return {
+        'namespace': namespace,
+        'pod_name': pod_name,
+        'node_name': node_name,
+        'owner_kind': 'Deployment',
+        'owner_name': pod_name.rsplit('-', 1)[0],
+        'cpu_millicores': random.randint(0, 2000),
+        'memory_bytes': random.randint(0, 2 ** 32),
+        'disk_io': {'read_bytes': random.randint(0, 10 ** 6), 'write_bytes': random.randint(0, 10 ** 6)},
+        'network_io': {'bytes_sent': random.randint(0, 10 ** 6), 'bytes_recv': random.randint(0, 10 ** 6)}
+    }
+
+
+def node_batch(node_name: str, pods_per_node: int) -> bytes:
+    node = pod_metrics('', node_name, node_name)
+    pods = [pod_metrics(f"ns-{index % 20}", f"{node_name}-app{index % 10}-{index}", node_name)
+            for index in range(pods_per_node)]
+    return json.dumps({'node': node, 'pods': pods}).encode('utf-8')
+
+
+def preload(total_pods: int, pods_per_node: int, points: int):
+    """파드 시리즈를 points개 샘플로 채움"""
+    nodes = max(1, total_pods // pods_per_node)
+    for _ in range(points):
+        for node_index in range(nodes):
+            node_name = f"preload-{node_index}"
+            body = json.loads(node_batch(node_name, pods_per_node))
+            storage_service.store_batch_metrics(node_name, body['node'], body['pods'])
+
+
+def request(port: int, method: str, path: str, body: bytes = None) -> float:
+    """요청 1건 소요 시간 (초)"""
+    began = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        if response.status >= 400:
+            raise RuntimeError(f"{method} {path}: HTTP {response.status}")
+    finally:
+        connection.close()
+    return time.perf_counter() - began
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def run_phase(port: int, writers: int, readers: int, duration: float, pods_per_node: int) -> Dict:
+    """writers개 수집 스레드 + readers개 조회 스레드를 duration초 동안 실행"""
+    deadline = time.monotonic() + duration
+    write_latencies: List[List[float]] = [[] for _ in range(writers)]
+    read_latencies: List[List[float]] = [[] for _ in range(readers)]
+    # 요청 본문은 미리 만들어 클라이언트 측 JSON 생성 비용을 측정에서 제외
+    bodies = [node_batch(f"bench-{index}", pods_per_node) for index in range(writers)]
+
+    def write_loop(index: int):
+        while time.monotonic() < deadline:
+            write_latencies[index].append(request(port, 'POST', f"/api/nodes/bench-{index}/batch", bodies[index]))
+
+    def read_loop(index: int):
+        while time.monotonic() < deadline:
+            read_latencies[index].append(request(port, 'GET', '/api/pods/timeseries?window=3600'))
+
+    threads = [threading.Thread(target=write_loop, args=(index,)) for index in range(writers)]
+    threads += [threading.Thread(target=read_loop, args=(index,)) for index in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    writes = [latency for latencies in write_latencies for latency in latencies]
+    reads = [latency for latencies in read_latencies for latency in latencies]
+    return {
+        'writers': writers,
+        'readers': readers,
+        'write_rps': len(writes) / duration,
+        'write_p50_ms': percentile(writes, 0.5) * 1000,
+        'write_p99_ms': percentile(writes, 0.99) * 1000,
+        'read_rps': len(reads) / duration
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='StorageService 동시성 벤치마크')
+    parser.add_argument('--pods', type=int, default=2000, help='미리 채울 파드 수')
+    parser.add_argument('--points', type=int, default=20, help='파드별 미리 채울 샘플 수')
+    parser.add_argument('--pods-per-node', type=int, default=100, help='배치 1건의 파드 수')
+    parser.add_argument('--duration', type=float, default=5.0, help='단계별 측정 시간 (초)')
+    parser.add_argument('--threads', default='1,2,4,8', help='수집 스레드 수 목록')
+    parser.add_argument('--readers', type=int, default=2, help='동시 조회 스레드 수')
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    print(f"preload: {args.pods} pods x {args.points} points")
+    preload(args.pods, args.pods_per_node, args.points)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    print(f"{'writers':>7} {'readers':>7} {'write req/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'read req/s':>10}")
+    for readers in (0, args.readers):
+        for writers in (int(value) for value in args.threads.split(',')):
+            result = run_phase(port, writers, readers, args.duration, args.pods_per_node)
+            print(f"{result['writers']:>7} {result['readers']:>7} {result['write_rps']:>11.1f} "
+                  f"{result['write_p50_ms']:>8.1f} {result['write_p99_ms']:>8.1f} {result['read_rps']:>10.1f}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
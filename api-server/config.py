@@ -8,13 +8,52 @@ class Config:
     
     # 메모리 저장 관련 설정
     MAX_DATA_POINTS = int(os.environ.get('MAX_DATA_POINTS', 1000))
+    # 압축 청크 1개의 샘플 수 (가장 최근 청크만 비압축으로 유지)
+    SERIES_CHUNK_SIZE = int(os.environ.get('SERIES_CHUNK_SIZE', 120))
+    # 시리즈 정리: 마지막 기록 후 SERIES_TTL초가 지난 시리즈 제거 (0이면 비활성), SERIES_SWEEP_INTERVAL초마다 검사
+    SERIES_TTL = int(os.environ.get('SERIES_TTL', 3600))
+    SERIES_SWEEP_INTERVAL = int(os.environ.get('SERIES_SWEEP_INTERVAL', 60))
+    # 전체 시리즈 수 상한 (초과 시 가장 오래 기록되지 않은 시리즈부터 제거, 0이면 무제한)
+    MAX_SERIES = int(os.environ.get('MAX_SERIES', 50000))
+    # 시계열 버퍼 lock 분할 수 (시리즈 key 해시로 분배)
+    STORAGE_LOCK_STRIPES = int(os.environ.get('STORAGE_LOCK_STRIPES', 64))
+    
+    # 네임스페이스/디플로이먼트 집계 시계열 기록 주기 (초)
+    ROLLUP_INTERVAL = int(os.environ.get('ROLLUP_INTERVAL', 30))
     
     # 시계열 조회 기본 윈도우 (초)
     DEFAULT_TIME_WINDOW = int(os.environ.get('DEFAULT_TIME_WINDOW', 3600))
+    # 시리즈별 조회 포인트 예산 (초과하면 예산에 맞는 다운샘플링 단계에서 조회)
+    TIMESERIES_MAX_POINTS = int(os.environ.get('TIMESERIES_MAX_POINTS', 1000))
+    # 다운샘플링 단계 (해상도초:보존초, 보존 기간은 METRICS_RETENTION_DAYS로 제한)
+    # 원본 MAX_DATA_POINTS(30초 주기 약 8시간)가 짧은 윈도우를 담당하므로 10분/1시간 단계만 기본으로 유지
+    # (보존 기간을 모두 채운 시리즈당 약 40KB, 원본/최신 데이터 포함 약 60KB: MAX_SERIES 40000이면 약 2.3Gi)
+    DOWNSAMPLE_TIERS = os.environ.get('DOWNSAMPLE_TIERS', '600:172800,3600:604800')
     
     # POST API 메트릭 수집 관련 설정
     MAX_METRICS_SIZE = int(os.environ.get('MAX_METRICS_SIZE', 1048576))  # 1MB
     METRICS_RETENTION_DAYS = int(os.environ.get('METRICS_RETENTION_DAYS', 7))
+    # collector 수집 시각 허용 범위 (초): 실시간 전송 샘플이 서버 시각보다 이만큼 넘게 과거면 범위 끝으로 제한
+    # (미래 시각은 항상 서버 시각으로 제한, 스풀 재전송 샘플은 과거 시각 유지)
+    MAX_CLOCK_SKEW = int(os.environ.get('MAX_CLOCK_SKEW', 120))
+    
+    # 디스크 영속화 (비어 있으면 메모리에만 저장)
+    STORAGE_DIR = os.environ.get('STORAGE_DIR', '')
+    SEGMENT_DURATION = int(os.environ.get('SEGMENT_DURATION', 3600))  # 세그먼트 구간 (초, 다운샘플링 해상도의 배수)
+    SEGMENT_SEAL_DELAY = int(os.environ.get('SEGMENT_SEAL_DELAY', 120))  # 구간 종료 후 봉인까지 대기 (초)
+    SEGMENT_COMPACT_DURATION = int(os.environ.get('SEGMENT_COMPACT_DURATION', 86400))  # 세그먼트 병합 단위 (초)
+    WAL_FSYNC_INTERVAL = float(os.environ.get('WAL_FSYNC_INTERVAL', 1.0))  # WAL fsync 주기 (초, 0이면 레코드마다)
+    
+    # 수집 모드: push (collector가 POST) / pull (서버가 collector /snapshot 수집)
+    COLLECTION_MODE = os.environ.get('COLLECTION_MODE', 'push').lower()
+    SCRAPE_INTERVAL = int(os.environ.get('SCRAPE_INTERVAL', 30))  # 수집 주기 (초)
+    SCRAPE_TIMEOUT = float(os.environ.get('SCRAPE_TIMEOUT', 5))  # 대상별 타임아웃 (초)
+    SCRAPE_WORKERS = int(os.environ.get('SCRAPE_WORKERS', 8))  # 동시 수집 워커 수
+    SCRAPE_TARGETS = os.environ.get('SCRAPE_TARGETS', '')  # 정적 대상 목록 (host:port,...)
+    SCRAPE_SERVICE = os.environ.get('SCRAPE_SERVICE', 'collector-headless.default.svc.cluster.local')
+    SCRAPE_PORT = int(os.environ.get('SCRAPE_PORT', 9105))
+    SCRAPE_DISCOVERY_INTERVAL = int(os.environ.get('SCRAPE_DISCOVERY_INTERVAL', 60))  # 대상 재발견 주기 (초)
+    SCRAPE_STALENESS_INTERVALS = int(os.environ.get('SCRAPE_STALENESS_INTERVALS', 3))  # stale 판정 주기 수
     
     # 실시간 계산 관련 설정
     ENABLE_REALTIME_AGGREGATION = os.environ.get('ENABLE_REALTIME_AGGREGATION', 'True').lower() == 'true'
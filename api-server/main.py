@@ -1,7 +1,9 @@
 # API 서버 진입점
+import os
 from flask import Flask
 from flask_cors import CORS
 from config import Config
+from middleware import RequestDecompressionMiddleware
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -9,10 +11,16 @@ app.config.from_object(Config)
 # CORS 설정
 CORS(app)
 
+# 압축된 요청 본문(gzip/zstd) 해제
+app.wsgi_app = RequestDecompressionMiddleware(app.wsgi_app, max_size=Config.MAX_METRICS_SIZE)
+
 # 블루프린트 등록
 from routes import register_blueprints
 register_blueprints(app)
 
+from services.scraper import scrape_service
+from services.storage import storage_service
+
 @app.route('/', methods=['GET'])
 def health_check():
     """헬스 체크 엔드포인트"""
@@ -26,7 +34,8 @@ def health_check():
                 'list_all': 'GET /api/nodes',
                 'get_single': 'GET /api/nodes/<node_name>',
                 'get_pods': 'GET /api/nodes/<node_name>/pods',
-                'post_metrics': 'POST /api/nodes/<node_name>/metrics'
+                'post_metrics': 'POST /api/nodes/<node_name>/metrics',
+                'post_batch': 'POST /api/nodes/<node_name>/batch (node + pods in one request, JSON or application/x-metrics-compact)'
             },
             'pods': {
                 'list_all': 'GET /api/pods',
@@ -43,6 +52,12 @@ def health_check():
                 'get_single': 'GET /api/namespaces/<namespace>/deployments/<deployment_name>',
                 'get_pods': 'GET /api/namespaces/<namespace>/deployments/<deployment_name>/pods'
             },
+            'scrape': {
+                'targets': 'GET /api/scrape/targets (pull mode target status)'
+            },
+            'storage': {
+                'stats': 'GET /api/storage/stats (series counts and evictions)'
+            },
             'timeseries': {
                 'nodes': 'GET /api/nodes/<node_name>/timeseries?window=<seconds>',
                 'pods': 'GET /api/pods/<pod_name>/timeseries?namespace=<namespace>&window=<seconds>',
@@ -57,4 +72,16 @@ def health_check():
     }
 
 if __name__ == '__main__':
+    # 디스크 영속화: 세그먼트/WAL에서 복원 후 수집 시작 (debug 리로더의 부모 프로세스에서는 열지 않음)
+    if Config.STORAGE_DIR and (not Config.DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        storage_service.enable_persistence(Config.STORAGE_DIR)
+    
+    # 오래 기록되지 않은 시리즈 정리 스레드 시작
+    if not Config.DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        storage_service.start_eviction()
+    
+    # pull 모드: collector 스냅샷 수집 시작 (debug 리로더의 부모 프로세스에서는 시작하지 않음)
+    if Config.COLLECTION_MODE == 'pull' and (not Config.DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        scrape_service.start()
+    
     app.run(host='0.0.0.0', port=app.config.get('PORT', 5000), debug=app.config.get('DEBUG', True)) 
\ No newline at end of file
@@ -0,0 +1,78 @@
+# 요청 본문 압축 해제 미들웨어
+# collector가 보낸 gzip/zstd 압축 본문을 라우트 도달 전에 투명하게 해제
+
+import io
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd는 선택 의존성
+    zstandard = None
+
+
+class RequestDecompressionMiddleware:
+    """Content-Encoding(gzip, zstd) 요청 본문을 해제하는 WSGI 미들웨어"""
+    
+    def __init__(self, app, max_size: int):
+        self.app = app
+        self.max_size = max_size
+    
+    def __call__(self, environ, start_response):
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if not encoding or encoding == 'identity':
+            return self.app(environ, start_response)
+        
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        compressed = environ['wsgi.input'].read(length) if length > 0 else b''
+        
+        try:
+            body = self._decompress(encoding, compressed)
+        except UnsupportedEncodingError:
+            return self._error(start_response, '415 Unsupported Media Type',
+                               f'Unsupported Content-Encoding: {encoding}')
+        except PayloadTooLargeError:
+            return self._error(start_response, '413 Payload Too Large',
+                               f'Decompressed body exceeds {self.max_size} bytes')
+        except Exception as e:
+            return self._error(start_response, '400 Bad Request', f'Invalid compressed body: {e}')
+        
+        # 해제된 본문으로 교체하여 Flask는 일반 JSON 요청으로 처리
+        environ['wsgi.input'] = io.BytesIO(body)
+        environ['CONTENT_LENGTH'] = str(len(body))
+        del environ['HTTP_CONTENT_ENCODING']
+        return self.app(environ, start_response)
+    
+    def _decompress(self, encoding: str, data: bytes) -> bytes:
+        """압축 해제 (해제 후 크기를 max_size로 제한)"""
+        if encoding == 'gzip':
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            body = decompressor.decompress(data, self.max_size + 1)
+        elif encoding == 'zstd' and zstandard is not None:
+            decompressor = zstandard.ZstdDecompressor()
+            with decompressor.stream_reader(io.BytesIO(data)) as reader:
+                body = reader.read(self.max_size + 1)
+        else:
+            raise UnsupportedEncodingError(encoding)
+        
+        if len(body) > self.max_size:
+            raise PayloadTooLargeError(len(body))
+        return body
+    
+    @staticmethod
+    def _error(start_response, status: str, message: str):
+        """JSON 에러 응답"""
+        body = ('{"error": "%s"}' % message.replace('"', "'")).encode('utf-8')
+        start_response(status, [('Content-Type', 'application/json'),
+                                ('Content-Length', str(len(body)))])
+        return [body]
+
+
+class UnsupportedEncodingError(Exception):
+    """지원하지 않는 Content-Encoding"""
+
+
+class PayloadTooLargeError(Exception):
+    """해제된 본문이 허용 크기 초과"""
@@ -1,6 +1,6 @@
 # Models Package
 # API 응답 스키마와 데이터 모델들
 
-from .response_schemas import ResponseSchema, MetricsSchema, TimeseriesSchema
+from .response_schemas import ResponseSchema, MetricsSchema, BatchSchema, TimeseriesSchema
 
-__all__ = ['ResponseSchema', 'MetricsSchema', 'TimeseriesSchema'] 
\ No newline at end of file
+__all__ = ['ResponseSchema', 'MetricsSchema', 'BatchSchema', 'TimeseriesSchema'] 
\ No newline at end of file
@@ -30,6 +30,37 @@ class ResponseSchema:
 class MetricsSchema:
     """메트릭 데이터 스키마"""
     
+    # POST 메트릭 필수 필드
+    NODE_REQUIRED_FIELDS = ['cpu_millicores', 'memory_bytes', 'disk_io', 'network_io']
+    POD_REQUIRED_FIELDS = ['cpu_millicores', 'memory_bytes', 'disk_io', 'network_io', 'node_name']
+    
+    @staticmethod
+    def find_missing_field(metrics: Dict[str, Any], required_fields: List[str]) -> Optional[str]:
+        """필수 필드 중 누락된 첫 번째 필드 반환 (없으면 None)"""
+        for field in required_fields:
+            if field not in metrics:
+                return field
+        return None
+    
+    # 고빈도 샘플 요약 통계 필드 (collector SAMPLE_INTERVAL 샘플의 보고 주기별 요약)
+    SUMMARY_STATS = ['min', 'max', 'mean', 'last', 'p95']
+    
+    @staticmethod
+    def find_invalid_summary(metrics: Dict[str, Any]) -> Optional[str]:
+        """선택 필드 summary 검증, 잘못된 경우 오류 메시지 반환 (없거나 올바르면 None)"""
+        summary = metrics.get('summary')
+        if summary is None:
+            return None
+        if not isinstance(summary, dict):
+            return 'summary must be an object'
+        for metric, stats in summary.items():
+            if not isinstance(stats, dict):
+                return f'summary.{metric} must be an object'
+            for stat in MetricsSchema.SUMMARY_STATS:
+                if not isinstance(stats.get(stat), (int, float)):
+                    return f'summary.{metric}.{stat} must be a number'
+        return None
+    
     @staticmethod
     def node_metrics_schema() -> Dict[str, str]:
         """노드 메트릭 스키마"""
@@ -51,6 +82,10 @@ class MetricsSchema:
                 'bytes_recv': 'integer',
                 'mb_sent': 'float (computed)',
                 'mb_recv': 'float (computed)'
+            },
+            'summary': {
+                'cpu_millicores': '{min, max, mean, last, p95, count} (optional)',
+                'memory_bytes': '{min, max, mean, last, p95, count} (optional)'
             }
         }
     
@@ -84,6 +119,27 @@ class MetricsSchema:
         })
         return schema
 
+class BatchSchema:
+    """배치 수집 스키마 (collector 1회 수집 주기 = 1회 요청)"""
+    
+    @staticmethod
+    def batch_request_schema() -> Dict[str, Any]:
+        """배치 요청 스키마"""
+        return {
+            'node': 'node metrics object (optional)',
+            'pods': 'array of pod metrics objects (namespace, pod_name 필수)'
+        }
+    
+    @staticmethod
+    def batch_response_schema() -> Dict[str, Any]:
+        """배치 응답 스키마 (항목별 성공/실패)"""
+        return {
+            'node': {'status': 'stored | failed', 'error': 'string (실패 시)'},
+            'pods': 'array of {namespace, pod_name, status, error}',
+            'stored': 'integer',
+            'failed': 'integer'
+        }
+
 class TimeseriesSchema:
     """시계열 데이터 스키마"""
     
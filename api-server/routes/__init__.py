@@ -3,6 +3,9 @@ from .pods import pods_bp
 from .namespaces import namespaces_bp
 from .deployments import deployments_bp
 from .timeseries import timeseries_bp
+from .scrape import scrape_bp
+from .storage import storage_bp
+from .summary import summary_bp
 
 def register_blueprints(app):
     """Flask 앱에 블루프린트 등록"""
@@ -10,4 +13,7 @@ def register_blueprints(app):
     app.register_blueprint(pods_bp)
     app.register_blueprint(namespaces_bp)
     app.register_blueprint(deployments_bp)
-    app.register_blueprint(timeseries_bp) 
\ No newline at end of file
+    app.register_blueprint(timeseries_bp)
+    app.register_blueprint(scrape_bp)
+    app.register_blueprint(storage_bp)
+    app.register_blueprint(summary_bp) 
\ No newline at end of file
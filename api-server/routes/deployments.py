@@ -49,16 +49,13 @@ def get_deployment(namespace, deployment_name):
 def get_namespace_deployment_pods(namespace, deployment_name):
     """특정 네임스페이스의 디플로이먼트의 파드 목록 및 리소스 사용량"""
     try:
-        # 해당 네임스페이스와 디플로이먼트에 속하는 파드들을 찾기
+        # 소유자 인덱스로 해당 디플로이먼트에 속하는 파드들을 찾기
         deployment_pods = []
-        for pod in storage_service.get_all_pods():
-            # 파드가 해당 네임스페이스에 속하고, 디플로이먼트 이름이 포함되어 있는 경우
-            if (pod.get('namespace') == namespace and 
-                deployment_name in pod.get('pod_name', '')):
-                # deployment_name 필드 추가
-                pod_with_deployment = pod.copy()
-                pod_with_deployment['deployment_name'] = deployment_name
-                deployment_pods.append(pod_with_deployment)
+        for pod in storage_service.get_pods_by_deployment(namespace, deployment_name):
+            # deployment_name 필드 추가
+            pod_with_deployment = pod.copy()
+            pod_with_deployment['deployment_name'] = deployment_name
+            deployment_pods.append(pod_with_deployment)
         
         return jsonify(deployment_pods), 200
     except Exception as e:
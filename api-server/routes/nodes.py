@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
 from services.storage import storage_service
 from services.compute import metrics_computer
+from services.wire import compact_decoder, CompactSessionError, COMPACT_CONTENT_TYPE
+from models.response_schemas import MetricsSchema
 
 nodes_bp = Blueprint('nodes', __name__)
 
@@ -58,13 +60,17 @@ def post_node_metrics(node_name):
             return jsonify({'error': 'Empty JSON body'}), 400
         
         # 필수 필드 검증
-        required_fields = ['cpu_millicores', 'memory_bytes', 'disk_io', 'network_io']
-        for field in required_fields:
-            if field not in metrics:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        missing_field = MetricsSchema.find_missing_field(metrics, MetricsSchema.NODE_REQUIRED_FIELDS)
+        if missing_field:
+            return jsonify({'error': f'Missing required field: {missing_field}'}), 400
         
-        # 메트릭 저장
-        success = storage_service.store_node_metrics(node_name, metrics)
+        summary_error = MetricsSchema.find_invalid_summary(metrics)
+        if summary_error:
+            return jsonify({'error': summary_error}), 400
+        
+        # 메트릭 저장 (스풀에서 재전송된 메트릭은 수집 시점 타임스탬프 유지)
+        replayed = bool(metrics.pop('replayed', False))
+        success = storage_service.store_node_metrics(node_name, metrics, keep_timestamp=replayed)
         if success:
             return jsonify({'message': f'Node {node_name} metrics stored successfully'}), 201
         else:
@@ -72,3 +78,139 @@ def post_node_metrics(node_name):
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+def _store_node_batch(node_name, batch):
+    """배치 1건 검증 및 저장, 항목별 결과 반환 (잘못된 배치는 ValueError)"""
+    if not isinstance(batch, dict):
+        raise ValueError('Batch must be an object')
+    
+    node_metrics = batch.get('node')
+    pod_metrics_list = batch.get('pods') or []
+    if not isinstance(pod_metrics_list, list):
+        raise ValueError('Field pods must be a list')
+    
+    # 항목별 collector 수집 시각으로 저장 (스풀에서 재전송된 배치는 과거 시각도 유지)
+    replayed = bool(batch.get('replayed', False))
+    
+    results = {'node': None, 'pods': []}
+    
+    # 노드 메트릭 검증
+    if node_metrics is not None:
+        missing_field = MetricsSchema.find_missing_field(node_metrics, MetricsSchema.NODE_REQUIRED_FIELDS)
+        if missing_field:
+            error = f'Missing required field: {missing_field}'
+        else:
+            error = MetricsSchema.find_invalid_summary(node_metrics)
+        if error:
+            results['node'] = {'status': 'failed', 'error': error}
+            node_metrics = None
+    
+    # 파드 메트릭 검증 (항목별로 거부, 나머지는 저장)
+    valid_pods = []
+    for index, pod_metrics in enumerate(pod_metrics_list):
+        error = None
+        if not isinstance(pod_metrics, dict):
+            error = 'Pod metrics must be an object'
+        else:
+            missing_field = MetricsSchema.find_missing_field(
+                pod_metrics, ['namespace', 'pod_name'] + MetricsSchema.POD_REQUIRED_FIELDS
+            )
+            if missing_field:
+                error = f'Missing required field: {missing_field}'
+            else:
+                error = MetricsSchema.find_invalid_summary(pod_metrics)
+        
+        if error:
+            results['pods'].append({
+                'namespace': pod_metrics.get('namespace') if isinstance(pod_metrics, dict) else None,
+                'pod_name': pod_metrics.get('pod_name') if isinstance(pod_metrics, dict) else None,
+                'status': 'failed',
+                'error': error
+            })
+        else:
+            results['pods'].append(None)
+            valid_pods.append((index, pod_metrics))
+    
+    # 유효한 항목만 한 번의 lock 획득으로 저장
+    stored = storage_service.store_batch_metrics(
+        node_name, node_metrics, [pod_metrics for _, pod_metrics in valid_pods],
+        keep_timestamp=replayed
+    )
+    if stored['node'] is not None:
+        results['node'] = stored['node']
+    for (index, _), pod_result in zip(valid_pods, stored['pods']):
+        results['pods'][index] = pod_result
+    
+    return _count_batch_results(results)
+
+def _count_batch_results(results):
+    """배치 결과에 저장/실패 항목 수 추가"""
+    item_results = results['pods'] + ([results['node']] if results['node'] else [])
+    results['stored'] = sum(1 for item in item_results if item['status'] == 'stored')
+    results['failed'] = len(item_results) - results['stored']
+    return results
+
+def _merge_batch_results(batch_results):
+    """여러 배치 결과를 하나의 응답으로 합침"""
+    return {
+        'batches': batch_results,
+        'stored': sum(result['stored'] for result in batch_results),
+        'failed': sum(result['failed'] for result in batch_results)
+    }
+
+def _post_compact_batch(node_name):
+    """
+    compact 바이너리 배치 수집 (디코딩 결과는 스키마가 고정이므로 검증 없이 값을 시계열 컬럼에 바로 저장)
+    레코드별 수집 시각으로 저장하며, 재전송 프레임은 JSON 경로와 같이 과거 시각 유지
+    """
+    try:
+        batches = compact_decoder.decode(node_name, request.get_data())
+    except CompactSessionError as e:
+        # collector가 세션을 재설정하고 전체 값을 다시 보내도록 409 반환
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    batch_results = [
+        _count_batch_results(storage_service.store_compact_batch(node_name, batch))
+        for batch in batches
+    ]
+    results = batch_results[0] if len(batch_results) == 1 else _merge_batch_results(batch_results)
+    
+    status_code = 201 if results['failed'] == 0 else 207
+    return jsonify(results), status_code
+
+@nodes_bp.route('/api/nodes/<node_name>/batch', methods=['POST'])
+def post_node_batch(node_name):
+    """
+    노드 + 노드 내 파드 메트릭 일괄 수집 (DaemonSet 1회 수집 주기 = 1회 요청)
+    배치 배열을 보내면 순서대로 저장 (스풀 재전송용)
+    Content-Type이 application/x-metrics-compact이면 compact 바이너리 형식으로 디코딩
+    """
+    try:
+        if request.mimetype == COMPACT_CONTENT_TYPE:
+            return _post_compact_batch(node_name)
+        
+        # JSON 데이터 검증
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        body = request.get_json()
+        if not body:
+            return jsonify({'error': 'Empty JSON body'}), 400
+        
+        try:
+            if isinstance(body, list):
+                batch_results = [_store_node_batch(node_name, batch) for batch in body]
+                results = _merge_batch_results(batch_results)
+            else:
+                results = _store_node_batch(node_name, body)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # 일부 항목 실패 시 207 Multi-Status
+        status_code = 201 if results['failed'] == 0 else 207
+        return jsonify(results), status_code
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from services.storage import storage_service
 from services.compute import metrics_computer
+from models.response_schemas import MetricsSchema
 
 pods_bp = Blueprint('pods', __name__)
 
@@ -19,15 +20,9 @@ def get_pods():
 def get_pod(pod_name):
     """특정 파드의 실시간 리소스 사용량 (모든 네임스페이스에서 검색)"""
     try:
-        # 모든 파드에서 해당 이름의 파드들을 찾기
-        matching_pods = []
-        all_pods = storage_service.get_all_pods()
-        
-        for pod in all_pods:
-            if pod.get('pod_name') == pod_name:
-                # 계산된 필드 추가
-                enhanced_pod = metrics_computer.add_computed_fields(pod)
-                matching_pods.append(enhanced_pod)
+        # 파드 이름 인덱스로 모든 네임스페이스의 같은 이름 파드들을 찾기
+        matching_pods = [metrics_computer.add_computed_fields(pod)
+                         for pod in storage_service.get_pods_by_name(pod_name)]
         
         if not matching_pods:
             return jsonify({'error': f'Pod {pod_name} not found in any namespace'}), 404
@@ -49,13 +44,17 @@ def post_pod_metrics(namespace, pod_name):
             return jsonify({'error': 'Empty JSON body'}), 400
         
         # 필수 필드 검증
-        required_fields = ['cpu_millicores', 'memory_bytes', 'disk_io', 'network_io', 'node_name']
-        for field in required_fields:
-            if field not in metrics:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        missing_field = MetricsSchema.find_missing_field(metrics, MetricsSchema.POD_REQUIRED_FIELDS)
+        if missing_field:
+            return jsonify({'error': f'Missing required field: {missing_field}'}), 400
+        
+        summary_error = MetricsSchema.find_invalid_summary(metrics)
+        if summary_error:
+            return jsonify({'error': summary_error}), 400
         
-        # 메트릭 저장
-        success = storage_service.store_pod_metrics(namespace, pod_name, metrics)
+        # 메트릭 저장 (스풀에서 재전송된 메트릭은 수집 시점 타임스탬프 유지)
+        replayed = bool(metrics.pop('replayed', False))
+        success = storage_service.store_pod_metrics(namespace, pod_name, metrics, keep_timestamp=replayed)
         if success:
             return jsonify({'message': f'Pod {pod_name} metrics in namespace {namespace} stored successfully'}), 201
         else:
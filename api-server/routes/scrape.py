@@ -0,0 +1,12 @@
+from flask import Blueprint, jsonify
+from services.scraper import scrape_service
+
+scrape_bp = Blueprint('scrape', __name__)
+
+@scrape_bp.route('/api/scrape/targets', methods=['GET'])
+def get_scrape_targets():
+    """pull 모드 수집 대상 상태 (마지막 수집 시각, 소요 시간, 오류, stale 여부)"""
+    try:
+        return jsonify(scrape_service.get_status()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
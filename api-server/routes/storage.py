@@ -0,0 +1,12 @@
+from flask import Blueprint, jsonify
+from services.storage import storage_service
+
+storage_bp = Blueprint('storage', __name__)
+
+@storage_bp.route('/api/storage/stats', methods=['GET'])
+def get_storage_stats():
+    """종류별 시리즈 수와 TTL/상한 초과로 제거된 시리즈 수 (메모리 용량 산정용)"""
+    try:
+        return jsonify(storage_service.get_series_stats()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
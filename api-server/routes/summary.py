@@ -0,0 +1,12 @@
+from flask import Blueprint, jsonify
+from services.storage import storage_service
+
+summary_bp = Blueprint('summary', __name__)
+
+@summary_bp.route('/api/summary', methods=['GET'])
+def get_summary():
+    """전체 파드 합계/평균/최솟값/최댓값과 네임스페이스/디플로이먼트/노드별 합계 (일괄 집계 커널)"""
+    try:
+        return jsonify(storage_service.get_pod_summary()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
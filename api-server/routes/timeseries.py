@@ -12,26 +12,22 @@ def get_node_timeseries(node_name=None):
     try:
         # window 파라미터 가져오기 (기본값: 1시간)
         window = request.args.get('window', Config.DEFAULT_TIME_WINDOW, type=int)
+        # 시리즈별 포인트 예산 (초과하면 다운샘플링 단계에서 조회)
+        max_points = request.args.get('max_points', Config.TIMESERIES_MAX_POINTS, type=int)
         
         if node_name is None:
             # 모든 노드의 시계열 데이터
-            all_nodes_data = []
-            for node in storage_service.latest_nodes.keys():
-                node_data = storage_service.get_node_timeseries(node, window)
-                all_nodes_data.extend(node_data)
-            
-            # 시간순 정렬 및 압축
-            all_nodes_data.sort(key=lambda x: x.get('timestamp', ''))
-            compressed_data = metrics_computer.compress_timeseries(all_nodes_data)
+            # 시간순 병합 및 압축 (응답에 포함될 샘플만 변환)
+            compressed_data = storage_service.get_all_node_timeseries(window, max_points)
             return jsonify(compressed_data), 200
         else:
             # 특정 노드의 시계열 데이터
-            node_data = storage_service.get_node_timeseries(node_name, window)
+            node_data = storage_service.get_node_timeseries(node_name, window, max_points)
             if not node_data:
                 return jsonify({'error': f'No timeseries data found for node {node_name}'}), 404
             
-            # 데이터 압축 적용
-            compressed_data = metrics_computer.compress_timeseries(node_data)
+            # 저장소가 max_points 예산에 맞는 단계를 골랐으므로 같은 예산으로만 제한 (예산을 맞추는 단계가 없을 때)
+            compressed_data = metrics_computer.compress_timeseries(node_data, max_points)
             return jsonify(compressed_data), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -43,29 +39,23 @@ def get_pod_timeseries(pod_name=None):
     try:
         # window 파라미터 가져오기 (기본값: 1시간)
         window = request.args.get('window', Config.DEFAULT_TIME_WINDOW, type=int)
+        # 시리즈별 포인트 예산 (초과하면 다운샘플링 단계에서 조회)
+        max_points = request.args.get('max_points', Config.TIMESERIES_MAX_POINTS, type=int)
         namespace = request.args.get('namespace', 'default')
         
         if pod_name is None:
             # 모든 파드의 시계열 데이터
-            all_pods_data = []
-            for pod_key in storage_service.latest_pods.keys():
-                if '/' in pod_key:
-                    ns, pname = pod_key.split('/', 1)
-                    pod_data = storage_service.get_pod_timeseries(ns, pname, window)
-                    all_pods_data.extend(pod_data)
-            
-            # 시간순 정렬 및 압축
-            all_pods_data.sort(key=lambda x: x.get('timestamp', ''))
-            compressed_data = metrics_computer.compress_timeseries(all_pods_data)
+            # 시간순 병합 및 압축 (응답에 포함될 샘플만 변환)
+            compressed_data = storage_service.get_all_pod_timeseries(window, max_points)
             return jsonify(compressed_data), 200
         else:
             # 특정 파드의 시계열 데이터
-            pod_data = storage_service.get_pod_timeseries(namespace, pod_name, window)
+            pod_data = storage_service.get_pod_timeseries(namespace, pod_name, window, max_points)
             if not pod_data:
                 return jsonify({'error': f'No timeseries data found for pod {pod_name} in namespace {namespace}'}), 404
             
-            # 데이터 압축 적용
-            compressed_data = metrics_computer.compress_timeseries(pod_data)
+            # 저장소가 max_points 예산에 맞는 단계를 골랐으므로 같은 예산으로만 제한 (예산을 맞추는 단계가 없을 때)
+            compressed_data = metrics_computer.compress_timeseries(pod_data, max_points)
             return jsonify(compressed_data), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -77,26 +67,22 @@ def get_namespace_timeseries(namespace_name=None):
     try:
         # window 파라미터 가져오기 (기본값: 1시간)
         window = request.args.get('window', Config.DEFAULT_TIME_WINDOW, type=int)
+        # 시리즈별 포인트 예산 (초과하면 다운샘플링 단계에서 조회)
+        max_points = request.args.get('max_points', Config.TIMESERIES_MAX_POINTS, type=int)
         
         if namespace_name is None:
             # 모든 네임스페이스의 시계열 데이터
-            all_ns_data = []
-            for ns in storage_service.latest_namespaces.keys():
-                ns_data = storage_service.get_namespace_timeseries(ns, window)
-                all_ns_data.extend(ns_data)
-            
-            # 시간순 정렬 및 압축
-            all_ns_data.sort(key=lambda x: x.get('timestamp', ''))
-            compressed_data = metrics_computer.compress_timeseries(all_ns_data)
+            # 시간순 병합 및 압축 (응답에 포함될 샘플만 변환)
+            compressed_data = storage_service.get_all_namespace_timeseries(window, max_points)
             return jsonify(compressed_data), 200
         else:
             # 특정 네임스페이스의 시계열 데이터
-            ns_data = storage_service.get_namespace_timeseries(namespace_name, window)
+            ns_data = storage_service.get_namespace_timeseries(namespace_name, window, max_points)
             if not ns_data:
                 return jsonify({'error': f'No timeseries data found for namespace {namespace_name}'}), 404
             
-            # 데이터 압축 적용
-            compressed_data = metrics_computer.compress_timeseries(ns_data)
+            # 저장소가 max_points 예산에 맞는 단계를 골랐으므로 같은 예산으로만 제한 (예산을 맞추는 단계가 없을 때)
+            compressed_data = metrics_computer.compress_timeseries(ns_data, max_points)
             return jsonify(compressed_data), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -108,23 +94,14 @@ def get_deployment_timeseries(deployment_name=None):
     try:
         # window 파라미터 가져오기 (기본값: 1시간)
         window = request.args.get('window', Config.DEFAULT_TIME_WINDOW, type=int)
+        # 시리즈별 포인트 예산 (초과하면 다운샘플링 단계에서 조회)
+        max_points = request.args.get('max_points', Config.TIMESERIES_MAX_POINTS, type=int)
         namespace = request.args.get('namespace', 'default')
         
         if deployment_name is None:
             # 모든 배포의 시계열 데이터
-            all_deployments_data = []
-            for deployment_key in storage_service.deployments_data.keys():
-                if '/' in deployment_key:
-                    ns, dname = deployment_key.split('/', 1)
-                    deployment_data = list(storage_service.deployments_data[deployment_key])
-                    
-                    # compute.py를 활용한 시간 필터링
-                    filtered_data = metrics_computer.filter_timeseries_by_window(deployment_data, window)
-                    all_deployments_data.extend(filtered_data)
-            
-            # 시간순 정렬 및 압축
-            all_deployments_data.sort(key=lambda x: x.get('timestamp', ''))
-            compressed_data = metrics_computer.compress_timeseries(all_deployments_data)
+            # 시간순 병합 및 압축 (응답에 포함될 샘플만 변환)
+            compressed_data = storage_service.get_all_deployment_timeseries(window, max_points)
             return jsonify(compressed_data), 200
         else:
             # 특정 배포의 시계열 데이터
@@ -132,12 +109,10 @@ def get_deployment_timeseries(deployment_name=None):
             if deployment_key not in storage_service.deployments_data:
                 return jsonify({'error': f'No timeseries data found for deployment {deployment_name} in namespace {namespace}'}), 404
             
-            # compute.py를 활용한 시간 필터링
-            deployment_data = list(storage_service.deployments_data[deployment_key])
-            filtered_data = metrics_computer.filter_timeseries_by_window(deployment_data, window)
+            deployment_data = storage_service.get_deployment_timeseries(namespace, deployment_name, window, max_points)
             
-            # 데이터 압축 적용
-            compressed_data = metrics_computer.compress_timeseries(filtered_data)
+            # 저장소가 max_points 예산에 맞는 단계를 골랐으므로 같은 예산으로만 제한 (예산을 맞추는 단계가 없을 때)
+            compressed_data = metrics_computer.compress_timeseries(deployment_data, max_points)
             return jsonify(compressed_data), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
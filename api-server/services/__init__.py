@@ -3,5 +3,7 @@
 
 from .storage import storage_service
 from .compute import metrics_computer
+from .wire import compact_decoder
+from .scraper import scrape_service
 
-__all__ = ['storage_service', 'metrics_computer'] 
\ No newline at end of file
+__all__ = ['storage_service', 'metrics_computer', 'compact_decoder', 'scrape_service'] 
\ No newline at end of file
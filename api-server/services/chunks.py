@@ -0,0 +1,141 @@
+"""
+시계열 청크 압축 모듈 (Gorilla 방식 응용)
+닫힌 청크(기본 120개 샘플)를 컬럼별 차분으로 변환한 뒤 zlib로 압축하여 보관
+- 타임스탬프는 마이크로초 정수의 delta-of-delta (수집 주기가 일정하면 대부분 0)
+- 수치 필드는 정수(int64)이므로 XOR 대신 이전 값과의 차이 (변화가 없거나 작으면 0/작은 값)
+- 차분 결과는 자릿수별로 바이트를 모은 뒤(byte shuffle) zlib로 압축 (작은 값의 0 상위 바이트가 길게 이어짐)
+- 디코딩은 zlib 해제 + itertools.accumulate 누적 합으로 C 수준에서 처리
+- summary 등 추가 필드는 청크별 JSON으로 묶어 함께 압축하고 필요할 때만 해제
+- pack_columns/unpack_columns는 타임스탬프 없이 정수 컬럼만 같은 방식으로 압축 (다운샘플링 구간 블록)
+"""
+
+import json
+import math
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 컬럼 인코딩 (압축 본문 앞에 컬럼마다 1바이트)
+_DELTA_OF_DELTA = ord('t')  # 타임스탬프: 마이크로초 정수의 delta-of-delta
+_FLOAT = ord('f')  # 타임스탬프 원본 double (잘못된 타임스탬프(-inf)가 섞인 청크)
+_DELTA = ord('v')  # 수치: 이전 값과의 차이
+_RAW = ord('q')  # 수치 원본 (차이가 int64 범위를 넘는 경우)
+
+_MICROS = 1_000_000
+_COMPRESS_LEVEL = 6  # zlib 기본 수준 (청크는 한 번 압축하고 여러 번 읽음)
+
+
+def _shuffle(data: bytes) -> bytes:
+    """8바이트 값들의 같은 자릿수 바이트끼리 모음 (작은 차분 값의 상위 바이트가 길게 이어져 압축률 향상)"""
+    return b''.join(data[index::8] for index in range(8))
+
+
+def _unshuffle(data: bytes) -> bytearray:
+    count = len(data) // 8
+    restored = bytearray(len(data))
+    for index in range(8):
+        restored[index::8] = data[index * count:(index + 1) * count]
+    return restored
+
+
+def _differences(values: Sequence[int]) -> List[int]:
+    return [current - previous for previous, current in zip(values, values[1:])]
+
+
+def _encode_timestamps(timestamps: Sequence[float]) -> Tuple[int, bytes]:
+    if timestamps[0] == -math.inf:
+        return _FLOAT, array('d', timestamps).tobytes()
+    micros = [round(epoch * _MICROS) for epoch in timestamps]
+    deltas = _differences(micros)
+    try:
+        return _DELTA_OF_DELTA, array('q', [micros[0], *deltas[:1], *_differences(deltas)]).tobytes()
+    except OverflowError:
+        return _FLOAT, array('d', timestamps).tobytes()
+
+
+def _encode_values(values: Sequence[int]) -> Tuple[int, bytes]:
+    try:
+        return _DELTA, array('q', [values[0], *_differences(values)]).tobytes()
+    except OverflowError:
+        return _RAW, array('q', values).tobytes()
+
+
+def _pack(encoded: Sequence[Tuple[int, bytes]]) -> bytes:
+    """(인코딩, 컬럼 바이트) 목록 -> 컬럼별 인코딩 바이트 + byte shuffle한 본문을 zlib 압축"""
+    body = bytes(encoding for encoding, _ in encoded) + _shuffle(b''.join(data for _, data in encoded))
+    return zlib.compress(body, _COMPRESS_LEVEL)
+
+
+def _unpack(data: bytes, count: int) -> Iterator[Tuple[int, bytes]]:
+    """_pack()의 역변환: 컬럼마다 (인코딩, 행 수 x 8바이트) 반환"""
+    body = zlib.decompress(data)
+    fields = len(body) // (count * 8 + 1)
+    values = _unshuffle(body[fields:])
+    width = count * 8
+    for index, encoding in enumerate(body[:fields]):
+        yield encoding, values[index * width:(index + 1) * width]
+
+
+def _decode_values(encoding: int, data: bytes) -> List[int]:
+    column = array('q')
+    column.frombytes(data)
+    return list(accumulate(column)) if encoding == _DELTA else column.tolist()
+
+
+def pack_columns(columns: Sequence[Sequence[int]]) -> bytes:
+    """길이가 같은 int64 컬럼들을 차분 + byte shuffle + zlib로 압축 (행 수는 호출자가 보관)"""
+    return _pack([_encode_values(column) for column in columns])
+
+
+def unpack_columns(data: bytes, count: int) -> List[List[int]]:
+    """pack_columns()로 압축한 count행 컬럼들 복원"""
+    return [_decode_values(encoding, values) for encoding, values in _unpack(data, count)]
+
+
+class Chunk:
+    """
+    압축된 닫힌 청크 1개 (타임스탬프 오름차순 샘플)
+    first/last/count는 압축을 풀지 않고 조회 구간 겹침과 샘플 수를 판단하는 데 사용
+    """
+
+    __slots__ = ('first', 'last', 'count', 'data', 'extras')
+
+    def __init__(self, first: float, last: float, count: int, data: bytes, extras: Optional[bytes]):
+        self.first = first
+        self.last = last
+        self.count = count
+        self.data = data
+        self.extras = extras
+
+    @classmethod
+    def encode(cls, timestamps: Sequence[float], columns: Sequence[Sequence[int]],
+               extras: Dict[int, Dict[str, Any]]) -> 'Chunk':
+        """타임스탬프 순 컬럼(+청크 내 위치 -> 추가 필드)을 압축 청크로 변환"""
+        encoded = [_encode_timestamps(timestamps)] + [_encode_values(column) for column in columns]
+        packed_extras = None
+        if extras:
+            packed_extras = zlib.compress(json.dumps(sorted(extras.items())).encode('utf-8'), _COMPRESS_LEVEL)
+        return cls(timestamps[0], timestamps[-1], len(timestamps), _pack(encoded), packed_extras)
+
+    def decode(self) -> Tuple[List[float], List[List[int]], Dict[int, Dict[str, Any]]]:
+        """(타임스탬프 목록, 수치 컬럼 목록, 청크 내 위치 -> 추가 필드)로 압축 해제"""
+        decoded = []
+        for encoding, values in _unpack(self.data, self.count):
+            if encoding == _DELTA_OF_DELTA:
+                column = array('q')
+                column.frombytes(values)
+                micros = accumulate(accumulate(column[1:]), initial=column[0])
+                decoded.append(list(map(_MICROS.__rtruediv__, micros)))
+            elif encoding == _FLOAT:
+                column = array('d')
+                column.frombytes(values)
+                decoded.append(column.tolist())
+            else:
+                decoded.append(_decode_values(encoding, values))
+        return decoded[0], decoded[1:], self.decode_extras()
+
+    def decode_extras(self) -> Dict[int, Dict[str, Any]]:
+        if self.extras is None:
+            return {}
+        return {position: extra for position, extra in json.loads(zlib.decompress(self.extras))}
@@ -4,8 +4,9 @@
 """
 
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
-import statistics
+
+from . import kernels
+from .series import VALUE_FIELDS
 
 
 class MetricsComputer:
@@ -59,96 +60,107 @@ class MetricsComputer:
     
     @staticmethod
     def aggregate_pod_metrics(pods: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """파드들의 메트릭을 집계하여 합계 계산"""
-        if not pods:
-            return {
-                'cpu_millicores': 0,
-                'memory_bytes': 0,
-                'disk_io': {'read_bytes': 0, 'write_bytes': 0},
-                'network_io': {'bytes_sent': 0, 'bytes_recv': 0}
-            }
+        """파드들의 메트릭을 집계하여 합계 계산 (일괄 집계 커널의 dict 래퍼)"""
+        aggregated = MetricsComputer.aggregate_pod_batch(pods)['sum']
         
-        total_cpu = 0
-        total_memory = 0
-        total_disk_read = 0
-        total_disk_write = 0
-        total_net_sent = 0
-        total_net_recv = 0
-        
-        for pod in pods:
-            total_cpu += pod.get('cpu_millicores', 0)
-            total_memory += pod.get('memory_bytes', 0)
-            
-            disk_io = pod.get('disk_io', {})
-            total_disk_read += disk_io.get('read_bytes', 0)
-            total_disk_write += disk_io.get('write_bytes', 0)
-            
-            network_io = pod.get('network_io', {})
-            total_net_sent += network_io.get('bytes_sent', 0)
-            total_net_recv += network_io.get('bytes_recv', 0)
+        summary = MetricsComputer.sum_summaries([pod.get('summary') for pod in pods])
+        if summary:
+            aggregated['summary'] = summary
         
-        return {
-            'cpu_millicores': total_cpu,
-            'memory_bytes': total_memory,
-            'disk_io': {
-                'read_bytes': total_disk_read,
-                'write_bytes': total_disk_write
-            },
-            'network_io': {
-                'bytes_sent': total_net_sent,
-                'bytes_recv': total_net_recv
-            }
-        }
+        return aggregated
     
     @staticmethod
     def calculate_average_metrics(metrics_list: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """메트릭 리스트의 평균값 계산"""
+        """메트릭 리스트의 평균값 계산 (일괄 집계 커널의 dict 래퍼, 필드별 평균은 int(statistics.mean())과 같은 정수)"""
         if not metrics_list:
             return {}
         
-        cpu_values = [m.get('cpu_millicores', 0) for m in metrics_list]
-        memory_values = [m.get('memory_bytes', 0) for m in metrics_list]
+        averaged = MetricsComputer.aggregate_pod_batch(metrics_list)['mean']
         
-        disk_read_values = [m.get('disk_io', {}).get('read_bytes', 0) for m in metrics_list]
-        disk_write_values = [m.get('disk_io', {}).get('write_bytes', 0) for m in metrics_list]
-        
-        net_sent_values = [m.get('network_io', {}).get('bytes_sent', 0) for m in metrics_list]
-        net_recv_values = [m.get('network_io', {}).get('bytes_recv', 0) for m in metrics_list]
+        summary = MetricsComputer.merge_summaries([m.get('summary') for m in metrics_list])
+        if summary:
+            averaged['summary'] = summary
         
+        return averaged
+    
+    @staticmethod
+    def aggregate_pod_batch(pods: List[Dict[str, Any]],
+                            labels: Optional[Dict[str, List[Any]]] = None) -> Dict[str, Any]:
+        """
+        파드 dict 목록을 컬럼 배열로 한 번 변환한 뒤 aggregate_columns()로 집계
+        labels: 기준 이름 -> 파드별 그룹 라벨 (None이면 해당 기준에서 제외)
+        """
+        return MetricsComputer.aggregate_columns(kernels.metric_columns(pods), labels or {})
+    
+    @staticmethod
+    def aggregate_columns(values, labels: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """
+        (파드 수, 필드 수) 컬럼에서 합계/평균/최솟값/최댓값과 기준별 그룹 합계를 한 번에 계산
+        values: kernels.metric_columns() 또는 StorageService.latest_pod_columns() 결과 (dict 순회 없이 커널에 전달)
+        결과 값은 aggregate_pod_metrics()와 같은 형식의 dict
+        """
+        result = kernels.aggregate(values, labels)
+        if not result['count']:
+            zeros = [0] * len(VALUE_FIELDS)
+            result.update({'sum': zeros, 'mean': zeros, 'min': zeros, 'max': zeros})
         return {
-            'cpu_millicores': int(statistics.mean(cpu_values)) if cpu_values else 0,
-            'memory_bytes': int(statistics.mean(memory_values)) if memory_values else 0,
-            'disk_io': {
-                'read_bytes': int(statistics.mean(disk_read_values)) if disk_read_values else 0,
-                'write_bytes': int(statistics.mean(disk_write_values)) if disk_write_values else 0
-            },
-            'network_io': {
-                'bytes_sent': int(statistics.mean(net_sent_values)) if net_sent_values else 0,
-                'bytes_recv': int(statistics.mean(net_recv_values)) if net_recv_values else 0
-            }
+            'count': result['count'],
+            'sum': kernels.to_metrics(result['sum']),
+            'mean': kernels.to_metrics(result['mean']),
+            'min': kernels.to_metrics(result['min']),
+            'max': kernels.to_metrics(result['max']),
+            'groups': {name: {label: kernels.to_metrics(row) for label, row in groups.items()}
+                       for name, groups in result['groups'].items()}
         }
     
     @staticmethod
-    def filter_timeseries_by_window(data: List[Dict[str, Any]], window_seconds: int) -> List[Dict[str, Any]]:
-        """시계열 데이터를 시간 윈도우로 필터링"""
-        if not data or window_seconds <= 0:
-            return []
-        
-        cutoff_time = datetime.now() - timedelta(seconds=window_seconds)
-        filtered_data = []
-        
-        for item in data:
-            try:
-                timestamp_str = item.get('timestamp', '')
-                # ISO 포맷 파싱 (Z 제거)
-                data_time = datetime.fromisoformat(timestamp_str.replace('Z', ''))
-                if data_time >= cutoff_time:
-                    filtered_data.append(item)
-            except (ValueError, TypeError):
-                # 잘못된 타임스탬프는 건너뛰기
+    def sum_summaries(summaries: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        여러 파드의 요약 통계를 합산 (네임스페이스/배포 집계용)
+        mean, last는 정확한 합계이고, min/max/p95는 파드별 값의 합이므로 합계의 하한/상한 추정치
+        """
+        total: Dict[str, Dict[str, Any]] = {}
+        for summary in summaries:
+            if not summary:
                 continue
-        
-        return sorted(filtered_data, key=lambda x: x.get('timestamp', ''))
+            for metric, stats in summary.items():
+                metric_total = total.setdefault(metric, {'min': 0, 'max': 0, 'mean': 0, 'last': 0, 'p95': 0})
+                for stat in metric_total:
+                    metric_total[stat] += stats.get(stat, 0)
+        
+        for metric_total in total.values():
+            metric_total['mean'] = round(metric_total['mean'], 2)
+        return total
+    
+    @staticmethod
+    def merge_summaries(summaries: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        시간순 요약 통계를 하나의 구간으로 병합 (평균 계산용)
+        min/max는 정확, mean은 샘플 수 가중 평균, last는 마지막 구간 값, p95는 구간별 p95의 최댓값(보수적 추정)
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for summary in summaries:
+            if not summary:
+                continue
+            for metric, stats in summary.items():
+                count = stats.get('count', 1)
+                current = merged.get(metric)
+                if current is None:
+                    merged[metric] = {
+                        'min': stats['min'], 'max': stats['max'], 'mean': stats['mean'] * count,
+                        'last': stats['last'], 'p95': stats['p95'], 'count': count
+                    }
+                    continue
+                current['min'] = min(current['min'], stats['min'])
+                current['max'] = max(current['max'], stats['max'])
+                current['mean'] += stats['mean'] * count
+                current['last'] = stats['last']
+                current['p95'] = max(current['p95'], stats['p95'])
+                current['count'] += count
+        
+        for stats in merged.values():
+            stats['mean'] = round(stats['mean'] / stats['count'], 2) if stats['count'] else 0
+        return merged
     
     @staticmethod
     def compress_timeseries(data: List[Dict[str, Any]], max_points: int = 100) -> List[Dict[str, Any]]:
@@ -208,6 +220,14 @@ class MetricsComputer:
             enhanced_metrics['cpu_cores'] = MetricsComputer.millicores_to_cores(metrics['cpu_millicores'])
             enhanced_metrics['cpu_percentage'] = MetricsComputer.calculate_cpu_percentage(metrics['cpu_millicores'])
         
+        # 고빈도 샘플 요약 (CPU 최댓값/p95 등을 코어 단위로도 제공)
+        cpu_summary = metrics.get('summary', {}).get('cpu_millicores')
+        if cpu_summary:
+            enhanced_metrics['cpu_cores_summary'] = {
+                stat: MetricsComputer.millicores_to_cores(value)
+                for stat, value in cpu_summary.items() if stat != 'count'
+            }
+        
         # 메모리 관련
         if 'memory_bytes' in metrics:
             enhanced_metrics['memory_human'] = MetricsComputer.bytes_to_human_readable(metrics['memory_bytes'])
@@ -0,0 +1,233 @@
+"""
+다운샘플링 모듈
+원본 시계열 샘플을 해상도별 구간(1분/10분/1시간 등)으로 집계하여 해상도마다 다른 보존 기간으로 보관
+- 구간마다 수치 필드별 min/max/sum과 샘플 수(count)를 보관 (avg는 응답 시 sum/count로 계산)
+- 통계가 병합 가능하므로 늦게 도착한 샘플도 해당 구간에 그대로 합산
+- 지난 구간은 블록 단위로 청크와 같은 방식(차분 + byte shuffle + zlib)으로 압축, 구간 시작 시각은 구간 번호에서 계산
+- 보존 기간이 지난 블록은 새 구간이 생길 때 바로 제거
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .chunks import pack_columns, unpack_columns
+from .series import VALUE_FIELDS, from_epoch
+
+FIELDS = len(VALUE_FIELDS)
+ROW_WIDTH = 1 + 3 * FIELDS  # 구간 1개: count, min x 필드 수, max x 필드 수, sum x 필드 수
+DEFAULT_BLOCK_BUCKETS = 32  # 압축 블록 1개의 구간 수
+
+
+def parse_tiers(spec: str, max_retention: int) -> List[Tuple[int, int]]:
+    """
+    'resolution:retention,...' (초 단위) 설정을 해상도 오름차순 (resolution, retention) 목록으로 변환
+    각 단계 보존 기간은 max_retention(METRICS_RETENTION_DAYS)을 넘지 않음
+    """
+    tiers = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        resolution, retention = (int(value) for value in item.split(':', 1))
+        if resolution <= 0 or retention <= 0:
+            raise ValueError(f"Invalid downsample tier: {item}")
+        tiers.append((resolution, min(retention, max_retention)))
+    return sorted(tiers)
+
+
+def _merge_row(rows: array, base: int, count: int, mins: Sequence[int], maxs: Sequence[int],
+               sums: Sequence[int]):
+    """행 우선 배열의 base 위치 구간에 통계 합산 (count가 0인 빈 구간이면 그대로 기록)"""
+    if rows[base] == 0:
+        rows[base:base + ROW_WIDTH] = array('q', (count, *mins, *maxs, *sums))
+        return
+    rows[base] += count
+    for index in range(FIELDS):
+        position = base + 1 + index
+        if mins[index] < rows[position]:
+            rows[position] = mins[index]
+        position += FIELDS
+        if maxs[index] > rows[position]:
+            rows[position] = maxs[index]
+        rows[position + FIELDS] += sums[index]
+
+
+class TierBlock:
+    """
+    닫힌 구간 블록 (start번째 구간부터 count개 구간의 통계를 컬럼별로 압축)
+    구간 시작 시각은 구간 번호 x 해상도로 계산되므로 저장하지 않고, 빈 구간은 count 0으로 채움
+    """
+
+    __slots__ = ('start', 'count', 'data')
+
+    def __init__(self, start: int, count: int, data: bytes):
+        self.start = start
+        self.count = count
+        self.data = data
+
+    @classmethod
+    def encode(cls, start: int, rows: array) -> 'TierBlock':
+        return cls(start, len(rows) // ROW_WIDTH,
+                   pack_columns([rows[index::ROW_WIDTH] for index in range(ROW_WIDTH)]))
+
+    def decode(self) -> array:
+        """행 우선 배열 (구간마다 ROW_WIDTH개 값)로 압축 해제"""
+        rows = array('q', bytes(self.count * ROW_WIDTH * 8))
+        for index, column in enumerate(unpack_columns(self.data, self.count)):
+            rows[index::ROW_WIDTH] = array('q', column)
+        return rows
+
+
+class TierBuffer:
+    """
+    해상도 1단계의 구간 통계
+    구간은 epoch // resolution 구간 번호로 구분하며, 현재 채워지는 블록(head)만 압축하지 않은 행 우선 배열로 두고
+    block_buckets개 구간이 지나면 TierBlock으로 압축해 닫음
+    새 구간이 생길 때마다 보존 기간이 지난 블록을 바로 제거
+    """
+
+    __slots__ = ('resolution', 'retention', 'block_buckets', 'blocks', 'head_start', 'head', 'newest')
+
+    def __init__(self, resolution: int, retention: int, block_buckets: int = DEFAULT_BLOCK_BUCKETS):
+        self.resolution = resolution
+        self.retention = retention
+        # 보존 기간보다 긴 블록은 만료가 늦어지므로 보존 구간 수로 제한
+        self.block_buckets = max(1, min(block_buckets, retention // resolution))
+        self.blocks: List[TierBlock] = []  # 닫힌 블록 (start 오름차순)
+        self.head_start = 0  # head 첫 구간 번호 (block_buckets 배수)
+        self.head = array('q')  # 현재 블록의 행 우선 배열 (마지막 기록 구간까지)
+        self.newest: Optional[int] = None  # 가장 최근 구간 번호
+
+    def add(self, epoch: float, values: Sequence[int]):
+        """샘플 1건을 해당 구간에 합산 (구간이 없으면 생성)"""
+        self._merge(int(epoch // self.resolution), 1, values, values, values)
+
+    def _merge(self, bucket: int, count: int, mins: Sequence[int], maxs: Sequence[int], sums: Sequence[int]):
+        newest = self.newest
+        if newest is None:
+            self.head_start = bucket - bucket % self.block_buckets
+        elif bucket < newest - self.retention // self.resolution:
+            return  # 보존 기간이 지난 늦은 샘플
+        elif bucket >= self.head_start + self.block_buckets:
+            self._seal_head()
+            self.head_start = bucket - bucket % self.block_buckets
+
+        if bucket >= self.head_start:
+            base = (bucket - self.head_start) * ROW_WIDTH
+            if base >= len(self.head):
+                self.head.frombytes(bytes((base + ROW_WIDTH - len(self.head)) * 8))
+            _merge_row(self.head, base, count, mins, maxs, sums)
+        else:
+            self._merge_closed(bucket, count, mins, maxs, sums)
+
+        if newest is None or bucket > newest:
+            self.newest = bucket
+            self._expire()
+
+    def _seal_head(self):
+        if self.head:
+            self.blocks.append(TierBlock.encode(self.head_start, self.head))
+            self.head = array('q')
+
+    def _merge_closed(self, bucket: int, count: int, mins: Sequence[int], maxs: Sequence[int],
+                      sums: Sequence[int]):
+        """늦게 도착한 샘플: 닫힌 블록을 풀어 합산한 뒤 다시 압축 (블록이 없으면 생성)"""
+        start = bucket - bucket % self.block_buckets
+        position = bisect_left([block.start for block in self.blocks], start)
+        exists = position < len(self.blocks) and self.blocks[position].start == start
+        rows = self.blocks[position].decode() if exists else array('q')
+        base = (bucket - start) * ROW_WIDTH
+        if base >= len(rows):
+            rows.frombytes(bytes((base + ROW_WIDTH - len(rows)) * 8))
+        _merge_row(rows, base, count, mins, maxs, sums)
+        self.blocks[position:position + exists] = [TierBlock.encode(start, rows)]
+
+    def _expire(self):
+        """보존 기간이 모두 지난 블록 제거"""
+        oldest = self.newest - self.retention // self.resolution
+        expired = 0
+        for block in self.blocks:
+            if block.start + block.count > oldest:
+                break
+            expired += 1
+        if expired:
+            del self.blocks[:expired]
+
+    def _rows(self, lo: int, hi: int) -> Iterator[Tuple[int, Sequence[int]]]:
+        """[lo, hi) 구간 번호의 (구간 번호, (count, min..., max..., sum...)) (빈 구간과 만료된 구간 제외)"""
+        if self.newest is None:
+            return
+        lo = max(lo, self.newest - self.retention // self.resolution)
+        parts = [(block.start, block) for block in self.blocks if block.start + block.count > lo and block.start < hi]
+        parts.append((self.head_start, None))
+        for start, block in parts:
+            if block is None:
+                head = self.head
+                rows = [head[base:base + ROW_WIDTH] for base in range(0, len(head), ROW_WIDTH)]
+            else:
+                rows = list(zip(*unpack_columns(block.data, block.count)))
+            for bucket in range(max(lo, start), min(hi, start + len(rows))):
+                row = rows[bucket - start]
+                if row[0]:
+                    yield bucket, row
+
+    def covers(self, window_seconds: int) -> bool:
+        return self.retention >= window_seconds
+
+    def window_rows(self, cutoff: float) -> List[Tuple]:
+        """cutoff 이후 시각을 포함하는 구간의 원시 값 (epoch, count, min..., max..., sum...)"""
+        # 구간 끝(시작 + 해상도)이 cutoff보다 뒤인 구간부터
+        resolution = self.resolution
+        lo = int((cutoff - resolution) // resolution) + 1
+        return [(float(bucket * resolution), *row) for bucket, row in self._rows(lo, math.inf)]
+
+    def export_range(self, lo: float, hi: float) -> List[array]:
+        """[lo, hi) 구간 시작 시각을 가진 구간 컬럼 (세그먼트 봉인용, 구간 시작 시각 컬럼 포함)"""
+        resolution = self.resolution
+        columns = [array('d')] + [array('q') for _ in range(ROW_WIDTH)]
+        for bucket, row in self._rows(math.ceil(lo / resolution), math.ceil(hi / resolution)):
+            columns[0].append(float(bucket * resolution))
+            for column, value in zip(columns[1:], row):
+                column.append(value)
+        return columns
+
+    def load(self, columns: Sequence, cutoff: float):
+        """세그먼트에 저장된 구간 통계를 합산 (cutoff 이전 구간 제외)"""
+        epochs, counts = columns[0], columns[1]
+        mins, maxs, sums = columns[2:2 + FIELDS], columns[2 + FIELDS:2 + 2 * FIELDS], columns[2 + 2 * FIELDS:]
+        for position in range(bisect_left(epochs, cutoff), len(epochs)):
+            self._merge(int(epochs[position] // self.resolution), counts[position],
+                        [column[position] for column in mins], [column[position] for column in maxs],
+                        [column[position] for column in sums])
+
+
+    def materialize_row(self, labels: Dict[str, Any], row: Tuple) -> Dict[str, Any]:
+        """
+        구간 1개를 응답용 dict로 변환
+        수치 필드는 원본 샘플과 같은 위치에 평균값을 넣고, stats에 필드별 min/max/avg/sum/count 제공
+        """
+        fields = FIELDS
+        epoch, count = row[0], row[1]
+        mins, maxs, sums = row[2:2 + fields], row[2 + fields:2 + 2 * fields], row[2 + 2 * fields:]
+
+        sample = dict(labels)
+        sample['timestamp'] = from_epoch(epoch)
+        sample['resolution'] = self.resolution
+        sample['count'] = count
+        stats = {}
+        for index, (field, parent) in enumerate(VALUE_FIELDS):
+            average = sums[index] / count
+            stats[field] = {
+                'min': mins[index],
+                'max': maxs[index],
+                'avg': round(average, 2),
+                'sum': sums[index],
+                'count': count
+            }
+            target = sample.setdefault(parent, {}) if parent else sample
+            target[field] = int(round(average))
+        sample['stats'] = stats
+        return sample
+
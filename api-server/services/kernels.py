@@ -0,0 +1,281 @@
+"""
+메트릭 일괄 집계 커널 (NumPy)
+파드 N개의 수치 필드를 (N, 필드 수) 컬럼 배열 하나로 모아 합계/평균/최솟값/최댓값과
+네임스페이스/디플로이먼트/노드별 합계를 한 번에 계산
+- 컬럼 순서는 series.VALUE_FIELDS와 같음
+- 정수 합계가 int64 범위를 넘을 수 있거나 실수가 섞이면 Python 숫자(object) 배열로 계산하여 결과를 그대로 유지
+- numpy가 없으면 컬럼 배열 대신 행 튜플 목록을 같은 함수로 순수 Python 집계 (결과 동일)
+- PodColumns는 StorageService가 파드 최신 값을 행 우선 int64 배열로 유지하는 표 (dict 순회 없이 커널 입력)
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy는 선택 의존성
+    np = None
+
+from .series import VALUE_FIELDS
+
+FIELDS = len(VALUE_FIELDS)
+GROUPINGS = ('namespace', 'deployment', 'node')
+_INT64_LIMIT = 2 ** 63
+
+
+def available() -> bool:
+    return np is not None
+
+
+def metric_rows(metrics_list: Sequence[Dict[str, Any]]) -> List[tuple]:
+    """메트릭 dict 목록 -> 필드 수 길이 튜플 목록 (없는 필드는 0)"""
+    rows = []
+    for metrics in metrics_list:
+        disk_io = metrics.get('disk_io') or {}
+        network_io = metrics.get('network_io') or {}
+        rows.append((metrics.get('cpu_millicores', 0), metrics.get('memory_bytes', 0),
+                     disk_io.get('read_bytes', 0), disk_io.get('write_bytes', 0),
+                     network_io.get('bytes_sent', 0), network_io.get('bytes_recv', 0)))
+    return rows
+
+
+def metric_columns(metrics_list: Sequence[Dict[str, Any]]):
+    """메트릭 dict 목록 -> (N, 필드 수) 컬럼 배열 (dict는 한 번만 순회, numpy가 없으면 행 목록)"""
+    rows = metric_rows(metrics_list)
+    if np is None:
+        return rows
+    if not rows:
+        return np.zeros((0, FIELDS), dtype=np.int64)
+    values = np.array(rows)
+    if values.dtype.kind not in 'iu':
+        # 실수가 섞이면 정수 필드까지 실수로 바뀌므로 값별 Python 타입을 유지
+        return np.array(rows, dtype=object)
+    return _exact(values)
+
+
+def values_matrix(values: array):
+    """행 우선 int64 배열(PodColumns.snapshot()) -> (N, 필드 수) 컬럼 배열 (복사 없이 감쌈, numpy가 없으면 행 목록)"""
+    if np is None:
+        return [tuple(values[index:index + FIELDS]) for index in range(0, len(values), FIELDS)]
+    if not values:
+        return np.zeros((0, FIELDS), dtype=np.int64)
+    return _exact(np.frombuffer(values, dtype=np.int64).reshape(-1, FIELDS))
+
+
+def _exact(values):
+    """합계가 int64 범위를 넘을 수 있으면 Python 정수(object) 배열로 변환"""
+    if float(np.abs(values, dtype=np.float64).max()) * len(values) >= _INT64_LIMIT:
+        return values.astype(object)
+    return values
+
+
+def summarize(values) -> Dict[str, Any]:
+    """
+    필드별 합계/평균/최솟값/최댓값 (각각 필드 수 길이 목록, 비어 있으면 count만 0)
+    평균은 int(statistics.mean())과 같은 정수 (정수 컬럼은 정확한 합계, 실수가 섞인 컬럼은 fsum에서 계산)
+    """
+    count = len(values)
+    if not count:
+        return {'count': 0}
+    if np is None:
+        columns = list(zip(*values))
+        sums = [sum(column) for column in columns]
+        minimums = [min(column) for column in columns]
+        maximums = [max(column) for column in columns]
+    else:
+        columns = values.T
+        sums = values.sum(axis=0).tolist()
+        minimums = values.min(axis=0).tolist()
+        maximums = values.max(axis=0).tolist()
+    means = [truncated_quotient(total if isinstance(total, int) else math.fsum(column), count)
+             for total, column in zip(sums, columns)]
+    return {
+        'count': count,
+        'sum': sums,
+        'mean': means,
+        'min': minimums,
+        'max': maximums
+    }
+
+
+class GroupCodes(NamedTuple):
+    """행별 그룹 번호 (-1이면 그룹 없음)와 그룹 번호 -> 라벨 표 (비어 있는 번호는 None)"""
+    codes: Sequence[int]
+    names: List[Any]
+
+    def decode(self) -> List[Any]:
+        """행별 라벨 목록"""
+        names = self.names
+        return [names[code] if code >= 0 else None for code in self.codes]
+
+
+def encode_labels(labels: Sequence[Hashable]) -> GroupCodes:
+    """행별 라벨 -> 등장 순서 그룹 번호 (None 라벨은 결과에서 제외되는 번호)"""
+    ids: Dict[Hashable, int] = {}
+    codes = array('q', [ids.setdefault(label, len(ids)) for label in labels])
+    return GroupCodes(codes, list(ids))
+
+
+def grouped_sums(values, labels) -> Dict[Hashable, List[Any]]:
+    """
+    같은 그룹 행끼리 필드별 합계 (라벨 -> 필드 수 길이 목록, 라벨이 None인 행은 제외)
+    labels: 행별 라벨 목록 또는 GroupCodes (PodColumns 스냅샷은 라벨 해시 없이 그룹 번호로 바로 집계)
+    """
+    codes, names = labels if isinstance(labels, GroupCodes) else encode_labels(labels)
+    if not len(codes):
+        return {}
+    if np is None:
+        sums: Dict[Hashable, List[Any]] = {}
+        for row, code in zip(values, codes):
+            label = names[code] if code >= 0 else None
+            if label is None:
+                continue
+            total = sums.get(label)
+            if total is None:
+                sums[label] = list(row)
+            else:
+                for index, value in enumerate(row):
+                    total[index] += value
+        return sums
+    codes = np.frombuffer(codes, dtype=np.int64) if isinstance(codes, array) else np.asarray(codes, dtype=np.int64)
+    # 그룹 번호 순으로 정렬한 뒤 그룹 시작 위치마다 구간 합 (정수는 정확히 합산)
+    order = np.argsort(codes, kind='stable')
+    present, starts = np.unique(codes[order], return_index=True)
+    sums = np.add.reduceat(values[order], starts, axis=0).tolist()
+    return {names[code]: row for code, row in zip(present.tolist(), sums)
+            if code >= 0 and names[code] is not None}
+
+
+def aggregate(values, groupings: Optional[Dict[str, Sequence[Hashable]]] = None) -> Dict[str, Any]:
+    """
+    summarize() 결과에 그룹 기준별 합계를 더해 반환
+    groupings: 기준 이름 -> 행별 라벨 또는 GroupCodes (예: {'namespace': [...], 'deployment': [...], 'node': [...]})
+    """
+    result = summarize(values)
+    result['groups'] = {name: grouped_sums(values, labels) for name, labels in (groupings or {}).items()}
+    return result
+
+
+def to_metrics(row) -> Dict[str, Any]:
+    """필드 수 길이 배열/목록 1행 -> aggregate_pod_metrics()와 같은 형식의 dict (Python 숫자)"""
+    if hasattr(row, 'tolist'):
+        row = row.tolist()
+    cpu, memory, read_bytes, write_bytes, bytes_sent, bytes_recv = row
+    return {
+        'cpu_millicores': cpu,
+        'memory_bytes': memory,
+        'disk_io': {'read_bytes': read_bytes, 'write_bytes': write_bytes},
+        'network_io': {'bytes_sent': bytes_sent, 'bytes_recv': bytes_recv}
+    }
+
+
+def truncated_quotient(total, count: int) -> int:
+    """
+    int(statistics.mean())과 같은 방식의 평균: 나누어떨어지는 정수 합계는 정확한 몫,
+    그 외에는 올바르게 반올림된 나눗셈 결과의 정수 부분
+    """
+    if isinstance(total, int) and total % count == 0:
+        return total // count
+    return int(total / count)
+
+
+class _LabelTable:
+    """라벨 <-> 그룹 번호 (사용하는 행 수를 세어 비면 번호를 재사용)"""
+
+    __slots__ = ('codes', 'names', 'refs', 'free')
+
+    def __init__(self):
+        self.codes: Dict[Hashable, int] = {}
+        self.names: List[Any] = []
+        self.refs: List[int] = []
+        self.free: List[int] = []
+
+    def acquire(self, label: Hashable) -> int:
+        if label is None:
+            return -1
+        code = self.codes.get(label)
+        if code is None:
+            if self.free:
+                code = self.free.pop()
+                self.names[code] = label
+            else:
+                code = len(self.names)
+                self.names.append(label)
+                self.refs.append(0)
+            self.codes[label] = code
+        self.refs[code] += 1
+        return code
+
+    def release(self, code: int):
+        if code < 0:
+            return
+        self.refs[code] -= 1
+        if not self.refs[code]:
+            del self.codes[self.names[code]]
+            self.names[code] = None
+            self.free.append(code)
+
+
+class PodColumns:
+    """
+    파드 최신 값 표: 파드마다 1행 (행 우선 int64 배열 + 기준별 namespace/deployment/node 그룹 번호 배열)
+    StorageService 쓰기 lock 안에서 파드 최신 데이터와 함께 갱신하며, 제거된 행은 마지막 행으로 채워 빈칸 없이 유지
+    값은 시계열 버퍼와 같이 int()로 변환하여 저장
+    """
+
+    __slots__ = ('keys', 'slots', 'values', 'codes', 'tables')
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.slots: Dict[str, int] = {}
+        self.values = array('q')
+        self.codes: Dict[str, array] = {name: array('q') for name in GROUPINGS}
+        self.tables: Dict[str, _LabelTable] = {name: _LabelTable() for name in GROUPINGS}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def set(self, key: str, metrics: Dict[str, Any], deployment: Optional[Tuple[str, str]]):
+        """파드 1개의 최신 값/라벨 기록 (deployment는 (namespace, deployment_name) 또는 None)"""
+        row = array('q', [int(value) for value in metric_rows([metrics])[0]])
+        labels = (metrics['namespace'], deployment, metrics.get('node_name'))
+        slot = self.slots.get(key)
+        if slot is None:
+            self.slots[key] = len(self.keys)
+            self.keys.append(key)
+            self.values.extend(row)
+            for name, label in zip(GROUPINGS, labels):
+                self.codes[name].append(self.tables[name].acquire(label))
+            return
+        self.values[slot * FIELDS:(slot + 1) * FIELDS] = row
+        for name, label in zip(GROUPINGS, labels):
+            table, column = self.tables[name], self.codes[name]
+            previous = column[slot]
+            if previous < 0 or table.names[previous] != label:
+                column[slot] = table.acquire(label)
+                table.release(previous)
+
+    def remove(self, key: str):
+        slot = self.slots.pop(key, None)
+        if slot is None:
+            return
+        for name, column in self.codes.items():
+            self.tables[name].release(column[slot])
+        last = len(self.keys) - 1
+        if slot != last:
+            moved = self.keys[slot] = self.keys[last]
+            self.slots[moved] = slot
+            self.values[slot * FIELDS:(slot + 1) * FIELDS] = self.values[last * FIELDS:]
+            for column in self.codes.values():
+                column[slot] = column[last]
+        self.keys.pop()
+        del self.values[last * FIELDS:]
+        for column in self.codes.values():
+            column.pop()
+
+    def snapshot(self) -> Tuple[List[str], Dict[str, GroupCodes], array]:
+        """(pod_key 목록, 기준별 GroupCodes, 행 우선 int64 배열) 복사본 (쓰기 lock 안에서 호출)"""
+        groups = {name: GroupCodes(array('q', column), list(self.tables[name].names))
+                  for name, column in self.codes.items()}
+        return list(self.keys), groups, array('q', self.values)
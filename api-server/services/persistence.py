@@ -0,0 +1,393 @@
+"""
+디스크 영속화 모듈
+- WriteAheadLog: 저장되는 모든 시계열 샘플을 append-only 로그로 기록 (재시작 시 봉인되지 않은 구간만 재생)
+- Segment: 시간 구간(파티션)별 불변 컬럼 파일, mmap으로 열어 필요한 컬럼만 memoryview로 읽음
+- SegmentStore: 세그먼트 목록 관리, 원본 이력 조회, 보존 기간 삭제, 긴 구간 단위 병합(compaction)
+
+세그먼트 파일 구조 (모든 컬럼은 8바이트 정렬):
+    header (magic, index 위치, index 길이) | 시리즈별 컬럼 데이터 ... | index (JSON)
+"""
+
+import os
+import json
+import math
+import mmap
+import zlib
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+WAL_RECORD_HEADER = struct.Struct('<IId')  # payload 길이, crc32, 샘플 시각 (재생 시 파싱 없이 건너뛰기용)
+SEGMENT_MAGIC = b'KMSEG001'
+SEGMENT_HEADER = struct.Struct('<8sQQ')  # magic, index 위치, index 길이
+
+VALUE_COLUMNS = 6  # series.VALUE_FIELDS 수
+
+
+def _sync_directory(directory: str):
+    """파일 생성/이름 변경을 디렉터리에 반영"""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteAheadLog:
+    """
+    append-only 로그 (파일 = 봉인 주기 1회분, 레코드 = 길이/crc32/샘플 시각 헤더 + JSON [kind, key, metrics])
+    쓰기는 버퍼링하고 sync()에서 fsync (fsync_interval <= 0이면 레코드마다 fsync)
+    """
+
+    def __init__(self, directory: str, fsync_interval: float):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+        self.file = None
+        self.path: Optional[str] = None
+        self.newest: Dict[str, float] = {}  # 파일 -> 가장 늦은 샘플 시각 (재생/기록 시 갱신)
+        files = self.files()
+        self.sequence = int(os.path.basename(files[-1]).split('.')[0]) if files else 0
+
+    def files(self) -> List[str]:
+        return sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                      if name.endswith('.wal'))
+
+    def append(self, kind: str, key: str, metrics: Dict[str, Any], epoch: float):
+        payload = json.dumps([kind, key, metrics], separators=(',', ':'), default=str).encode('utf-8')
+        record = WAL_RECORD_HEADER.pack(len(payload), zlib.crc32(payload), epoch) + payload
+        with self.lock:
+            self.file.write(record)
+            if epoch > self.newest[self.path]:
+                self.newest[self.path] = epoch
+            if self.fsync_interval <= 0:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+    def sync(self):
+        """버퍼를 디스크에 반영"""
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+    def rotate(self):
+        """현재 파일을 닫고 새 파일에 이어서 기록"""
+        with self.lock:
+            self._close_locked()
+            self.sequence += 1
+            self.path = os.path.join(self.directory, f"{self.sequence:08d}.wal")
+            self.file = open(self.path, 'ab')
+            self.newest[self.path] = -math.inf
+        _sync_directory(self.directory)
+
+    def prune(self, sealed_until: float):
+        """모든 레코드가 봉인된 구간(sealed_until 이전)에 속하는 파일 삭제 (기록 중인 파일 제외)"""
+        for path in self.files():
+            if path != self.path and self.newest.get(path, math.inf) < sealed_until:
+                os.remove(path)
+                del self.newest[path]
+
+    def replay(self, since: float = -math.inf) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        샘플 시각이 since 이후인 레코드를 순서대로 반환 (나머지는 JSON 파싱 없이 건너뜀)
+        잘리거나 손상된 레코드를 만나면 그 파일의 나머지는 건너뜀
+        """
+        for path in self.files():
+            with open(path, 'rb') as f:
+                data = f.read()
+            position = 0
+            newest = -math.inf
+            while position + WAL_RECORD_HEADER.size <= len(data):
+                length, checksum, epoch = WAL_RECORD_HEADER.unpack_from(data, position)
+                payload = data[position + WAL_RECORD_HEADER.size:position + WAL_RECORD_HEADER.size + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    print(f"WAL {path}: truncated or corrupt record at offset {position}, skipping rest")
+                    break
+                if epoch > newest:
+                    newest = epoch
+                if epoch >= since:
+                    kind, key, metrics = json.loads(payload)
+                    yield kind, key, metrics
+                position += WAL_RECORD_HEADER.size + length
+            self.newest[path] = newest
+
+    def _close_locked(self):
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.file = None
+
+    def close(self):
+        with self.lock:
+            self._close_locked()
+
+
+class Segment:
+    """
+    봉인된 세그먼트 1개 (mmap, 읽기 전용)
+    index만 파싱하고 컬럼은 요청 시 memoryview로 반환, 샘플별 추가 필드(extras)는 필요할 때만 파싱
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = SEGMENT_HEADER.unpack_from(self.map, 0)
+        if magic != SEGMENT_MAGIC:
+            raise ValueError(f"{path}: not a segment file")
+        index = json.loads(self.map[index_offset:index_offset + index_length])
+        self.start = index['start']
+        self.end = index['end']
+        self.series: Dict[Tuple[str, str], Dict[str, Any]] = {
+            (entry['kind'], entry['key']): entry for entry in index['series']
+        }
+        self.view = memoryview(self.map)
+
+    def _columns(self, offset: int, count: int, typecodes: str) -> Tuple[memoryview, ...]:
+        size = 8 * count
+        return tuple(self.view[offset + size * index:offset + size * (index + 1)].cast(typecode)
+                     for index, typecode in enumerate(typecodes))
+
+    def raw(self, entry: Dict[str, Any]) -> Tuple[memoryview, ...]:
+        """원본 컬럼 (timestamps, 수치 컬럼 6개)"""
+        return self._columns(entry['offset'], entry['count'], 'd' + 'q' * VALUE_COLUMNS)
+
+    def extras(self, entry: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """세그먼트 내 위치 -> 샘플별 추가 필드"""
+        if not entry.get('extras_length'):
+            return {}
+        offset = entry['extras_offset']
+        extras = json.loads(self.view[offset:offset + entry['extras_length']].tobytes())
+        return {int(index): extra for index, extra in extras.items()}
+
+    def tier(self, entry: Dict[str, Any], resolution: int) -> Optional[Tuple[memoryview, ...]]:
+        """다운샘플링 단계 컬럼 (epochs, counts, min 6개, max 6개, sum 6개)"""
+        tier = entry.get('tiers', {}).get(str(resolution))
+        if tier is None:
+            return None
+        return self._columns(tier['offset'], tier['count'], 'dq' + 'q' * 3 * VALUE_COLUMNS)
+
+
+class SegmentWriter:
+    """세그먼트 파일 작성 (임시 파일에 컬럼을 순서대로 쓰고 index를 마지막에 기록한 뒤 이름 변경)"""
+
+    def __init__(self, directory: str, start: int, end: int):
+        self.directory = directory
+        self.start = start
+        self.end = end
+        self.path = os.path.join(directory, f"{start:012d}-{end:012d}.seg")
+        self.file = open(self.path + '.tmp', 'wb')
+        self.file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, 0, 0))
+        self.entries: List[Dict[str, Any]] = []
+
+    def _write(self, data) -> int:
+        offset = self.file.tell()
+        self.file.write(data)
+        padding = -self.file.tell() % 8
+        if padding:
+            self.file.write(b'\0' * padding)
+        return offset
+
+    def _write_columns(self, columns: Sequence) -> int:
+        offset = self.file.tell()
+        for column in columns:
+            self._write(column)
+        return offset
+
+    def add(self, kind: str, key: str, labels: Optional[Dict[str, Any]], raw: Optional[Sequence] = None,
+            extras: Optional[Dict[int, Dict[str, Any]]] = None, tiers: Optional[Dict[int, Sequence]] = None):
+        """
+        시리즈 1개 기록
+        raw: (timestamps, 수치 컬럼 6개), tiers: 해상도 -> TierBuffer 컬럼 (array 또는 memoryview)
+        """
+        entry = {'kind': kind, 'key': key, 'labels': labels or {}, 'count': 0, 'offset': 0}
+        if raw is not None and len(raw[0]):
+            entry['count'] = len(raw[0])
+            entry['offset'] = self._write_columns(raw)
+            if extras:
+                data = json.dumps(extras, separators=(',', ':'), default=str).encode('utf-8')
+                entry['extras_offset'] = self._write(data)
+                entry['extras_length'] = len(data)
+        entry['tiers'] = {}
+        for resolution, columns in (tiers or {}).items():
+            if len(columns[0]):
+                entry['tiers'][str(resolution)] = {'count': len(columns[0]), 'offset': self._write_columns(columns)}
+        if entry['count'] or entry['tiers']:
+            self.entries.append(entry)
+
+    def commit(self) -> str:
+        index = json.dumps({'start': self.start, 'end': self.end, 'series': self.entries},
+                           separators=(',', ':')).encode('utf-8')
+        index_offset = self._write(index)
+        self.file.seek(0)
+        self.file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, index_offset, len(index)))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.path + '.tmp', self.path)
+        _sync_directory(self.directory)
+        return self.path
+
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.path + '.tmp')
+        except FileNotFoundError:
+            pass
+
+
+class SeriesHistory:
+    """시리즈 1개의 세그먼트 원본 이력 (mmap 컬럼에서 bisect로 구간만 읽음)"""
+
+    def __init__(self, parts: List[Tuple[Segment, Dict[str, Any]]]):
+        self.parts = parts
+
+    def _ranges(self, lo: float, hi: float) -> Iterator[Tuple[Segment, Dict[str, Any], Tuple, int, int]]:
+        for segment, entry in self.parts:
+            if segment.end <= lo or segment.start >= hi or not entry['count']:
+                continue
+            columns = segment.raw(entry)
+            begin, end = bisect_left(columns[0], lo), bisect_left(columns[0], hi)
+            if begin < end:
+                yield segment, entry, columns, begin, end
+
+    def count(self, lo: float, hi: float) -> int:
+        return sum(end - begin for _, _, _, begin, end in self._ranges(lo, hi))
+
+    def rows(self, lo: float, hi: float) -> List[Tuple]:
+        """[lo, hi) 구간 원본 값 (SeriesBuffer.window_rows()와 같은 형식)"""
+        rows = []
+        for segment, entry, columns, begin, end in self._ranges(lo, hi):
+            extras = segment.extras(entry)
+            rows.extend(zip(*(column[begin:end] for column in columns),
+                            [extras.get(index) for index in range(begin, end)]))
+        return rows
+
+
+class SegmentStore:
+    """세그먼트 디렉터리 (목록은 교체만 하므로 조회는 lock 없이 스냅샷을 읽음)"""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segments: List[Segment] = []
+
+    def load(self):
+        """기존 세그먼트 mmap (작성 중 중단된 임시 파일은 삭제)"""
+        segments = []
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.tmp'):
+                os.remove(path)
+            elif name.endswith('.seg'):
+                try:
+                    segments.append(Segment(path))
+                except (OSError, ValueError, struct.error) as e:
+                    print(f"Skipping unreadable segment {path}: {e}")
+        self.segments = sorted(segments, key=lambda segment: segment.start)
+
+    @property
+    def sealed_until(self) -> Optional[int]:
+        """봉인된 마지막 시각 (이 시각 이전 샘플은 세그먼트에 있음)"""
+        return max((segment.end for segment in self.segments), default=None)
+
+    def writer(self, start: int, end: int) -> SegmentWriter:
+        return SegmentWriter(self.directory, start, end)
+
+    def add(self, path: str):
+        self.segments = sorted(self.segments + [Segment(path)], key=lambda segment: segment.start)
+
+    def series_keys(self) -> List[Tuple[str, str]]:
+        """세그먼트에 기록된 시리즈 (마지막으로 기록된 세그먼트가 최근인 것부터)"""
+        keys = {}
+        for segment in reversed(self.segments):
+            keys.update(dict.fromkeys(segment.series))
+        return list(keys)
+
+    def parts(self, kind: str, key: str) -> List[Tuple[Segment, Dict[str, Any]]]:
+        """시리즈가 포함된 (세그먼트, index 항목) 목록 (시간 순)"""
+        return [(segment, segment.series[(kind, key)]) for segment in self.segments
+                if (kind, key) in segment.series]
+
+    def history(self, kind: str, key: str) -> SeriesHistory:
+        return SeriesHistory(self.parts(kind, key))
+
+    def expire(self, cutoff: float):
+        """cutoff 이전에 끝난 세그먼트 삭제 (이미 열린 mmap은 참조가 사라질 때 해제)"""
+        expired = [segment for segment in self.segments if segment.end <= cutoff]
+        if not expired:
+            return
+        self.segments = [segment for segment in self.segments if segment.end > cutoff]
+        for segment in expired:
+            os.remove(segment.path)
+
+    def compact(self, now: float, duration: int, tier_retention: Dict[int, int]):
+        """
+        끝난 duration 구간 안의 세그먼트 여러 개를 하나로 병합
+        보존 기간이 지난 다운샘플링 단계 데이터는 병합 결과에서 제외
+        """
+        groups: Dict[int, List[Segment]] = {}
+        for segment in self.segments:
+            groups.setdefault(segment.start // duration, []).append(segment)
+
+        for bucket, group in groups.items():
+            start, end = bucket * duration, (bucket + 1) * duration
+            if len(group) < 2 or end > now or any(segment.end > end for segment in group):
+                continue
+            self._merge(group, group[0].start, group[-1].end, now, tier_retention)
+
+    def _merge(self, group: List[Segment], start: int, end: int, now: float, tier_retention: Dict[int, int]):
+        writer = self.writer(start, end)
+        try:
+            keys = {}
+            for segment in group:
+                keys.update(dict.fromkeys(segment.series))
+            for kind, key in keys:
+                parts = [(segment, segment.series[(kind, key)]) for segment in group
+                         if (kind, key) in segment.series]
+                writer.add(kind, key, parts[-1][1]['labels'], *self._merge_series(parts, end, now, tier_retention))
+            path = writer.commit()
+        except OSError as e:
+            writer.abort()
+            print(f"Segment compaction failed: {e}")
+            return
+
+        merged = Segment(path)
+        self.segments = sorted([segment for segment in self.segments if segment not in group] + [merged],
+                               key=lambda segment: segment.start)
+        for segment in group:
+            if segment.path != path:
+                os.remove(segment.path)
+
+    @staticmethod
+    def _merge_series(parts: List[Tuple[Segment, Dict[str, Any]]], end: int, now: float,
+                      tier_retention: Dict[int, int]) -> Tuple[Optional[List[array]], Dict[int, Dict], Dict[int, List]]:
+        raw, extras = None, {}
+        raw_parts = [(segment, entry) for segment, entry in parts if entry['count']]
+        if raw_parts:
+            raw = [array(typecode) for typecode in 'd' + 'q' * VALUE_COLUMNS]
+            for segment, entry in raw_parts:
+                base = len(raw[0])
+                for merged, column in zip(raw, segment.raw(entry)):
+                    merged.frombytes(column.cast('B'))
+                for index, extra in segment.extras(entry).items():
+                    extras[base + index] = extra
+
+        tiers = {}
+        for resolution, retention in tier_retention.items():
+            if end <= now - retention:
+                continue
+            columns = [segment.tier(entry, resolution) for segment, entry in parts]
+            columns = [column for column in columns if column is not None]
+            if columns:
+                merged = [array(typecode) for typecode in 'dq' + 'q' * 3 * VALUE_COLUMNS]
+                for part in columns:
+                    for target, column in zip(merged, part):
+                        target.frombytes(column.cast('B'))
+                tiers[resolution] = merged
+        return raw, extras, tiers
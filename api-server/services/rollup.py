@@ -0,0 +1,138 @@
+"""
+네임스페이스/디플로이먼트 롤업 모듈
+파드 최신 샘플이 바뀔 때마다 소속 그룹의 합계에서 이전 샘플을 빼고 새 샘플을 더해 O(1)로 갱신
+- 목록/단건 조회는 파드 재집계 없이 합계를 그대로 반환
+- 조회용 합계는 갱신된 그룹만 다시 계산한 copy-on-write 스냅샷으로 게시 (조회는 lock 불필요)
+- ROLLUP_INTERVAL 경계를 지날 때 그룹별 합계를 정렬된 시각의 집계 샘플로 내보냄
+"""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .series import VALUE_FIELDS
+
+SUMMARY_STATS = ('min', 'max', 'mean', 'last', 'p95')
+
+
+class RollupGroup:
+    """그룹 1개(네임스페이스 또는 디플로이먼트)의 소속 파드 합계"""
+
+    __slots__ = ('pod_count', 'values', 'summary', 'summary_pods')
+
+    def __init__(self):
+        self.pod_count = 0
+        self.values = [0] * len(VALUE_FIELDS)
+        self.summary: Dict[str, Dict[str, float]] = {}  # 메트릭 -> 통계별 합계
+        self.summary_pods: Dict[str, int] = {}  # 메트릭 -> 요약을 보고한 파드 수
+
+    def add(self, metrics: Dict[str, Any], sign: int):
+        """파드 샘플 1건을 합계에 더함 (sign=-1이면 뺌)"""
+        self.pod_count += sign
+        for index, (field, parent) in enumerate(VALUE_FIELDS):
+            source = (metrics.get(parent) or {}) if parent else metrics
+            self.values[index] += sign * int(source.get(field, 0))
+
+        for metric, stats in (metrics.get('summary') or {}).items():
+            totals = self.summary.get(metric)
+            if totals is None:
+                totals = self.summary[metric] = dict.fromkeys(SUMMARY_STATS, 0)
+            for stat in SUMMARY_STATS:
+                totals[stat] += sign * stats.get(stat, 0)
+            pods = self.summary_pods.get(metric, 0) + sign
+            if pods:
+                self.summary_pods[metric] = pods
+            else:
+                # 마지막 보고 파드가 빠지면 누적 오차 없이 제거
+                del self.summary_pods[metric]
+                del self.summary[metric]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """aggregate_pod_metrics()와 같은 형식의 합계"""
+        cpu, memory, read_bytes, write_bytes, bytes_sent, bytes_recv = self.values
+        aggregated = {
+            'cpu_millicores': cpu,
+            'memory_bytes': memory,
+            'disk_io': {'read_bytes': read_bytes, 'write_bytes': write_bytes},
+            'network_io': {'bytes_sent': bytes_sent, 'bytes_recv': bytes_recv}
+        }
+        if self.summary:
+            aggregated['summary'] = {
+                metric: dict(totals, mean=round(totals['mean'], 2)) for metric, totals in self.summary.items()
+            }
+        return aggregated
+
+
+class RollupEngine:
+    """
+    네임스페이스/디플로이먼트 합계 + 주기별 집계 샘플 생성
+    update()/publish()/advance()는 StorageService 쓰기 lock 안에서 호출하고,
+    namespace_totals/deployment_totals 스냅샷은 lock 없이 읽음
+    """
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self.namespaces: Dict[str, RollupGroup] = {}
+        self.deployments: Dict[Tuple[str, str], RollupGroup] = {}  # (namespace, deployment_name) -> 합계
+        self.current_bucket: Optional[int] = None
+
+        # 게시된 합계 스냅샷 (교체만 하고 수정하지 않음)
+        self.namespace_totals: Dict[str, Dict[str, Any]] = {}
+        self.deployment_totals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._dirty_namespaces = set()
+        self._dirty_deployments = set()
+
+    def update(self, previous: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]],
+               previous_owner: Optional[str], current_owner: Optional[str]):
+        """파드 최신 샘플 교체 반영 (previous/current가 None이면 파드 추가/제거)"""
+        if previous is not None:
+            self._apply(self.namespaces, self._dirty_namespaces, previous['namespace'], previous, -1)
+            if previous_owner:
+                self._apply(self.deployments, self._dirty_deployments, (previous['namespace'], previous_owner),
+                            previous, -1)
+        if current is not None:
+            self._apply(self.namespaces, self._dirty_namespaces, current['namespace'], current, 1)
+            if current_owner:
+                self._apply(self.deployments, self._dirty_deployments, (current['namespace'], current_owner),
+                            current, 1)
+
+    @staticmethod
+    def _apply(groups: Dict[Hashable, RollupGroup], dirty: set, key: Hashable, metrics: Dict[str, Any], sign: int):
+        dirty.add(key)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = RollupGroup()
+        group.add(metrics, sign)
+        if group.pod_count <= 0:
+            del groups[key]
+
+    def publish(self):
+        """변경된 그룹만 다시 계산하여 조회용 스냅샷 교체"""
+        if self._dirty_namespaces:
+            self.namespace_totals = self._republish(self.namespace_totals, self.namespaces, self._dirty_namespaces)
+        if self._dirty_deployments:
+            self.deployment_totals = self._republish(self.deployment_totals, self.deployments,
+                                                     self._dirty_deployments)
+
+    @staticmethod
+    def _republish(totals: Dict, groups: Dict[Hashable, RollupGroup], dirty: set) -> Dict:
+        totals = dict(totals)
+        for key in dirty:
+            group = groups.get(key)
+            if group is None:
+                totals.pop(key, None)
+            else:
+                totals[key] = group.to_dict()
+        dirty.clear()
+        return totals
+
+    def advance(self, now: float) -> Optional[float]:
+        """
+        now가 새 주기에 들어섰으면 경계 시각(epoch 초)을 반환 (호출자가 현재 합계를 그 시각의 샘플로 기록)
+        같은 주기 안에서는 None
+        """
+        bucket = int(now // self.interval)
+        if bucket == self.current_bucket:
+            return None
+        first = self.current_bucket is None
+        self.current_bucket = bucket
+        # 첫 주기는 합계가 아직 채워지지 않았으므로 내보내지 않음
+        return None if first else float(bucket * self.interval)
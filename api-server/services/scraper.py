@@ -0,0 +1,222 @@
+"""
+pull 모드 수집 모듈
+각 collector의 /snapshot 엔드포인트를 주기적으로 가져와 저장소에 반영
+- 대상 발견: 정적 목록(SCRAPE_TARGETS) 또는 headless Service DNS 조회
+- 주기 안에서 대상별 시작 시각을 균등 분산 (동시 요청 몰림 방지)
+- 제한된 워커 풀에서 동시 수집, 대상별 타임아웃
+- 일정 주기 이상 수집되지 않은 노드/파드는 stale로 표시
+"""
+
+import time
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from .storage import storage_service
+
+
+class ScrapeTarget:
+    """수집 대상 collector 1개의 상태"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.node_name: Optional[str] = None
+        self.instance: Optional[str] = None  # collector 프로세스 식별자 (재시작 감지)
+        self.node_seq: Optional[int] = None
+        self.pod_seq: Optional[int] = None
+        self.last_scrape: Optional[str] = None
+        self.last_success: Optional[float] = None  # monotonic
+        self.last_duration = 0.0
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.skipped = 0  # 이전 수집이 끝나지 않아 건너뛴 횟수
+        self.stale = False
+        self.in_flight = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'address': self.address,
+            'node_name': self.node_name,
+            'last_scrape': self.last_scrape,
+            'last_duration_ms': round(self.last_duration * 1000, 2),
+            'last_error': self.last_error,
+            'consecutive_failures': self.consecutive_failures,
+            'skipped': self.skipped,
+            'stale': self.stale
+        }
+
+
+class ScrapeService:
+    """collector 스냅샷 수집 스케줄러 (백그라운드 스레드 + 워커 풀)"""
+
+    def __init__(self, storage=storage_service, interval: int = 30, timeout: float = 5.0, workers: int = 8,
+                 static_targets: Optional[List[str]] = None, service: str = '', port: int = 9105,
+                 discovery_interval: int = 60, staleness_intervals: int = 3):
+        self.storage = storage
+        self.interval = interval
+        self.timeout = timeout
+        self.workers = workers
+        self.static_targets = static_targets or []
+        self.service = service
+        self.port = port
+        self.discovery_interval = discovery_interval
+        self.staleness_intervals = staleness_intervals
+
+        self.targets: Dict[str, ScrapeTarget] = {}  # address -> 대상
+        self.last_discovery = 0.0
+        self.shutdown_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=0)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def from_config(cls) -> 'ScrapeService':
+        return cls(
+            interval=Config.SCRAPE_INTERVAL,
+            timeout=Config.SCRAPE_TIMEOUT,
+            workers=Config.SCRAPE_WORKERS,
+            static_targets=[target.strip() for target in Config.SCRAPE_TARGETS.split(',') if target.strip()],
+            service=Config.SCRAPE_SERVICE,
+            port=Config.SCRAPE_PORT,
+            discovery_interval=Config.SCRAPE_DISCOVERY_INTERVAL,
+            staleness_intervals=Config.SCRAPE_STALENESS_INTERVALS
+        )
+
+    # ==================== 대상 발견 ====================
+
+    def discover(self) -> List[str]:
+        """수집 대상 주소 목록 (host:port)"""
+        if self.static_targets:
+            return sorted(self.static_targets)
+        if not self.service:
+            return []
+
+        # headless Service는 collector 파드(hostNetwork이면 노드 IP)마다 A 레코드를 반환
+        infos = socket.getaddrinfo(self.service, self.port, proto=socket.IPPROTO_TCP)
+        return sorted({f"{info[4][0]}:{self.port}" for info in infos})
+
+    def refresh_targets(self):
+        """대상 목록 갱신 (기존 대상 상태 유지, 사라진 대상의 노드는 stale 표시)"""
+        try:
+            addresses = self.discover()
+        except OSError as e:
+            print(f"Scrape target discovery failed: {e}")
+            return
+        self.last_discovery = time.monotonic()
+
+        for address in addresses:
+            if address not in self.targets:
+                self.targets[address] = ScrapeTarget(address)
+        for address in list(self.targets):
+            if address not in addresses:
+                target = self.targets.pop(address)
+                if target.node_name and not target.stale:
+                    self.storage.mark_node_stale(target.node_name)
+
+    # ==================== 수집 ====================
+
+    def scrape(self, target: ScrapeTarget):
+        """대상 1개 수집 (워커 스레드)"""
+        began = time.monotonic()
+        try:
+            response = self.session.get(f"http://{target.address}/snapshot", timeout=self.timeout)
+            response.raise_for_status()
+            self._ingest(target, response.json())
+            target.last_success = time.monotonic()
+            target.last_error = None
+            target.consecutive_failures = 0
+            target.stale = False
+        except (requests.RequestException, ValueError, KeyError) as e:
+            target.consecutive_failures += 1
+            target.last_error = str(e)
+        finally:
+            target.last_duration = time.monotonic() - began
+            target.last_scrape = datetime.now().isoformat() + 'Z'
+            target.in_flight = False
+
+    def _ingest(self, target: ScrapeTarget, snapshot: Dict[str, Any]):
+        """스냅샷에서 새로 수집된 노드/파드 메트릭만 저장 (같은 순번은 중복 저장하지 않음)"""
+        node_name = snapshot['node_name']
+        if snapshot.get('instance') != target.instance:
+            target.instance = snapshot.get('instance')
+            target.node_seq = target.pod_seq = None
+
+        node_metrics = None
+        if snapshot.get('node') and snapshot.get('node_seq') != target.node_seq:
+            node_metrics = snapshot['node']
+        pod_metrics_list = []
+        if snapshot.get('pod_seq') != target.pod_seq:
+            pod_metrics_list = snapshot.get('pods') or []
+
+        if node_metrics is not None or pod_metrics_list:
+            self.storage.store_batch_metrics(node_name, node_metrics, pod_metrics_list)
+
+        target.node_name = node_name
+        target.node_seq = snapshot.get('node_seq')
+        target.pod_seq = snapshot.get('pod_seq')
+
+    def check_staleness(self):
+        """staleness_intervals 주기 동안 성공하지 못한 대상의 노드/파드를 stale 표시"""
+        cutoff = time.monotonic() - self.staleness_intervals * self.interval
+        for target in list(self.targets.values()):
+            if target.stale or not target.node_name:
+                continue
+            if target.last_success is None or target.last_success < cutoff:
+                target.stale = True
+                self.storage.mark_node_stale(target.node_name)
+
+    def run(self):
+        """수집 루프: 주기마다 대상들을 균등 간격으로 워커 풀에 제출"""
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scrape')
+        while not self.shutdown_event.is_set():
+            cycle_start = time.monotonic()
+            if cycle_start - self.last_discovery >= self.discovery_interval:
+                self.refresh_targets()
+
+            targets = list(self.targets.values())
+            spacing = self.interval / len(targets) if targets else 0
+            for index, target in enumerate(targets):
+                delay = cycle_start + index * spacing - time.monotonic()
+                if delay > 0 and self.shutdown_event.wait(delay):
+                    break
+                if target.in_flight:
+                    target.skipped += 1
+                    continue
+                target.in_flight = True
+                self._executor.submit(self.scrape, target)
+
+            self.check_staleness()
+            self.shutdown_event.wait(max(0.0, cycle_start + self.interval - time.monotonic()))
+
+        self._executor.shutdown(wait=False)
+
+    def start(self):
+        """백그라운드 수집 스레드 시작"""
+        self._thread = threading.Thread(target=self.run, name='scrape-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown_event.set()
+
+    def get_status(self) -> Dict[str, Any]:
+        """수집 대상 상태 목록"""
+        targets = [target.to_dict() for target in list(self.targets.values())]
+        return {
+            'interval': self.interval,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'targets': targets,
+            'stale_targets': sum(1 for target in targets if target['stale'])
+        }
+
+
+# 전역 인스턴스
+scrape_service = ScrapeService.from_config()
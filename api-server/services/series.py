@@ -0,0 +1,366 @@
+"""
+시계열 저장 모듈
+시리즈마다 샘플을 청크 단위로 저장 (가장 최근 head 청크만 비압축 컬럼 배열, 나머지는 압축 청크)
+- head 청크의 타임스탬프는 epoch 초(double), 수치 필드는 int64 컬럼 배열에 보관
+- 닫힌 청크는 delta-of-delta/차분 + zlib로 압축 (chunks 모듈)
+- 샘플은 타임스탬프 순으로 유지하여 윈도우 조회는 구간과 겹치는 청크만 풀고 bisect로 구간만 복사
+- 시리즈 공통 필드(node_name, namespace, pod_name 등)는 시리즈당 한 번만 보관
+- summary 등 선택 필드와 공통 값과 다른 필드만 샘플별로 따로 보관
+- dict는 응답 시점에만 생성
+- 다운샘플링 단계(TierBuffer)가 있으면 샘플 추가 시 함께 집계하고, 조회 시 윈도우/포인트 예산에 맞는 단계를 선택
+"""
+
+import math
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .chunks import Chunk
+
+# 컬럼으로 저장하는 수치 필드 (필드명, 상위 dict 키)
+VALUE_FIELDS = (
+    ('cpu_millicores', None),
+    ('memory_bytes', None),
+    ('read_bytes', 'disk_io'),
+    ('write_bytes', 'disk_io'),
+    ('bytes_sent', 'network_io'),
+    ('bytes_recv', 'network_io')
+)
+
+# 시리즈 공통 필드 (첫 샘플 값을 시리즈 라벨로 보관)
+LABEL_FIELDS = ('node_name', 'namespace', 'pod_name', 'deployment_name', 'owner_kind', 'owner_name', 'replicaset_name')
+
+# 컬럼/라벨 외에 샘플별 보관이 필요 없는 필드
+COLUMN_FIELDS = frozenset(('timestamp', 'cpu_millicores', 'memory_bytes', 'disk_io', 'network_io'))
+
+# 닫힌 청크 1개의 샘플 수 (30초 수집 주기 기준 1시간)
+DEFAULT_CHUNK_SIZE = 120
+
+
+def to_epoch(timestamp: Any) -> float:
+    """ISO 8601 타임스탬프를 epoch 초로 변환 (잘못된 값은 NaN)"""
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '')).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return math.nan
+
+
+def client_epoch(timestamp: Any) -> float:
+    """
+    collector가 보낸 수집 시각(UTC ISO 8601, 'Z' 또는 오프셋 포함)을 epoch 초로 변환 (잘못된 값은 NaN)
+    오프셋이 없는 값은 서버 저장 형식과 같이 로컬 시각으로 해석
+    """
+    try:
+        epoch = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, TypeError, ValueError, OverflowError, OSError):
+        return math.nan
+    return epoch
+
+
+def from_epoch(epoch: float) -> str:
+    """epoch 초를 저장 형식 타임스탬프(로컬 시각 + 'Z')로 변환"""
+    return datetime.fromtimestamp(epoch).isoformat() + 'Z'
+
+
+def _shift_extras(extras: Dict[int, Dict[str, Any]], position: int) -> Dict[int, Dict[str, Any]]:
+    """position에 샘플이 삽입될 때 그 이후 샘플의 추가 필드 위치를 1씩 뒤로 이동"""
+    return {index + 1 if index >= position else index: extra for index, extra in extras.items()}
+
+
+class SeriesBuffer:
+    """
+    시리즈 1개의 청크 단위 버퍼
+    샘플은 열린 head 청크(비압축 컬럼 배열)에 쌓이고, chunk_size개가 차면 압축된 닫힌 청크(Chunk)로 봉인
+    전체 샘플 수가 용량을 넘으면 가장 오래된 닫힌 청크부터 통째로 제거 (용량은 청크 단위로 지켜짐)
+    청크 순서와 청크 안 순서는 항상 타임스탬프 오름차순 (재전송 등으로 늦게 도착한 샘플은 제자리에 삽입)
+    """
+
+    __slots__ = ('capacity', 'chunk_size', 'labels', 'chunks', 'timestamps', 'columns', 'extras', 'size',
+                 'truncated', 'tiers')
+
+    def __init__(self, capacity: int, tiers: Sequence = (), chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.capacity = capacity
+        self.chunk_size = max(1, min(chunk_size, capacity))
+        self.tiers = tuple(tiers)  # 다운샘플링 단계 (TierBuffer, 해상도 오름차순)
+        self.labels: Optional[Dict[str, Any]] = None
+        self.chunks: List[Chunk] = []  # 닫힌 청크 (오래된 것부터)
+        # 열린 head 청크
+        self.timestamps = array('d')
+        self.columns = tuple(array('q') for _ in VALUE_FIELDS)
+        self.extras: Dict[int, Dict[str, Any]] = {}  # head 내 위치 -> 컬럼/라벨로 표현되지 않는 필드
+        self.size = 0  # 전체 샘플 수 (닫힌 청크 + head)
+        self.truncated = False  # 용량 초과로 오래된 샘플을 버린 적이 있는지
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in self._copy_rows(self._blocks(-math.inf)):
+            yield self.materialize_row(row)
+
+    def append(self, metrics: Dict[str, Any]) -> float:
+        """샘플 1건 추가 후 저장된 epoch 반환 (변환에 실패하면 버퍼는 변경하지 않음)"""
+        values = []
+        for field, parent in VALUE_FIELDS:
+            source = (metrics.get(parent) or {}) if parent else metrics
+            values.append(int(source.get(field, 0)))
+
+        timestamp = metrics.get('timestamp')
+        epoch = to_epoch(timestamp)
+        # 잘못된 타임스탬프는 -inf로 저장 (정렬 순서 유지, 윈도우 조회에서 항상 제외)
+        valid = not math.isnan(epoch)
+        if not valid:
+            epoch = -math.inf
+
+        if self.labels is None:
+            self.labels = {key: metrics[key] for key in LABEL_FIELDS if key in metrics}
+
+        extra = {}
+        for key, value in metrics.items():
+            if key in COLUMN_FIELDS:
+                continue
+            if key in LABEL_FIELDS and key in self.labels and self.labels[key] == value:
+                continue
+            extra[key] = value
+        # 변환 후 원래 문자열이 복원되지 않는 타임스탬프(오프셋 표기 등)는 원문 보관
+        if not valid or from_epoch(epoch) != timestamp:
+            extra['timestamp'] = timestamp
+
+        self._add(epoch, values, extra, valid)
+        return epoch
+
+    def append_values(self, epoch: float, values: Sequence[int], labels: Dict[str, Any],
+                      extra: Optional[Dict[str, Any]] = None):
+        """
+        이미 해석된 샘플 1건 추가 (compact 수신 경로: dict를 거치지 않고 VALUE_FIELDS 순서 정수 값을 컬럼에 바로 기록)
+        epoch는 유효한 수집 시각, 시리즈 라벨과 다른 라벨 값은 샘플별 추가 필드로 보관
+        """
+        if self.labels is None:
+            self.labels = dict(labels)
+        elif labels != self.labels:
+            extra = dict(extra or {})
+            for key, value in labels.items():
+                if self.labels.get(key) != value:
+                    extra[key] = value
+        self._add(epoch, values, extra or {}, True)
+
+    def _add(self, epoch: float, values: Sequence[int], extra: Dict[str, Any], valid: bool):
+        if self.chunks and epoch < self.chunks[-1].last:
+            self._insert_closed(epoch, values, extra)
+        else:
+            self._insert_head(epoch, values, extra)
+        self.size += 1
+        if len(self.timestamps) >= self.chunk_size:
+            self._seal_head()
+        if valid:
+            for tier in self.tiers:
+                tier.add(epoch, values)
+
+    def _insert_head(self, epoch: float, values: Sequence[int], extra: Dict[str, Any]):
+        """head 청크의 정렬 위치에 삽입 (보통은 맨 뒤에 추가)"""
+        timestamps = self.timestamps
+        if not timestamps or timestamps[-1] <= epoch:
+            position = len(timestamps)
+            timestamps.append(epoch)
+            for column, value in zip(self.columns, values):
+                column.append(value)
+        else:
+            position = bisect_right(timestamps, epoch)
+            timestamps.insert(position, epoch)
+            for column, value in zip(self.columns, values):
+                column.insert(position, value)
+            self.extras = _shift_extras(self.extras, position)
+        if extra:
+            self.extras[position] = extra
+
+    def _insert_closed(self, epoch: float, values: Sequence[int], extra: Dict[str, Any]):
+        """이미 닫힌 청크 구간에 늦게 도착한 샘플: 해당 청크만 풀어서 삽입 후 다시 압축"""
+        chunks = self.chunks
+        index = len(chunks) - 1
+        while index > 0 and chunks[index].first > epoch:
+            index -= 1
+        timestamps, columns, extras = chunks[index].decode()
+        position = bisect_right(timestamps, epoch)
+        timestamps.insert(position, epoch)
+        for column, value in zip(columns, values):
+            column.insert(position, value)
+        extras = _shift_extras(extras, position)
+        if extra:
+            extras[position] = extra
+        chunks[index] = Chunk.encode(timestamps, columns, extras)
+
+    def _seal_head(self):
+        """head 청크를 압축해 닫고, 용량을 넘는 만큼 오래된 닫힌 청크 제거"""
+        self.chunks.append(Chunk.encode(self.timestamps, self.columns, self.extras))
+        self.timestamps = array('d')
+        self.columns = tuple(array('q') for _ in VALUE_FIELDS)
+        self.extras = {}
+        chunks = self.chunks
+        while chunks and self.size - chunks[0].count >= self.capacity:
+            self.size -= chunks.pop(0).count
+            self.truncated = True
+
+    def materialize_row(self, row: Tuple) -> Dict[str, Any]:
+        """window_rows() 원시 값 1건을 응답용 dict로 변환"""
+        epoch, cpu, memory, read_bytes, write_bytes, bytes_sent, bytes_recv, extra = row
+        sample = dict(self.labels)
+        if not (extra and 'timestamp' in extra):
+            sample['timestamp'] = from_epoch(epoch)
+        sample['cpu_millicores'] = cpu
+        sample['memory_bytes'] = memory
+        sample['disk_io'] = {'read_bytes': read_bytes, 'write_bytes': write_bytes}
+        sample['network_io'] = {'bytes_sent': bytes_sent, 'bytes_recv': bytes_recv}
+        if extra:
+            sample.update(extra)
+        return sample
+
+    def _blocks(self, lo: float, hi: float = math.inf) -> List[Tuple[Any, int, int]]:
+        """
+        [lo, hi) 구간과 겹치는 청크의 (블록, 시작 위치, 끝 위치) 목록 (타임스탬프 순)
+        블록은 구간 전체가 포함된 닫힌 청크면 Chunk 그대로(샘플 수만 필요할 때 압축 해제 생략),
+        경계에 걸친 청크와 head는 (타임스탬프, 수치 컬럼, 추가 필드)
+        """
+        blocks = []
+        for chunk in self.chunks:
+            if chunk.last < lo or chunk.first >= hi:
+                continue
+            if lo <= chunk.first and chunk.last < hi:
+                blocks.append((chunk, 0, chunk.count))
+            else:
+                blocks.append(self._slice(chunk.decode(), lo, hi))
+        if self.timestamps:
+            blocks.append(self._slice((self.timestamps, self.columns, self.extras), lo, hi))
+        return [block for block in blocks if block[1] < block[2]]
+
+    @staticmethod
+    def _slice(block: Tuple, lo: float, hi: float) -> Tuple[Any, int, int]:
+        timestamps = block[0]
+        begin = bisect_left(timestamps, lo)
+        return block, begin, bisect_left(timestamps, hi, begin)
+
+    def oldest_epoch(self) -> float:
+        """가장 오래된 샘플 시각 (비어 있으면 inf)"""
+        if self.chunks:
+            return self.chunks[0].first
+        return self.timestamps[0] if self.timestamps else math.inf
+
+    def newest_epoch(self) -> float:
+        """가장 최근 샘플 시각 (비어 있으면 -inf)"""
+        if self.timestamps:
+            return self.timestamps[-1]
+        return self.chunks[-1].last if self.chunks else -math.inf
+
+    @staticmethod
+    def _copy_rows(blocks: List[Tuple[Any, int, int]]) -> List[Tuple]:
+        """블록 구간의 원시 값을 컬럼 단위로 복사한 뒤 묶음 (닫힌 청크는 이때 압축 해제)"""
+        if not blocks:
+            return []
+        columns = [[] for _ in range(len(VALUE_FIELDS) + 2)]
+        for block, begin, end in blocks:
+            timestamps, values, extras = block.decode() if isinstance(block, Chunk) else block
+            for target, column in zip(columns, (timestamps, *values)):
+                target.extend(column[begin:end])
+            if extras:
+                columns[-1].extend([extras.get(index) for index in range(begin, end)])
+            else:
+                columns[-1].extend([None] * (end - begin))
+        return list(zip(*columns))
+
+    def window_rows(self, window_seconds: int) -> List[Tuple]:
+        """
+        최근 window_seconds 이내 샘플의 원시 값을 타임스탬프 순으로 반환 (잘못된 타임스탬프 제외)
+        버퍼 lock 안에서는 이 복사만 하고, dict 변환(materialize)은 lock 밖에서 수행
+        """
+        if window_seconds <= 0:
+            return []
+        return self._copy_rows(self._blocks(time.time() - window_seconds))
+
+    def query_rows(self, window_seconds: int, max_points: int,
+                   history=None) -> Tuple[Callable[[Tuple], Dict[str, Any]], List[Tuple]]:
+        """
+        윈도우 조회에 사용할 단계를 골라 (dict 변환 함수, 원시 값 목록) 반환
+        - 원본이 윈도우 전체를 담고 있고 샘플 수가 max_points 이하이면 원본
+        - 버퍼가 윈도우 앞부분을 담지 못해도 디스크 이력(history: SeriesHistory)과 합쳐 예산 이하이면 원본
+        - 아니면 윈도우를 보존하는 단계 중 포인트 수가 max_points 이하인 가장 세밀한 단계
+        - 예산을 맞추는 단계가 없으면 원본(윈도우 전체를 담은 경우) 또는 윈도우를 보존하는 가장 거친 단계
+        """
+        if window_seconds <= 0:
+            return self.materialize_row, []
+        cutoff = time.time() - window_seconds
+        blocks = self._blocks(cutoff)
+        count = sum(end - begin for _, begin, end in blocks)
+        raw_covers = not self.truncated or self.oldest_epoch() <= cutoff
+        if raw_covers and count <= max_points:
+            return self.materialize_row, self._copy_rows(blocks)
+        if not raw_covers and history is not None:
+            oldest = self.oldest_epoch()
+            older = history.count(cutoff, oldest)
+            if older and count + older <= max_points:
+                return self.materialize_row, history.rows(cutoff, oldest) + self._copy_rows(blocks)
+        if not self.tiers:
+            return self.materialize_row, self._copy_rows(blocks)
+
+        covering = [tier for tier in self.tiers if tier.covers(window_seconds)]
+        for tier in covering:
+            if window_seconds <= tier.resolution * max_points:
+                return self._tier_query(tier, cutoff)
+        if raw_covers:
+            return self.materialize_row, self._copy_rows(blocks)
+        return self._tier_query(covering[-1] if covering else self.tiers[-1], cutoff)
+
+    def _tier_query(self, tier, cutoff: float) -> Tuple[Callable[[Tuple], Dict[str, Any]], List[Tuple]]:
+        labels = self.labels or {}
+        return (lambda row: tier.materialize_row(labels, row)), tier.window_rows(cutoff)
+
+    def export_range(self, lo: float, hi: float) -> Optional[Tuple[List[array], Dict[int, Dict[str, Any]]]]:
+        """
+        [lo, hi) 구간 원본 컬럼 복사본과 (복사본 내 위치 -> 추가 필드) 반환 (세그먼트 봉인용, 샘플이 없으면 None)
+        """
+        blocks = self._blocks(lo, hi)
+        if not blocks:
+            return None
+        columns = [array('d')] + [array('q') for _ in VALUE_FIELDS]
+        exported = {}
+        for block, begin, end in blocks:
+            timestamps, values, extras = block.decode() if isinstance(block, Chunk) else block
+            position = len(columns[0])
+            for target, column in zip(columns, (timestamps, *values)):
+                target.extend(column[begin:end])
+            for index, extra in extras.items():
+                if begin <= index < end:
+                    exported[position + index - begin] = extra
+        return columns, exported
+
+    def load(self, labels: Dict[str, Any], columns: Sequence[array], extras: Dict[int, Dict[str, Any]]):
+        """
+        비어 있는 버퍼를 타임스탬프 순 컬럼으로 한 번에 채움 (재시작 시 세그먼트에서 복원, 용량 이하)
+        chunk_size 단위로 잘라 압축하고 나머지는 head 청크로 둠
+        다운샘플링 단계는 따로 복원하므로 갱신하지 않음
+        """
+        self.labels = labels
+        size = len(columns[0])
+        chunk_size = self.chunk_size
+        sealed = size - size % chunk_size
+        grouped: Dict[int, Dict[int, Dict[str, Any]]] = {}  # 청크 시작 위치 -> 청크 내 위치 -> 추가 필드
+        for index, extra in extras.items():
+            begin = index - index % chunk_size
+            grouped.setdefault(begin, {})[index - begin] = extra
+        for begin in range(0, sealed, chunk_size):
+            end = begin + chunk_size
+            self.chunks.append(Chunk.encode(columns[0][begin:end], [column[begin:end] for column in columns[1:]],
+                                            grouped.get(begin, {})))
+        self.timestamps = columns[0][sealed:]
+        self.columns = tuple(column[sealed:] for column in columns[1:])
+        self.extras = grouped.get(sealed, {})
+        self.size = size
+        self.truncated = size >= self.capacity
+
+    def materialize(self, rows: List[Tuple]) -> List[Dict[str, Any]]:
+        """window_rows() 결과를 응답용 dict 목록으로 변환"""
+        return [self.materialize_row(row) for row in rows]
+
+    def window(self, window_seconds: int) -> List[Dict[str, Any]]:
+        """최근 window_seconds 이내 샘플을 타임스탬프 순으로 반환"""
+        return self.materialize(self.window_rows(window_seconds))
@@ -1,32 +1,145 @@
-from collections import deque, defaultdict
+from array import array
+from collections import OrderedDict, defaultdict, namedtuple
+from itertools import islice
+from operator import itemgetter
 from datetime import datetime, timedelta
+import os
+import math
+import time
+import atexit
 import threading
 from config import Config
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from . import kernels
 from .compute import metrics_computer
+from .series import SeriesBuffer, client_epoch, from_epoch, to_epoch, VALUE_FIELDS
+from .downsample import TierBuffer, parse_tiers
+from .rollup import RollupEngine
+from .persistence import SegmentStore, WriteAheadLog
+from .wire import CompactBatch, CompactRecord
+
+def owner_deployment(metrics: Dict[str, Any]) -> Optional[str]:
+    """파드 메트릭의 소속 디플로이먼트 이름 (collector가 ownerReferences로 해석한 소유자, 또는 명시 필드)"""
+    if metrics.get('owner_kind') == 'Deployment':
+        return metrics.get('owner_name')
+    return metrics.get('deployment_name')
+
+# 파드 최신 데이터 + 보조 인덱스 스냅샷 (게시 후에는 수정하지 않으며 쓰기 시 통째로 교체)
+PodView = namedtuple('PodView', ['latest', 'by_node', 'by_namespace', 'by_owner', 'by_pod_name'])
+
+class IndexWriter:
+    """보조 인덱스(key -> {member}) copy-on-write 갱신, 바뀐 key의 멤버 dict만 복사"""
+    
+    def __init__(self, index: Dict[Any, Dict[str, None]]):
+        self.base = index
+        self.index = None
+        self.copied = set()
+    
+    def _members(self, key) -> Dict[str, None]:
+        if self.index is None:
+            self.index = dict(self.base)
+        members = self.index.get(key)
+        if key not in self.copied or members is None:
+            members = self.index[key] = dict(members or {})
+            self.copied.add(key)
+        return members
+    
+    def add(self, key, member: str):
+        self._members(key)[member] = None
+    
+    def remove(self, key, member: str):
+        if key not in (self.index if self.index is not None else self.base):
+            return
+        members = self._members(key)
+        members.pop(member, None)
+        if not members:
+            del self.index[key]
+    
+    def result(self) -> Dict[Any, Dict[str, None]]:
+        return self.index if self.index is not None else self.base
 
 class StorageService:
-    """메모리 기반 데이터 저장 서비스"""
+    """
+    메모리 기반 데이터 저장 서비스
+    - 시계열 버퍼는 key 해시로 나눈 lock(stripe)으로 보호 (서로 다른 시리즈의 쓰기/조회는 서로 막지 않음)
+    - 최신 데이터/보조 인덱스/롤업 합계는 쓰기 lock 안에서 복사본을 갱신해 통째로 교체 (copy-on-write)
+    - 최신 데이터 조회는 게시된 스냅샷을 lock 없이 읽으므로 쓰기를 기다리지도, 막지도 않음
+    - 시리즈마다 다운샘플링 단계(DOWNSAMPLE_TIERS)를 함께 유지하고, 조회 윈도우는 METRICS_RETENTION_DAYS로 제한
+    - STORAGE_DIR 설정 시 모든 시계열 추가를 WAL에 기록하고 SEGMENT_DURATION 구간마다 불변 세그먼트로 봉인
+    - SERIES_TTL 동안 기록이 없는 시리즈와 MAX_SERIES를 넘는 시리즈(가장 오래 기록되지 않은 것부터)는
+      버퍼/최신 데이터/인덱스/롤업 합계에서 함께 제거
+    """
     
     def __init__(self):
         self.max_data_points = Config.MAX_DATA_POINTS
-        self.lock = threading.Lock()
+        self.retention_seconds = Config.METRICS_RETENTION_DAYS * 86400
+        self.tier_specs = parse_tiers(Config.DOWNSAMPLE_TIERS, self.retention_seconds)
+        self.write_lock = threading.Lock()  # 스냅샷 갱신끼리만 직렬화 (조회는 사용하지 않음)
+        self.series_locks = tuple(threading.Lock() for _ in range(Config.STORAGE_LOCK_STRIPES))
         
-        # 각 리소스별 시계열 데이터 저장소
-        self.nodes_data = defaultdict(lambda: deque(maxlen=self.max_data_points))
-        self.pods_data = defaultdict(lambda: deque(maxlen=self.max_data_points))
-        self.namespaces_data = defaultdict(lambda: deque(maxlen=self.max_data_points))
-        self.deployments_data = defaultdict(lambda: deque(maxlen=self.max_data_points))
+        # 각 리소스별 시계열 데이터 저장소 (압축 청크 버퍼 + 다운샘플링 단계, 조회 시 dict로 변환)
+        self.nodes_data = defaultdict(self._new_series)
+        self.pods_data = defaultdict(self._new_series)
+        self.namespaces_data = defaultdict(self._new_series)
+        self.deployments_data = defaultdict(self._new_series)
+        self.series_by_kind = {
+            'node': self.nodes_data,
+            'pod': self.pods_data,
+            'namespace': self.namespaces_data,
+            'deployment': self.deployments_data
+        }
         
-        # 최신 데이터 캐시 (빠른 조회용)
+        # 최신 데이터 캐시 (빠른 조회용, copy-on-write 스냅샷)
         self.latest_nodes = {}
-        self.latest_pods = {}
         self.latest_namespaces = {}
         self.latest_deployments = {}
         
+        # 파드 최신 데이터 + 보조 인덱스 (인덱스 값은 삽입 순서를 유지하는 집합 dict)
+        #   by_node: node_name -> {pod_key}, by_namespace: namespace -> {pod_key}
+        #   by_owner: (namespace, deployment_name) -> {pod_key}, by_pod_name: pod_name -> {namespace}
+        self.pod_view = PodView({}, {}, {}, {}, {})
+        # 파드 최신 수치 컬럼 표 (pod_view와 함께 write_lock 안에서 갱신, 일괄 집계 커널 입력)
+        self.pod_columns = kernels.PodColumns()
+        
+        # 네임스페이스/디플로이먼트 합계 (파드 저장 시 증분 갱신, 주기마다 집계 시계열 기록)
+        self.rollups = RollupEngine(Config.ROLLUP_INTERVAL)
+        
+        # 디스크 영속화 (enable_persistence() 호출 시 활성화)
+        self.wal: Optional[WriteAheadLog] = None
+        self.segment_store: Optional[SegmentStore] = None
+        self.sealed_until: Optional[float] = None  # 이 시각 이전 샘플은 세그먼트로 봉인됨
+        self.shutdown_event = threading.Event()
+        self._persistence_thread: Optional[threading.Thread] = None
+        
+        # 시리즈 정리: (kind, key) -> 마지막 기록 시각 (epoch 초, 오래 기록되지 않은 것부터의 LRU 순서)
+        # 시리즈 stripe lock 안에서 갱신하며, activity_lock을 잡은 채로 다른 lock을 기다리지 않음
+        self.series_ttl = Config.SERIES_TTL
+        self.max_series = Config.MAX_SERIES
+        self.activity_lock = threading.Lock()
+        self.series_activity: 'OrderedDict[Tuple[str, str], float]' = OrderedDict()
+        self.evictions = {reason: dict.fromkeys(self.series_by_kind, 0) for reason in ('ttl', 'limit')}
+        # 봉인되지 않은 샘플이 남은 채 상한 초과로 제거된 시리즈: (kind, key) -> sealed_until 이후 구간만 담은 버퍼
+        # 다음 봉인에서 세그먼트에 기록한 뒤 삭제하며, 그 전에 다시 기록되면 이어서 사용 (시리즈 stripe lock으로 보호)
+        self.retired_series: Dict[Tuple[str, str], SeriesBuffer] = {}
+        self._eviction_thread: Optional[threading.Thread] = None
+        
         # 초기 샘플 데이터 생성 (실제 데이터 사용을 위해 비활성화)
         # self._create_sample_data()
     
+    @property
+    def latest_pods(self) -> Dict[str, Dict[str, Any]]:
+        """파드 최신 데이터 스냅샷 (pod_key -> 메트릭)"""
+        return self.pod_view.latest
+    
+    def _new_series(self) -> SeriesBuffer:
+        return SeriesBuffer(self.max_data_points,
+                            [TierBuffer(resolution, retention) for resolution, retention in self.tier_specs],
+                            Config.SERIES_CHUNK_SIZE)
+    
+    def _series_lock(self, key: str) -> threading.Lock:
+        """시리즈 key가 속한 stripe lock"""
+        return self.series_locks[hash(key) % len(self.series_locks)]
+    
     def _create_sample_data(self):
         """샘플 데이터 생성"""
         import random
@@ -72,6 +185,8 @@ class StorageService:
                     'namespace': pod['namespace'],
                     'pod_name': pod['pod_name'],
                     'node_name': pod['node_name'],
+                    'owner_kind': 'Deployment',
+                    'owner_name': pod['pod_name'].rsplit('-', 1)[0],
                     'timestamp': time_point.isoformat() + 'Z',
                     'cpu_millicores': random.randint(200, 600),
                     'memory_bytes': random.randint(500000000, 1500000000),
@@ -87,7 +202,7 @@ class StorageService:
                 self.pods_data[pod_key].append(data.copy())
             
             # 최신 데이터는 가장 최근 시점으로 설정
-            self.latest_pods[pod_key] = list(self.pods_data[pod_key])[-1].copy()
+            self._apply_pod_updates_locked([(pod_key, list(self.pods_data[pod_key])[-1])])
         
         # 샘플 네임스페이스 시계열 데이터 (파드들의 집계)
         sample_namespaces = ['default', 'monitoring']
@@ -153,231 +268,804 @@ class StorageService:
     
     def get_all_nodes(self) -> List[Dict[str, Any]]:
         """모든 노드의 최신 데이터 조회"""
-        with self.lock:
-            return list(self.latest_nodes.values())
+        return list(self.latest_nodes.values())
     
     def get_node_by_name(self, node_name: str) -> Optional[Dict[str, Any]]:
         """특정 노드의 최신 데이터 조회"""
-        with self.lock:
-            return self.latest_nodes.get(node_name)
+        return self.latest_nodes.get(node_name)
     
     def get_all_pods(self) -> List[Dict[str, Any]]:
         """모든 파드의 최신 데이터 조회"""
-        with self.lock:
-            return list(self.latest_pods.values())
+        return list(self.pod_view.latest.values())
+    
+    def latest_pod_columns(self) -> Tuple[List[str], Dict[str, List[Any]], Any]:
+        """
+        파드 최신 수치 컬럼 표 스냅샷 (파드 dict 순회 없이 일괄 집계 커널 입력으로 사용)
+        (pod_key 목록, 기준별 그룹 번호(namespace, deployment, node의 kernels.GroupCodes), (파드 수, 필드 수) 컬럼 배열) 반환
+        deployment 라벨은 (namespace, deployment_name)이며 소속 디플로이먼트가 없으면 그룹 없음
+        """
+        with self.write_lock:
+            keys, labels, values = self.pod_columns.snapshot()
+        return keys, labels, kernels.values_matrix(values)
+    
+    def get_pod_summary(self) -> Dict[str, Any]:
+        """전체 파드의 합계/평균/최솟값/최댓값과 네임스페이스/디플로이먼트/노드별 합계 (컬럼 표에서 한 번에 계산)"""
+        _, labels, values = self.latest_pod_columns()
+        summary = metrics_computer.aggregate_columns(values, labels)
+        # 디플로이먼트 그룹 키 (namespace, deployment_name) -> 'namespace/deployment_name' (JSON 키)
+        groups = summary['groups']
+        groups['deployment'] = {f"{namespace}/{name}": totals for (namespace, name), totals in groups['deployment'].items()}
+        return summary
     
     def get_pod_by_name(self, namespace: str, pod_name: str) -> Optional[Dict[str, Any]]:
         """특정 파드의 최신 데이터 조회"""
-        with self.lock:
-            pod_key = f"{namespace}/{pod_name}"
-            return self.latest_pods.get(pod_key)
+        pod_key = f"{namespace}/{pod_name}"
+        return self.pod_view.latest.get(pod_key)
     
     def get_pods_by_node(self, node_name: str) -> List[Dict[str, Any]]:
         """특정 노드의 파드들 조회"""
-        with self.lock:
-            return [pod for pod in self.latest_pods.values() 
-                    if pod.get('node_name') == node_name]
+        view = self.pod_view
+        return [view.latest[pod_key] for pod_key in view.by_node.get(node_name, ())]
     
     def get_pods_by_namespace(self, namespace: str) -> List[Dict[str, Any]]:
         """특정 네임스페이스의 파드들 조회"""
-        with self.lock:
-            return [pod for pod in self.latest_pods.values() 
-                    if pod.get('namespace') == namespace]
+        view = self.pod_view
+        return [view.latest[pod_key] for pod_key in view.by_namespace.get(namespace, ())]
+    
+    def get_pods_by_name(self, pod_name: str) -> List[Dict[str, Any]]:
+        """모든 네임스페이스에서 같은 이름의 파드들 조회"""
+        view = self.pod_view
+        return [view.latest[f"{namespace}/{pod_name}"] for namespace in view.by_pod_name.get(pod_name, ())]
+    
+    def get_pods_by_deployment(self, namespace: str, deployment_name: str) -> List[Dict[str, Any]]:
+        """특정 디플로이먼트의 파드들 조회"""
+        view = self.pod_view
+        return [view.latest[pod_key] for pod_key in view.by_owner.get((namespace, deployment_name), ())]
     
     def get_all_namespaces(self) -> List[Dict[str, Any]]:
-        """모든 네임스페이스의 최신 데이터 조회 (소속 파드들의 합계 계산)"""
-        with self.lock:
-            namespaces = {}
-            
-            # 모든 파드를 순회하면서 네임스페이스별로 그룹화
-            for pod in self.latest_pods.values():
-                ns = pod.get('namespace')
-                if ns not in namespaces:
-                    namespaces[ns] = []
-                namespaces[ns].append(pod)
-            
-            # 각 네임스페이스별로 집계 계산
-            result = []
-            for ns, pods in namespaces.items():
-                aggregated = metrics_computer.aggregate_pod_metrics(pods)
-                aggregated.update({
-                    'namespace': ns,
-                    'timestamp': datetime.now().isoformat() + 'Z'
-                })
-                result.append(aggregated)
-            
-            return result
+        """모든 네임스페이스의 최신 데이터 조회 (증분 유지되는 소속 파드 합계)"""
+        timestamp = datetime.now().isoformat() + 'Z'
+        return [dict(aggregated, namespace=ns, timestamp=timestamp)
+                for ns, aggregated in self.rollups.namespace_totals.items()]
     
     def get_namespace_by_name(self, namespace: str) -> Optional[Dict[str, Any]]:
-        """특정 네임스페이스의 최신 데이터 조회 (소속 파드들의 합계 계산)"""
-        with self.lock:
-            # 해당 네임스페이스의 파드들을 찾기
-            namespace_pods = [pod for pod in self.latest_pods.values() 
-                            if pod.get('namespace') == namespace]
-            
-            if not namespace_pods:
-                return None
-            
-            # 집계 계산
-            aggregated = metrics_computer.aggregate_pod_metrics(namespace_pods)
-            aggregated.update({
-                'namespace': namespace,
-                'timestamp': datetime.now().isoformat() + 'Z'
-            })
-            
-            return aggregated
+        """특정 네임스페이스의 최신 데이터 조회 (증분 유지되는 소속 파드 합계)"""
+        aggregated = self.rollups.namespace_totals.get(namespace)
+        if aggregated is None:
+            return None
+        return dict(aggregated, namespace=namespace, timestamp=datetime.now().isoformat() + 'Z')
     
     def get_all_deployments(self) -> List[Dict[str, Any]]:
-        """모든 배포의 최신 데이터 조회 (소속 파드들의 합계 계산)"""
-        with self.lock:
-            deployments = {}
-            
-            # 모든 파드를 순회하면서 디플로이먼트별로 그룹화
-            for pod in self.latest_pods.values():
-                pod_name = pod.get('pod_name', '')
-                namespace = pod.get('namespace', '')
-                
-                # 파드 이름에서 디플로이먼트 이름 추출
-                deployment_name = None
-                if 'web-server' in pod_name:
-                    deployment_name = 'web-server'
-                elif 'app-backend' in pod_name:
-                    deployment_name = 'app-backend'
-                elif 'prometheus' in pod_name:
-                    deployment_name = 'prometheus'
-                
-                if deployment_name:
-                    deployment_key = f"{namespace}/{deployment_name}"
-                    if deployment_key not in deployments:
-                        deployments[deployment_key] = {
-                            'namespace': namespace,
-                            'deployment_name': deployment_name,
-                            'pods': []
-                        }
-                    deployments[deployment_key]['pods'].append(pod)
-            
-            # 각 디플로이먼트별로 집계 계산
-            result = []
-            for deployment_key, deployment_info in deployments.items():
-                aggregated = metrics_computer.aggregate_pod_metrics(deployment_info['pods'])
-                aggregated.update({
-                    'namespace': deployment_info['namespace'],
-                    'deployment_name': deployment_info['deployment_name'],
-                    'timestamp': datetime.now().isoformat() + 'Z'
-                })
-                result.append(aggregated)
-            
-            return result
+        """모든 배포의 최신 데이터 조회 (증분 유지되는 소속 파드 합계)"""
+        timestamp = datetime.now().isoformat() + 'Z'
+        return [dict(aggregated, namespace=namespace, deployment_name=deployment_name, timestamp=timestamp)
+                for (namespace, deployment_name), aggregated in self.rollups.deployment_totals.items()]
     
     def get_deployment_by_name(self, namespace: str, deployment_name: str) -> Optional[Dict[str, Any]]:
-        """특정 배포의 최신 데이터 조회 (소속 파드들의 합계 계산)"""
-        with self.lock:
-            # 해당 디플로이먼트의 파드들을 찾기
-            deployment_pods = [pod for pod in self.latest_pods.values() 
-                             if (pod.get('namespace') == namespace and 
-                                 deployment_name in pod.get('pod_name', ''))]
-            
-            if not deployment_pods:
-                return None
-            
-            # 집계 계산
-            aggregated = metrics_computer.aggregate_pod_metrics(deployment_pods)
-            aggregated.update({
-                'namespace': namespace,
-                'deployment_name': deployment_name,
-                'timestamp': datetime.now().isoformat() + 'Z'
-            })
-            
-            return aggregated
+        """특정 배포의 최신 데이터 조회 (증분 유지되는 소속 파드 합계)"""
+        aggregated = self.rollups.deployment_totals.get((namespace, deployment_name))
+        if aggregated is None:
+            return None
+        return dict(aggregated, namespace=namespace, deployment_name=deployment_name,
+                    timestamp=datetime.now().isoformat() + 'Z')
     
-    def get_node_timeseries(self, node_name: str, window_seconds: int) -> List[Dict[str, Any]]:
-        """노드 시계열 데이터 조회"""
-        with self.lock:
-            if node_name not in self.nodes_data:
+    def _history(self, kind: str, key: str):
+        """버퍼보다 오래된 원본 샘플의 세그먼트 이력 (영속화 미사용 시 None)"""
+        store = self.segment_store
+        return store.history(kind, key) if store is not None else None
+    
+    def _read_timeseries(self, kind: str, key: str, window_seconds: int, max_points: int) -> List[Dict[str, Any]]:
+        """
+        윈도우/포인트 예산에 맞는 단계(원본 또는 다운샘플링)로 시계열 조회
+        시리즈 stripe lock 안에서는 원시 값만 복사하고 dict 변환은 lock 밖에서 수행
+        """
+        window_seconds = min(window_seconds, self.retention_seconds)
+        history = self._history(kind, key)
+        with self._series_lock(key):
+            buffer = self.series_by_kind[kind].get(key)
+            if buffer is None:
                 return []
-            
-            # compute.py 활용하여 필터링
-            return metrics_computer.filter_timeseries_by_window(
-                list(self.nodes_data[node_name]), window_seconds
-            )
+            materialize, rows = buffer.query_rows(window_seconds, max_points, history)
+        return [materialize(row) for row in rows]
+    
+    def _read_merged_timeseries(self, kind: str, keys: List[str], window_seconds: int,
+                                max_points: int) -> List[Dict[str, Any]]:
+        """
+        여러 시리즈를 시각순으로 합쳐 100개로 샘플링 (compress_timeseries와 같은 방식)
+        시리즈마다 stripe lock은 원시 값 복사 동안만 잡고, 응답에 포함될 샘플만 dict로 변환
+        """
+        window_seconds = min(window_seconds, self.retention_seconds)
+        series = self.series_by_kind[kind]
+        rows = []
+        for key in keys:
+            history = self._history(kind, key)
+            with self._series_lock(key):
+                buffer = series.get(key)
+                if buffer is None:
+                    continue
+                materialize, buffer_rows = buffer.query_rows(window_seconds, max_points, history)
+                rows.extend((row[0], materialize, row) for row in buffer_rows)
+        rows.sort(key=itemgetter(0))
+        return [materialize(row) for _, materialize, row in metrics_computer.compress_timeseries(rows)]
+    
+    def get_all_node_timeseries(self, window_seconds: int,
+                                max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
+        """모든 노드 시계열을 합쳐 샘플링"""
+        return self._read_merged_timeseries('node', list(self.latest_nodes), window_seconds, max_points)
+    
+    def get_all_pod_timeseries(self, window_seconds: int,
+                               max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
+        """모든 파드 시계열을 합쳐 샘플링"""
+        return self._read_merged_timeseries('pod', list(self.pod_view.latest), window_seconds, max_points)
     
-    def get_pod_timeseries(self, namespace: str, pod_name: str, window_seconds: int) -> List[Dict[str, Any]]:
+    def get_all_namespace_timeseries(self, window_seconds: int,
+                                     max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
+        """모든 네임스페이스 시계열을 합쳐 샘플링"""
+        return self._read_merged_timeseries('namespace', list(self.latest_namespaces), window_seconds,
+                                            max_points)
+    
+    def get_all_deployment_timeseries(self, window_seconds: int,
+                                      max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
+        """모든 디플로이먼트 시계열을 합쳐 샘플링"""
+        return self._read_merged_timeseries('deployment', list(self.latest_deployments), window_seconds,
+                                            max_points)
+    
+    def get_node_timeseries(self, node_name: str, window_seconds: int,
+                            max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
+        """노드 시계열 데이터 조회"""
+        return self._read_timeseries('node', node_name, window_seconds, max_points)
+    
+    def get_pod_timeseries(self, namespace: str, pod_name: str, window_seconds: int,
+                           max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
         """파드 시계열 데이터 조회"""
-        with self.lock:
-            pod_key = f"{namespace}/{pod_name}"
-            if pod_key not in self.pods_data:
-                return []
-            
-            # compute.py 활용하여 필터링
-            return metrics_computer.filter_timeseries_by_window(
-                list(self.pods_data[pod_key]), window_seconds
-            )
+        return self._read_timeseries('pod', f"{namespace}/{pod_name}", window_seconds, max_points)
     
-    def get_namespace_timeseries(self, namespace: str, window_seconds: int) -> List[Dict[str, Any]]:
+    def get_namespace_timeseries(self, namespace: str, window_seconds: int,
+                                 max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
         """네임스페이스 시계열 데이터 조회"""
-        with self.lock:
-            if namespace not in self.namespaces_data:
-                return []
-            
-            # compute.py 활용하여 필터링
-            return metrics_computer.filter_timeseries_by_window(
-                list(self.namespaces_data[namespace]), window_seconds
-            )
+        return self._read_timeseries('namespace', namespace, window_seconds, max_points)
     
-    def get_deployment_timeseries(self, namespace: str, deployment_name: str, window_seconds: int) -> List[Dict[str, Any]]:
+    def get_deployment_timeseries(self, namespace: str, deployment_name: str, window_seconds: int,
+                                  max_points: int = Config.TIMESERIES_MAX_POINTS) -> List[Dict[str, Any]]:
         """디플로이먼트 시계열 데이터 조회"""
-        with self.lock:
-            deployment_key = f"{namespace}/{deployment_name}"
-            if deployment_key not in self.deployments_data:
-                return []
-            
-            # compute.py 활용하여 필터링
-            return metrics_computer.filter_timeseries_by_window(
-                list(self.deployments_data[deployment_key]), window_seconds
-            )
+        return self._read_timeseries('deployment', f"{namespace}/{deployment_name}", window_seconds,
+                                     max_points)
     
     # ==================== POST 메트릭 저장 메서드들 ====================
     
-    def store_node_metrics(self, node_name: str, metrics: Dict[str, Any]) -> bool:
+    def _append_series(self, kind: str, key: str, metrics: Dict[str, Any]):
+        """시계열 버퍼에 샘플 추가 (해당 stripe lock만 사용, 영속화 사용 시 버퍼에 들어간 샘플만 WAL에 기록)"""
+        with self._series_lock(key):
+            epoch = self._series_buffer_locked(kind, key).append(metrics)
+            if self.wal is not None:
+                self.wal.append(kind, key, metrics, epoch)
+            self._touch_series(kind, key, time.time())
+    
+    def _append_record(self, kind: str, key: str, record: CompactRecord, keep_timestamp: bool) -> Dict[str, Any]:
+        """
+        compact 레코드를 시계열 버퍼에 추가 (정수 값을 컬럼에 바로 기록), 최신 데이터용 메트릭 dict 반환
+        dict는 최신 데이터 스냅샷/WAL을 위해 레코드당 한 번만 구성하고 다시 해석하지 않음
+        """
+        epoch = self._sample_epoch(record.epoch, keep_timestamp)
+        cpu, memory, read_bytes, write_bytes, bytes_sent, bytes_recv = record.values
+        metrics = dict(record.labels)
+        metrics['timestamp'] = from_epoch(epoch)
+        metrics['cpu_millicores'] = cpu
+        metrics['memory_bytes'] = memory
+        metrics['disk_io'] = {'read_bytes': read_bytes, 'write_bytes': write_bytes}
+        metrics['network_io'] = {'bytes_sent': bytes_sent, 'bytes_recv': bytes_recv}
+        extra = None
+        if record.summary is not None:
+            metrics['summary'] = record.summary
+            extra = {'summary': record.summary}
+        
+        with self._series_lock(key):
+            self._series_buffer_locked(kind, key).append_values(epoch, record.values, record.labels, extra)
+            if self.wal is not None:
+                self.wal.append(kind, key, metrics, epoch)
+            self._touch_series(kind, key, time.time())
+        return metrics
+    
+    def _series_buffer_locked(self, kind: str, key: str) -> SeriesBuffer:
+        """시리즈 버퍼 조회, 없으면 생성 (호출자가 해당 stripe lock을 보유해야 함)"""
+        series = self.series_by_kind[kind]
+        buffer = series.get(key)
+        if buffer is None:
+            # 미봉인 구간을 보관 중인 제거된 시리즈가 다시 기록되면 그 버퍼를 이어서 사용
+            buffer = self.retired_series.pop((kind, key), None)
+            if buffer is None:
+                buffer = self._new_series()
+            series[key] = buffer
+        return buffer
+    
+    def _touch_series(self, kind: str, key: str, seen: float):
+        """시리즈 마지막 기록 시각 갱신 (LRU 순서의 맨 뒤로 이동)"""
+        entry = (kind, key)
+        with self.activity_lock:
+            activity = self.series_activity
+            if entry in activity:
+                activity.move_to_end(entry)
+            activity[entry] = seen
+    
+    @staticmethod
+    def _sample_epoch(epoch: float, keep_timestamp: bool) -> float:
+        """
+        저장할 샘플 epoch
+        collector가 보낸 수집 시각을 사용하여 한 배치에 담긴 여러 샘플이 각자의 시각을 유지
+        - 없거나 해석할 수 없는 값(NaN)은 서버 시각
+        - 서버 시각보다 미래인 값은 서버 시각으로 제한
+        - 실시간 전송 샘플은 MAX_CLOCK_SKEW보다 오래된 값을 범위 끝으로 제한 (재전송 샘플은 과거 시각 유지)
+        """
+        now = time.time()
+        if math.isnan(epoch) or epoch > now:
+            return now
+        if not keep_timestamp and epoch < now - Config.MAX_CLOCK_SKEW:
+            return now - Config.MAX_CLOCK_SKEW
+        return epoch
+    
+    @classmethod
+    def _sample_timestamp(cls, metrics: Dict[str, Any], keep_timestamp: bool) -> str:
+        """저장할 샘플 타임스탬프 (서버 저장 형식, _sample_epoch 기준)"""
+        return from_epoch(cls._sample_epoch(client_epoch(metrics.get('timestamp')), keep_timestamp))
+    
+    def _prepare_node_metrics(self, node_name: str, metrics: Dict[str, Any], keep_timestamp: bool = False):
+        """노드 메트릭 필드 설정 + 시계열 추가 (값 변환 실패 시 예외, 최신 데이터는 갱신하지 않음)"""
+        # 타임스탬프 설정 (collector 수집 시각, 재전송 데이터는 과거 시각 유지)
+        metrics['node_name'] = node_name
+        metrics['timestamp'] = self._sample_timestamp(metrics, keep_timestamp)
+        
+        self._append_series('node', node_name, metrics)
+    
+    def _prepare_pod_metrics(self, namespace: str, pod_name: str, metrics: Dict[str, Any],
+                             keep_timestamp: bool = False) -> str:
+        """파드 메트릭 필드 설정 + 시계열 추가, pod_key 반환 (값 변환 실패 시 예외)"""
+        # 필수 필드 추가 (collector 수집 시각, 재전송 데이터는 과거 시각 유지)
+        metrics['namespace'] = namespace
+        metrics['pod_name'] = pod_name
+        metrics['timestamp'] = self._sample_timestamp(metrics, keep_timestamp)
+        
+        pod_key = f"{namespace}/{pod_name}"
+        self._append_series('pod', pod_key, metrics)
+        return pod_key
+    
+    def _apply_pod_updates_locked(self, updates: List[Tuple[str, Dict[str, Any]]]):
+        """
+        파드 최신 데이터/보조 인덱스/롤업 합계/컬럼 표를 한 번에 갱신하여 새 스냅샷 게시 (호출자가 write_lock을 보유해야 함)
+        최신 데이터 dict는 배치당 한 번만 복사하고, 인덱스는 소속이 바뀐 항목만 복사
+        """
+        # 새 주기에 들어섰으면 이번 배치 반영 전 합계를 집계 시계열에 기록
+        self._advance_rollups_locked()
+        
+        view = self.pod_view
+        latest = dict(view.latest)
+        by_node, by_namespace = IndexWriter(view.by_node), IndexWriter(view.by_namespace)
+        by_owner, by_pod_name = IndexWriter(view.by_owner), IndexWriter(view.by_pod_name)
+        
+        for pod_key, metrics in updates:
+            previous = latest.get(pod_key)
+            current = latest[pod_key] = metrics.copy()
+            owner = owner_deployment(current)
+            previous_owner = owner_deployment(previous) if previous is not None else None
+            
+            if previous is None or previous.get('node_name') != current.get('node_name') or previous_owner != owner:
+                if previous is not None:
+                    by_node.remove(previous.get('node_name'), pod_key)
+                    if previous_owner:
+                        by_owner.remove((previous['namespace'], previous_owner), pod_key)
+                by_node.add(current.get('node_name'), pod_key)
+                by_namespace.add(current['namespace'], pod_key)
+                by_pod_name.add(current['pod_name'], current['namespace'])
+                if owner:
+                    by_owner.add((current['namespace'], owner), pod_key)
+            self.rollups.update(previous, current, previous_owner, owner)
+            self.pod_columns.set(pod_key, current, (current['namespace'], owner) if owner else None)
+        
+        self.pod_view = PodView(latest, by_node.result(), by_namespace.result(), by_owner.result(), by_pod_name.result())
+        self.rollups.publish()
+    
+    def _advance_rollups_locked(self):
+        """ROLLUP_INTERVAL 경계를 지났으면 네임스페이스/디플로이먼트 합계를 경계 시각의 샘플로 기록"""
+        boundary = self.rollups.advance(time.time())
+        if boundary is None:
+            return
+        
+        timestamp = from_epoch(boundary)
+        latest_namespaces = dict(self.latest_namespaces)
+        for namespace, aggregated in self.rollups.namespace_totals.items():
+            sample = dict(aggregated, namespace=namespace, timestamp=timestamp)
+            self._append_series('namespace', namespace, sample)
+            latest_namespaces[namespace] = sample
+        self.latest_namespaces = latest_namespaces
+        
+        latest_deployments = dict(self.latest_deployments)
+        for (namespace, deployment_name), aggregated in self.rollups.deployment_totals.items():
+            sample = dict(aggregated, namespace=namespace, deployment_name=deployment_name, timestamp=timestamp)
+            deployment_key = f"{namespace}/{deployment_name}"
+            self._append_series('deployment', deployment_key, sample)
+            latest_deployments[deployment_key] = sample
+        self.latest_deployments = latest_deployments
+    
+    def _publish_node_locked(self, node_name: str, metrics: Dict[str, Any]):
+        """노드 최신 데이터 스냅샷 교체 (호출자가 write_lock을 보유해야 함)"""
+        latest_nodes = dict(self.latest_nodes)
+        latest_nodes[node_name] = metrics.copy()
+        self.latest_nodes = latest_nodes
+    
+    def store_node_metrics(self, node_name: str, metrics: Dict[str, Any], keep_timestamp: bool = False) -> bool:
         """노드 메트릭 저장 (POST용)"""
         try:
-            with self.lock:
-                # 타임스탬프 추가
-                metrics['node_name'] = node_name
-                metrics['timestamp'] = datetime.now().isoformat() + 'Z'
-                
-                # 최신 데이터 업데이트
-                self.latest_nodes[node_name] = metrics.copy()
-                
-                # 시계열 데이터에 추가
-                self.nodes_data[node_name].append(metrics.copy())
-                
-                return True
+            self._prepare_node_metrics(node_name, metrics, keep_timestamp)
+            with self.write_lock:
+                self._publish_node_locked(node_name, metrics)
+            self._enforce_series_limit()
+            return True
         except Exception as e:
             print(f"Error storing node metrics: {e}")
             return False
     
-    def store_pod_metrics(self, namespace: str, pod_name: str, metrics: Dict[str, Any]) -> bool:
+    def store_pod_metrics(self, namespace: str, pod_name: str, metrics: Dict[str, Any],
+                          keep_timestamp: bool = False) -> bool:
         """파드 메트릭 저장 (POST용)"""
         try:
-            with self.lock:
-                # 필수 필드 추가
-                metrics['namespace'] = namespace
-                metrics['pod_name'] = pod_name
-                metrics['timestamp'] = datetime.now().isoformat() + 'Z'
-                
-                pod_key = f"{namespace}/{pod_name}"
-                
-                # 최신 데이터 업데이트
-                self.latest_pods[pod_key] = metrics.copy()
-                
-                # 시계열 데이터에 추가
-                self.pods_data[pod_key].append(metrics.copy())
-                
-                return True
+            pod_key = self._prepare_pod_metrics(namespace, pod_name, metrics, keep_timestamp)
+            with self.write_lock:
+                self._apply_pod_updates_locked([(pod_key, metrics)])
+            self._enforce_series_limit()
+            return True
         except Exception as e:
             print(f"Error storing pod metrics: {e}")
             return False
+    
+    def mark_node_stale(self, node_name: str):
+        """
+        pull 모드에서 수집이 끊긴 노드와 그 노드의 파드 최신 데이터에 stale 표시
+        새 메트릭이 저장되면 최신 데이터가 교체되어 표시가 사라짐
+        """
+        with self.write_lock:
+            if node_name in self.latest_nodes:
+                self._publish_node_locked(node_name, dict(self.latest_nodes[node_name], stale=True))
+            
+            view = self.pod_view
+            pod_keys = view.by_node.get(node_name)
+            if pod_keys:
+                latest = dict(view.latest)
+                for pod_key in pod_keys:
+                    latest[pod_key] = dict(latest[pod_key], stale=True)
+                self.pod_view = view._replace(latest=latest)
+    
+    def store_batch_metrics(self, node_name: str, node_metrics: Optional[Dict[str, Any]],
+                            pod_metrics_list: List[Dict[str, Any]], keep_timestamp: bool = False) -> Dict[str, Any]:
+        """
+        노드 + 파드 메트릭 일괄 저장 (배치 POST용)
+        시계열 추가는 시리즈별 stripe lock, 최신 데이터 스냅샷 교체는 배치당 한 번이며 항목별 저장 결과를 반환
+        keep_timestamp: 스풀 재전송 데이터의 과거 수집 시각 유지 (실시간 데이터는 MAX_CLOCK_SKEW 범위로 제한)
+        """
+        results = {'node': None, 'pods': []}
+        
+        node_stored = False
+        if node_metrics is not None:
+            try:
+                self._prepare_node_metrics(node_name, node_metrics, keep_timestamp)
+                node_stored = True
+                results['node'] = {'status': 'stored'}
+            except Exception as e:
+                print(f"Error storing node metrics: {e}")
+                results['node'] = {'status': 'failed', 'error': str(e)}
+        
+        updates = []
+        for pod_metrics in pod_metrics_list:
+            namespace = pod_metrics.get('namespace')
+            pod_name = pod_metrics.get('pod_name')
+            try:
+                updates.append((self._prepare_pod_metrics(namespace, pod_name, pod_metrics, keep_timestamp),
+                                pod_metrics))
+                results['pods'].append({
+                    'namespace': namespace,
+                    'pod_name': pod_name,
+                    'status': 'stored'
+                })
+            except Exception as e:
+                print(f"Error storing pod metrics: {e}")
+                results['pods'].append({
+                    'namespace': namespace,
+                    'pod_name': pod_name,
+                    'status': 'failed',
+                    'error': str(e)
+                })
+        
+        self._publish_batch(node_name, node_metrics if node_stored else None, updates)
+        return results
+    
+    def store_compact_batch(self, node_name: str, batch: CompactBatch) -> Dict[str, Any]:
+        """
+        compact 형식으로 디코딩된 배치 저장 (store_batch_metrics와 같은 결과 형식)
+        레코드 값은 메트릭 dict를 거치지 않고 시계열 컬럼에 바로 추가하며, 스풀 재전송 프레임은 과거 시각 유지
+        """
+        results = {'node': None, 'pods': []}
+        
+        node_metrics = None
+        if batch.node is not None:
+            try:
+                node_metrics = self._append_record('node', node_name, batch.node, batch.replayed)
+                results['node'] = {'status': 'stored'}
+            except Exception as e:
+                print(f"Error storing node metrics: {e}")
+                results['node'] = {'status': 'failed', 'error': str(e)}
+        
+        updates = []
+        for record in batch.pods:
+            namespace = record.labels['namespace']
+            pod_name = record.labels['pod_name']
+            pod_key = f"{namespace}/{pod_name}"
+            try:
+                updates.append((pod_key, self._append_record('pod', pod_key, record, batch.replayed)))
+                results['pods'].append({
+                    'namespace': namespace,
+                    'pod_name': pod_name,
+                    'status': 'stored'
+                })
+            except Exception as e:
+                print(f"Error storing pod metrics: {e}")
+                results['pods'].append({
+                    'namespace': namespace,
+                    'pod_name': pod_name,
+                    'status': 'failed',
+                    'error': str(e)
+                })
+        
+        self._publish_batch(node_name, node_metrics, updates)
+        return results
+    
+    def _publish_batch(self, node_name: str, node_metrics: Optional[Dict[str, Any]],
+                       updates: List[Tuple[str, Dict[str, Any]]]):
+        """배치로 저장된 노드/파드 최신 데이터를 스냅샷 교체 한 번으로 반영한 뒤 시리즈 상한 적용"""
+        if node_metrics is None and not updates:
+            return
+        with self.write_lock:
+            if node_metrics is not None:
+                self._publish_node_locked(node_name, node_metrics)
+            if updates:
+                self._apply_pod_updates_locked(updates)
+        self._enforce_series_limit()
+    
+    # ==================== 시리즈 정리 ====================
+    
+    def start_eviction(self):
+        """SERIES_TTL이 설정되어 있으면 오래 기록되지 않은 시리즈를 주기적으로 제거하는 스레드 시작"""
+        if self.series_ttl <= 0:
+            return
+        self._eviction_thread = threading.Thread(target=self._run_eviction, name='storage-eviction', daemon=True)
+        self._eviction_thread.start()
+    
+    def _run_eviction(self):
+        while not self.shutdown_event.wait(max(Config.SERIES_SWEEP_INTERVAL, 1)):
+            try:
+                self.sweep_series()
+            except Exception as e:
+                print(f"Series eviction error: {e}")
+    
+    def sweep_series(self, now: Optional[float] = None) -> int:
+        """마지막 기록 후 SERIES_TTL이 지난 시리즈 제거, 제거한 시리즈 수 반환"""
+        if self.series_ttl <= 0:
+            return 0
+        cutoff = (now if now is not None else time.time()) - self.series_ttl
+        if self.sealed_until is not None:
+            # 아직 세그먼트로 봉인되지 않은 샘플이 있는 시리즈는 봉인 후 제거
+            cutoff = min(cutoff, self.sealed_until)
+        victims = []
+        with self.activity_lock:
+            # LRU 순서이므로 cutoff 이후 기록된 시리즈를 만나면 중단
+            for entry, seen in self.series_activity.items():
+                if seen >= cutoff:
+                    break
+                victims.append((entry, seen))
+        return self._evict_series(victims, 'ttl')
+    
+    def _enforce_series_limit(self):
+        """시리즈 수가 MAX_SERIES를 넘으면 가장 오래 기록되지 않은 시리즈부터 제거 (쓰기 lock 밖에서 호출)"""
+        if self.max_series <= 0 or len(self.series_activity) <= self.max_series:
+            return
+        with self.activity_lock:
+            excess = len(self.series_activity) - self.max_series
+            victims = list(islice(self.series_activity.items(), max(excess, 0)))
+        self._evict_series(victims, 'limit')
+    
+    def _evict_series(self, victims: List[Tuple[Tuple[str, str], float]], reason: str) -> int:
+        """
+        시리즈 버퍼와 최신 데이터/인덱스/롤업 합계 제거, 제거한 시리즈 수 반환
+        victims는 ((kind, key), 선택 시점의 마지막 기록 시각)이며 그 사이 다시 기록된 시리즈는 건너뜀
+        영속화 사용 시 봉인되지 않은 구간은 다음 봉인까지 보관 (_retire_series_locked)
+        """
+        if not victims:
+            return 0
+        evicted = []
+        with self.write_lock:
+            for (kind, key), seen in victims:
+                with self._series_lock(key):
+                    with self.activity_lock:
+                        if self.series_activity.get((kind, key)) != seen:
+                            continue
+                        del self.series_activity[(kind, key)]
+                    buffer = self.series_by_kind[kind].pop(key, None)
+                    if buffer is not None and self.sealed_until is not None:
+                        self._retire_series_locked(kind, key, buffer)
+                evicted.append((kind, key))
+                self.evictions[reason][kind] += 1
+            if evicted:
+                self._remove_latest_locked(evicted)
+        return len(evicted)
+    
+    def _retire_series_locked(self, kind: str, key: str, buffer: SeriesBuffer):
+        """
+        제거하는 시리즈에 아직 봉인되지 않은 샘플(sealed_until 이후)이 있으면 그 구간만 새 버퍼로 옮겨 다음 봉인까지 보관
+        (WAL은 봉인 후 정리되므로 버리면 재시작 후에도 복원되지 않음, 시리즈 stripe lock 보유 필요)
+        """
+        sealed = self.sealed_until
+        newest = buffer.newest_epoch()
+        if newest < sealed:
+            return
+        end = math.floor(newest) + 1
+        retired = self._new_series()
+        exported = buffer.export_range(sealed, end)
+        if exported is not None:
+            retired.load(buffer.labels, *exported)
+        for source, target in zip(buffer.tiers, retired.tiers):
+            target.load(source.export_range(sealed, end), sealed)
+        self.retired_series[(kind, key)] = retired
+    
+    def _remove_latest_locked(self, evicted: List[Tuple[str, str]]):
+        """제거된 시리즈의 최신 데이터 스냅샷 교체 (파드는 인덱스/롤업 합계/컬럼 표에서도 제외, write_lock 보유 필요)"""
+        keys = {kind: [] for kind in self.series_by_kind}
+        for kind, key in evicted:
+            keys[kind].append(key)
+        
+        if keys['node']:
+            self.latest_nodes = self._without(self.latest_nodes, keys['node'])
+        if keys['namespace']:
+            self.latest_namespaces = self._without(self.latest_namespaces, keys['namespace'])
+        if keys['deployment']:
+            self.latest_deployments = self._without(self.latest_deployments, keys['deployment'])
+        if not keys['pod']:
+            return
+        
+        view = self.pod_view
+        latest = dict(view.latest)
+        by_node, by_namespace = IndexWriter(view.by_node), IndexWriter(view.by_namespace)
+        by_owner, by_pod_name = IndexWriter(view.by_owner), IndexWriter(view.by_pod_name)
+        for pod_key in keys['pod']:
+            previous = latest.pop(pod_key, None)
+            if previous is None:
+                continue
+            owner = owner_deployment(previous)
+            by_node.remove(previous.get('node_name'), pod_key)
+            by_namespace.remove(previous['namespace'], pod_key)
+            by_pod_name.remove(previous['pod_name'], previous['namespace'])
+            if owner:
+                by_owner.remove((previous['namespace'], owner), pod_key)
+            self.rollups.update(previous, None, owner, None)
+            self.pod_columns.remove(pod_key)
+        
+        self.pod_view = PodView(latest, by_node.result(), by_namespace.result(), by_owner.result(), by_pod_name.result())
+        self.rollups.publish()
+    
+    @staticmethod
+    def _without(snapshot: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
+        snapshot = dict(snapshot)
+        for key in keys:
+            snapshot.pop(key, None)
+        return snapshot
+    
+    def _rebuild_series_activity(self):
+        """복원된 시리즈의 마지막 기록 시각을 마지막 샘플 시각으로 다시 구성 (재시작 시 1회)"""
+        entries = [((kind, key), buffer.newest_epoch())
+                   for kind, series in self.series_by_kind.items() for key, buffer in list(series.items())]
+        with self.activity_lock:
+            self.series_activity = OrderedDict(sorted(entries, key=itemgetter(1)))
+    
+    def get_series_stats(self) -> Dict[str, Any]:
+        """종류별 시리즈 수, 정리 설정, 사유/종류별 누적 제거 수"""
+        series = {kind: len(buffers) for kind, buffers in self.series_by_kind.items()}
+        evictions = {reason: dict(counts) for reason, counts in self.evictions.items()}
+        return {
+            'series': series,
+            'total_series': sum(series.values()),
+            'latest_pods': len(self.pod_view.latest),
+            'retired_series': len(self.retired_series),
+            'series_ttl': self.series_ttl,
+            'max_series': self.max_series,
+            'evictions': evictions,
+            'total_evictions': sum(sum(counts.values()) for counts in evictions.values())
+        }
+    
+    # ==================== 디스크 영속화 ====================
+    
+    def enable_persistence(self, directory: str):
+        """
+        디스크 영속화 시작 (서버 시작 시 수집 요청을 받기 전에 1회 호출)
+        1. 기존 세그먼트를 mmap하여 시계열 버퍼/다운샘플링 단계를 컬럼 단위로 복원 (샘플별 재생 없음)
+        2. 봉인되지 않은 구간의 WAL 레코드만 재생하여 최신 데이터/인덱스/롤업 합계 복원
+        3. 새 WAL 파일을 열고 봉인/병합/보존 기간 정리 스레드 시작
+        """
+        for resolution, _ in self.tier_specs:
+            if Config.SEGMENT_DURATION % resolution:
+                raise ValueError(f"SEGMENT_DURATION({Config.SEGMENT_DURATION}) must be a multiple of "
+                                 f"downsample resolution {resolution}")
+        
+        began = time.monotonic()
+        self.segment_store = SegmentStore(os.path.join(directory, 'segments'))
+        self.segment_store.load()
+        self.segment_store.expire(time.time() - self.retention_seconds)
+        self._restore_segments()
+        
+        self.wal = WriteAheadLog(os.path.join(directory, 'wal'), Config.WAL_FSYNC_INTERVAL)
+        replayed = self._replay_wal()
+        self._rebuild_series_activity()
+        # WAL 재생으로 상한을 넘었으면 봉인 스레드 시작 전에 정리 (미봉인 구간은 보관 후 봉인)
+        self._enforce_series_limit()
+        atexit.register(self.wal.close)
+        print(f"Storage restored from {directory} in {time.monotonic() - began:.2f}s "
+              f"({len(self.segment_store.segments)} segments, {replayed} WAL records)")
+        
+        self._persistence_thread = threading.Thread(target=self._run_persistence, name='storage-persistence',
+                                                    daemon=True)
+        self._persistence_thread.start()
+    
+    def shutdown(self):
+        """백그라운드 정리/영속화 스레드를 멈추고 WAL을 디스크에 반영한 뒤 닫음"""
+        self.shutdown_event.set()
+        for thread in (self._persistence_thread, self._eviction_thread):
+            if thread is not None:
+                thread.join()
+        if self.wal is not None:
+            self.wal.close()
+    
+    def _restore_segments(self):
+        """
+        세그먼트에서 시리즈별 최근 원본 샘플(버퍼 용량만큼)과 보존 기간 안의 다운샘플링 구간 복원
+        MAX_SERIES를 넘으면 마지막으로 기록된 세그먼트가 최근인 시리즈부터 상한까지만 복원
+        """
+        store = self.segment_store
+        now = time.time()
+        keys = store.series_keys()
+        if self.max_series > 0:
+            keys = keys[:self.max_series]
+        for kind, key in keys:
+            series = self.series_by_kind.get(kind)
+            if series is None:
+                continue
+            parts = store.parts(kind, key)
+            buffer = series[key]
+            
+            # 최신 세그먼트부터 버퍼 용량만큼 (세그먼트, 항목, 시작 위치) 선택
+            chunks, needed = [], self.max_data_points
+            for segment, entry in reversed(parts):
+                if needed <= 0:
+                    break
+                if entry['count']:
+                    take = min(needed, entry['count'])
+                    chunks.append((segment, entry, entry['count'] - take))
+                    needed -= take
+            
+            columns = [array('d')] + [array('q') for _ in VALUE_FIELDS]
+            extras = {}
+            for segment, entry, begin in reversed(chunks):
+                base = len(columns[0]) - begin
+                for target, column in zip(columns, segment.raw(entry)):
+                    target.frombytes(column[begin:].cast('B'))
+                for index, extra in segment.extras(entry).items():
+                    if index >= begin:
+                        extras[base + index] = extra
+            buffer.load(parts[-1][1]['labels'], columns, extras)
+            
+            for tier in buffer.tiers:
+                for segment, entry in parts:
+                    if segment.end <= now - tier.retention:
+                        continue
+                    tier_columns = segment.tier(entry, tier.resolution)
+                    if tier_columns is not None:
+                        tier.load(tier_columns, now - tier.retention)
+    
+    def _replay_wal(self) -> int:
+        """봉인 시각 이후 WAL 레코드를 시계열 버퍼에 재생하고 마지막 값으로 최신 데이터 복원, 재생 건수 반환"""
+        sealed = self.segment_store.sealed_until
+        latest = {kind: {} for kind in self.series_by_kind}
+        earliest = math.inf
+        replayed = 0
+        # 봉인된 구간의 샘플은 세그먼트에서 이미 복원됨
+        for kind, key, metrics in self.wal.replay(sealed if sealed is not None else -math.inf):
+            epoch = to_epoch(metrics.get('timestamp'))
+            series = self.series_by_kind.get(kind)
+            if series is None:
+                continue
+            try:
+                series[key].append(metrics)
+            except (TypeError, ValueError) as e:
+                print(f"Skipping WAL record for {kind} {key}: {e}")
+                continue
+            latest[kind][key] = metrics
+            if epoch < earliest:
+                earliest = epoch
+            replayed += 1
+        
+        # 이후 기록(롤업 샘플 포함)은 새 파일에
+        self.wal.rotate()
+        if sealed is None:
+            sealed = math.floor(min(earliest, time.time()) / Config.SEGMENT_DURATION) * Config.SEGMENT_DURATION
+        self.sealed_until = sealed
+        self.wal.prune(sealed)
+        
+        with self.write_lock:
+            self.latest_nodes = dict(self.latest_nodes, **{key: metrics.copy() for key, metrics in latest['node'].items()})
+            self.latest_namespaces = dict(self.latest_namespaces, **latest['namespace'])
+            self.latest_deployments = dict(self.latest_deployments, **latest['deployment'])
+            if latest['pod']:
+                self._apply_pod_updates_locked(list(latest['pod'].items()))
+        return replayed
+    
+    def _run_persistence(self):
+        """WAL fsync, 끝난 구간 봉인, 보존 기간 정리/세그먼트 병합 루프"""
+        last_maintenance = 0.0
+        while not self.shutdown_event.wait(max(Config.WAL_FSYNC_INTERVAL, 0.1)):
+            try:
+                self.wal.sync()
+                now = time.time()
+                # 늦게 도착하는 샘플을 위해 구간 종료 후 SEGMENT_SEAL_DELAY만큼 기다린 뒤 봉인
+                while now >= self.sealed_until + Config.SEGMENT_DURATION + Config.SEGMENT_SEAL_DELAY:
+                    self._seal_partition(self.sealed_until, self.sealed_until + Config.SEGMENT_DURATION)
+                if now - last_maintenance >= Config.SEGMENT_DURATION:
+                    self.segment_store.expire(now - self.retention_seconds)
+                    self.segment_store.compact(now, Config.SEGMENT_COMPACT_DURATION, dict(self.tier_specs))
+                    last_maintenance = now
+            except Exception as e:
+                # 예외로 스레드가 끝나면 WAL fsync와 봉인(봉인 시각에 묶인 TTL 정리 포함)이 멈추므로 기록 후 다음 주기에 재시도
+                print(f"Storage persistence error: {e}")
+    
+    def _seal_partition(self, start: float, end: float):
+        """
+        [start, end) 구간의 원본 샘플/다운샘플링 구간을 버퍼에서 복사해 세그먼트로 기록
+        기록 후 WAL 파일을 교체하고, 봉인된 구간의 레코드만 담은 파일 삭제
+        """
+        writer = self.segment_store.writer(int(start), int(end))
+        try:
+            for kind, series in self.series_by_kind.items():
+                # 상한 초과로 제거됐지만 미봉인 구간을 보관 중인 시리즈 포함 (다시 기록된 시리즈는 한 번만)
+                keys = dict.fromkeys(list(series))
+                keys.update(dict.fromkeys(key for retired_kind, key in list(self.retired_series) if retired_kind == kind))
+                for key in keys:
+                    with self._series_lock(key):
+                        buffer = series.get(key)
+                        if buffer is None:
+                            buffer = self.retired_series.get((kind, key))
+                        if buffer is None:
+                            continue
+                        exported = buffer.export_range(start, end)
+                        tiers = {tier.resolution: tier.export_range(start, end) for tier in buffer.tiers}
+                        labels = buffer.labels
+                    raw, extras = exported if exported is not None else (None, None)
+                    writer.add(kind, key, labels, raw, extras, tiers)
+            
+            if not writer.entries:
+                writer.abort()
+                self.sealed_until = end
+                self._release_retired(end)
+                return
+            self.wal.rotate()
+            path = writer.commit()
+        except Exception:
+            writer.abort()
+            raise
+        
+        self.segment_store.add(path)
+        self.sealed_until = end
+        self._release_retired(end)
+        self.wal.prune(end)
+    
+    def _release_retired(self, sealed: float):
+        """모든 샘플이 봉인된 보관 시리즈 삭제"""
+        for entry, buffer in list(self.retired_series.items()):
+            with self._series_lock(entry[1]):
+                if self.retired_series.get(entry) is buffer and buffer.newest_epoch() < sealed:
+                    del self.retired_series[entry]
 
 # 전역 인스턴스
 storage_service = StorageService()
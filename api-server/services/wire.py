@@ -0,0 +1,214 @@
+"""
+compact 바이너리 전송 형식 디코더 모듈
+collector의 고정 스키마 + 델타 인코딩 배치를 시리즈 라벨 + 정수 값 레코드로 변환 (저장소가 시계열 컬럼에 바로 추가)
+
+메시지 형식 (little-endian):
+  header  <4sQIH   magic 'KMC1', session_id, seq, frame 수
+  frame   <dBH     노드 수집 시각(epoch 초), flags(bit0: 노드 레코드 포함, bit1: 스풀 재전송,
+                   bit2: 파드 레코드별 수집 시각 오프셋 포함), 시리즈 정의 수
+          정의     <HH + utf-8 "namespace/pod_name"   (series_id, 길이)
+                   소유자가 있으면 뒤에 "\0owner_kind\0owner_name\0replicaset_name"
+          노드     레코드 (series_id 0)
+          <H       파드 레코드 수
+          파드     (bit2 설정 시 <i 프레임 시각 대비 밀리초 오프셋) + 레코드, x N
+  레코드  <HB      series_id, mask
+          값       mask bit0~5 중 설정된 필드의 이전 값 대비 델타 (bit7 설정 시 int64, 아니면 int32)
+          요약     mask bit6 설정 시 <B 메트릭 mask + 메트릭별 <qqqqqI (min, max, mean*100, last, p95, count)
+시리즈 정의와 이전 값은 세션(session_id) 단위로 유지하며, seq는 세션 내 메시지 순번
+"""
+
+import math
+import struct
+from threading import Lock
+from typing import Any, Dict, List, NamedTuple, Optional
+
+COMPACT_CONTENT_TYPE = 'application/x-metrics-compact'
+COMPACT_MAGIC = b'KMC1'
+
+# 델타 인코딩 필드 순서 (mask bit0~5)
+COMPACT_FIELDS = ('cpu_millicores', 'memory_bytes', 'read_bytes', 'write_bytes', 'bytes_sent', 'bytes_recv')
+SUMMARY_METRICS = ('cpu_millicores', 'memory_bytes')
+OWNER_FIELDS = ('owner_kind', 'owner_name', 'replicaset_name')
+
+FRAME_NODE = 0x01
+FRAME_REPLAYED = 0x02
+FRAME_POD_TIMES = 0x04
+MASK_FIELDS = 0x3F
+MASK_SUMMARY = 0x40
+MASK_WIDE = 0x80
+NODE_SERIES_ID = 0
+
+HEADER = struct.Struct('<4sQIH')
+FRAME = struct.Struct('<dBH')
+DEFINITION = struct.Struct('<HH')
+COUNT = struct.Struct('<H')
+TIME_OFFSET = struct.Struct('<i')
+RECORD = struct.Struct('<HB')
+SUMMARY_MASK = struct.Struct('<B')
+SUMMARY = struct.Struct('<qqqqqI')
+
+# mask별 값 구조체와 변경 필드 인덱스 (필드 수 x 폭 조합을 미리 계산)
+VALUE_STRUCTS = {
+    mask: struct.Struct('<' + ('q' if mask & MASK_WIDE else 'i') * bin(mask & MASK_FIELDS).count('1'))
+    for mask in range(256)
+}
+FIELD_INDEXES = {
+    mask: tuple(index for index in range(len(COMPACT_FIELDS)) if mask & (1 << index))
+    for mask in range(256)
+}
+
+# 수집 시각으로 인정하는 epoch 범위 (밖의 값은 저장 시 서버 시각으로 대체)
+MAX_EPOCH = 253402300800.0  # 10000-01-01
+
+
+class CompactRecord(NamedTuple):
+    """디코딩된 레코드 1건"""
+    labels: Dict[str, str]  # 시리즈 라벨 (세션의 시리즈 정의를 공유하므로 수정 금지)
+    values: List[int]  # COMPACT_FIELDS 순서 값
+    epoch: float  # 수집 시각 (잘못된 값은 NaN)
+    summary: Optional[Dict[str, Any]]
+
+
+class CompactBatch(NamedTuple):
+    """디코딩된 프레임 1개 (노드 레코드, 파드 레코드 목록, 스풀 재전송 여부)"""
+    node: Optional[CompactRecord]
+    pods: List[CompactRecord]
+    replayed: bool
+
+
+class CompactSessionError(Exception):
+    """세션 상태 불일치 (알 수 없는 세션 또는 seq 누락) - collector가 세션을 재설정해야 함"""
+
+
+class CompactSession:
+    """노드별 compact 세션 상태 (시리즈 정의 + 시리즈별 마지막 값)"""
+
+    def __init__(self, session_id: int):
+        self.session_id = session_id
+        self.seq = -1
+        self.series: Dict[int, Dict[str, str]] = {}  # series_id -> 파드 라벨 (namespace, pod_name, 소유자, node_name)
+        self.values: Dict[int, List[int]] = {}  # series_id -> COMPACT_FIELDS 순서 마지막 값
+
+
+class CompactDecoder:
+    """compact 메시지 디코더 (세션 상태를 노드별로 유지)"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.sessions: Dict[str, CompactSession] = {}  # node_name -> 세션
+
+    def decode(self, node_name: str, data: bytes) -> List[CompactBatch]:
+        """
+        메시지를 프레임별 CompactBatch 목록으로 디코딩
+        세션 상태는 디코딩이 끝까지 성공한 경우에만 반영
+        잘못된 메시지는 ValueError, 세션 불일치는 CompactSessionError
+        """
+        try:
+            magic, session_id, seq, frame_count = HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise ValueError('Truncated compact header')
+        if magic != COMPACT_MAGIC:
+            raise ValueError('Invalid compact magic')
+
+        with self.lock:
+            session = self.sessions.get(node_name)
+            if session is None or session.session_id != session_id:
+                if seq != 0:
+                    raise CompactSessionError(f'Unknown compact session {session_id:x}')
+                session = CompactSession(session_id)
+            elif seq != session.seq + 1:
+                raise CompactSessionError(f'Compact sequence gap: expected {session.seq + 1}, got {seq}')
+
+            new_series: Dict[int, Dict[str, str]] = {}
+            new_values: Dict[int, List[int]] = {}
+            batches = []
+            offset = HEADER.size
+
+            try:
+                for _ in range(frame_count):
+                    batch, offset = self._decode_frame(node_name, data, offset, session, new_series, new_values)
+                    batches.append(batch)
+            except (struct.error, UnicodeDecodeError, KeyError) as e:
+                raise ValueError(f'Malformed compact frame: {e}')
+            if offset != len(data):
+                raise ValueError('Trailing bytes after compact frames')
+
+            session.series.update(new_series)
+            session.values.update(new_values)
+            session.seq = seq
+            self.sessions[node_name] = session
+
+        return batches
+
+    def _decode_frame(self, node_name, data, offset, session, new_series, new_values):
+        epoch, flags, definition_count = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        if not 0 <= epoch < MAX_EPOCH:
+            # 잘못된 수집 시각(NaN/범위 초과)은 저장 시 서버 시각으로 대체
+            epoch = math.nan
+
+        for _ in range(definition_count):
+            series_id, length = DEFINITION.unpack_from(data, offset)
+            offset += DEFINITION.size
+            name, *owner = data[offset:offset + length].decode('utf-8').split('\0')
+            offset += length
+            namespace, pod_name = name.split('/', 1)
+            labels = {'namespace': namespace, 'pod_name': pod_name}
+            labels.update((field, value) for field, value in zip(OWNER_FIELDS, owner) if value)
+            labels['node_name'] = node_name
+            new_series[series_id] = labels
+
+        node_record = None
+        if flags & FRAME_NODE:
+            _, values, summary, offset = self._decode_record(data, offset, session, new_values)
+            node_record = CompactRecord({'node_name': node_name}, values, epoch, summary)
+
+        (pod_count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+
+        pods = []
+        pod_epoch = epoch
+        for _ in range(pod_count):
+            if flags & FRAME_POD_TIMES:
+                (time_offset,) = TIME_OFFSET.unpack_from(data, offset)
+                offset += TIME_OFFSET.size
+                pod_epoch = epoch + time_offset / 1000
+            series_id, values, summary, offset = self._decode_record(data, offset, session, new_values)
+            labels = new_series.get(series_id) or session.series[series_id]
+            pods.append(CompactRecord(labels, values, pod_epoch, summary))
+
+        return CompactBatch(node_record, pods, bool(flags & FRAME_REPLAYED)), offset
+
+    @staticmethod
+    def _decode_record(data, offset, session, new_values):
+        """레코드 1건을 이전 값에 델타 적용, (series_id, 값 목록, 요약, 다음 offset) 반환"""
+        series_id, mask = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+
+        values = new_values.get(series_id) or session.values.get(series_id) or [0] * len(COMPACT_FIELDS)
+        value_struct = VALUE_STRUCTS[mask]
+        if value_struct.size:
+            # 이전 값 목록은 세션 상태이므로 복사 후 델타 적용 (변경 없으면 그대로 재사용)
+            values = list(values)
+            for index, delta in zip(FIELD_INDEXES[mask], value_struct.unpack_from(data, offset)):
+                values[index] += delta
+            offset += value_struct.size
+        new_values[series_id] = values
+
+        summary = None
+        if mask & MASK_SUMMARY:
+            (metric_mask,) = SUMMARY_MASK.unpack_from(data, offset)
+            offset += SUMMARY_MASK.size
+            summary = {}
+            for index, metric in enumerate(SUMMARY_METRICS):
+                if metric_mask & (1 << index):
+                    low, high, mean, last, p95, count = SUMMARY.unpack_from(data, offset)
+                    offset += SUMMARY.size
+                    summary[metric] = {'min': low, 'max': high, 'mean': mean / 100, 'last': last,
+                                       'p95': p95, 'count': count}
+
+        return series_id, values, summary, offset
+
+
+# 전역 인스턴스
+compact_decoder = CompactDecoder()
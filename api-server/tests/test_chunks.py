@@ -0,0 +1,125 @@
+"""
+압축 청크 코덱 테스트: 인코딩 분기별/경계 크기별 round-trip
+api-server 디렉터리에서 실행: python -m unittest discover tests
+"""
+
+import math
+import random
+import unittest
+import zlib
+
+from services.chunks import Chunk, _DELTA, _DELTA_OF_DELTA, _FLOAT, _RAW
+from services.series import VALUE_FIELDS
+
+INT64_MAX = 2 ** 63 - 1
+INT64_MIN = -2 ** 63
+BASE_EPOCH = 1_700_000_000
+
+
+def regular_timestamps(count, interval=30.0, start=BASE_EPOCH):
+    return [start + index * interval for index in range(count)]
+
+
+def jittered_timestamps(count, rng):
+    """마이크로초 단위 불규칙 간격 (저장 시각과 같은 정밀도)"""
+    micros = BASE_EPOCH * 1_000_000
+    timestamps = []
+    for _ in range(count):
+        micros += rng.randint(1, 60_000_000)
+        timestamps.append(micros / 1_000_000)
+    return timestamps
+
+
+def value_columns(count, rng):
+    return [[rng.randint(0, 10 ** 12) for _ in range(count)] for _ in VALUE_FIELDS]
+
+
+def encodings(chunk):
+    """압축 본문 앞의 컬럼별 인코딩 바이트"""
+    body = zlib.decompress(chunk.data)
+    return list(body[:len(body) // (chunk.count * 8 + 1)])
+
+
+class ChunkRoundTripTest(unittest.TestCase):
+
+    def assert_round_trip(self, timestamps, columns, extras=None):
+        chunk = Chunk.encode(timestamps, columns, extras or {})
+        decoded_timestamps, decoded_columns, decoded_extras = chunk.decode()
+        self.assertEqual(decoded_timestamps, list(timestamps))
+        self.assertEqual(decoded_columns, [list(column) for column in columns])
+        self.assertEqual(decoded_extras, extras or {})
+        self.assertEqual(chunk.decode_extras(), extras or {})
+        self.assertEqual((chunk.first, chunk.last, chunk.count), (timestamps[0], timestamps[-1], len(timestamps)))
+        return chunk
+
+    def test_delta_encodings_for_regular_samples(self):
+        rng = random.Random(1)
+        chunk = self.assert_round_trip(regular_timestamps(120), value_columns(120, rng))
+        self.assertEqual(encodings(chunk), [_DELTA_OF_DELTA] + [_DELTA] * len(VALUE_FIELDS))
+
+    def test_irregular_microsecond_timestamps(self):
+        rng = random.Random(2)
+        for _ in range(50):
+            count = rng.randint(1, 200)
+            chunk = self.assert_round_trip(jittered_timestamps(count, rng), value_columns(count, rng))
+            self.assertEqual(encodings(chunk)[0], _DELTA_OF_DELTA)
+
+    def test_boundary_sizes(self):
+        rng = random.Random(3)
+        for count in (1, 2, 3, 119, 120, 121, 1000):
+            with self.subTest(count=count):
+                self.assert_round_trip(jittered_timestamps(count, rng), value_columns(count, rng))
+
+    def test_single_sample_chunk(self):
+        chunk = self.assert_round_trip([BASE_EPOCH + 0.5], [[value] for value in range(len(VALUE_FIELDS))],
+                                       {0: {'summary': {'cpu_millicores': {'max': 3}}}})
+        self.assertEqual(chunk.first, chunk.last)
+
+    def test_constant_and_negative_values(self):
+        count = 50
+        columns = [[0] * count, [-5] * count, list(range(0, -count, -1)),
+                   [7] * count, list(range(count)), [INT64_MAX] * count]
+        self.assert_round_trip(regular_timestamps(count), columns)
+
+    def test_invalid_timestamps_fall_back_to_float(self):
+        # 잘못된 타임스탬프는 -inf로 저장되어 청크 앞쪽에 정렬됨
+        timestamps = [-math.inf, -math.inf] + regular_timestamps(10)
+        chunk = self.assert_round_trip(timestamps, [list(range(12)) for _ in VALUE_FIELDS])
+        self.assertEqual(encodings(chunk)[0], _FLOAT)
+
+    def test_all_invalid_timestamps(self):
+        chunk = self.assert_round_trip([-math.inf] * 3, [[1, 2, 3] for _ in VALUE_FIELDS])
+        self.assertEqual(encodings(chunk)[0], _FLOAT)
+
+    def test_timestamp_overflow_falls_back_to_float(self):
+        # 마이크로초 delta-of-delta가 int64 범위를 넘는 값
+        timestamps = [-1e13, 0.0, 1e13]
+        chunk = self.assert_round_trip(timestamps, [[1, 2, 3] for _ in VALUE_FIELDS])
+        self.assertEqual(encodings(chunk)[0], _FLOAT)
+
+    def test_value_overflow_falls_back_to_raw(self):
+        columns = [[INT64_MIN, INT64_MAX, INT64_MIN]] + [[1, 2, 3] for _ in VALUE_FIELDS[1:]]
+        chunk = self.assert_round_trip(regular_timestamps(3), columns)
+        self.assertEqual(encodings(chunk), [_DELTA_OF_DELTA, _RAW] + [_DELTA] * (len(VALUE_FIELDS) - 1))
+
+    def test_mixed_fallbacks_in_one_chunk(self):
+        timestamps = [-math.inf] + regular_timestamps(4)
+        columns = [[INT64_MAX, INT64_MIN, 0, INT64_MAX, INT64_MIN]] + [[1, 2, 3, 4, 5] for _ in VALUE_FIELDS[1:]]
+        chunk = self.assert_round_trip(timestamps, columns, {4: {'stale': True}})
+        self.assertEqual(encodings(chunk)[:2], [_FLOAT, _RAW])
+
+    def test_extras(self):
+        rng = random.Random(4)
+        extras = {0: {'summary': {'memory_bytes': {'p95': 10}}}, 57: {'stale': True},
+                  119: {'phase': 'Running', 'restarts': 2}}
+        chunk = self.assert_round_trip(regular_timestamps(120), value_columns(120, rng), extras)
+        self.assertIsNotNone(chunk.extras)
+
+    def test_no_extras_stored_as_none(self):
+        chunk = Chunk.encode(regular_timestamps(3), [[1, 2, 3] for _ in VALUE_FIELDS], {})
+        self.assertIsNone(chunk.extras)
+        self.assertEqual(chunk.decode_extras(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+다운샘플링 단계 테스트: 압축 블록/head에 합산한 구간 통계를 단순 집계와 비교, 만료/늦은 샘플/세그먼트 round-trip
+api-server 디렉터리에서 실행: python -m unittest discover tests
+"""
+
+import random
+import unittest
+
+from services.downsample import TierBuffer, parse_tiers
+from services.series import VALUE_FIELDS
+
+FIELDS = len(VALUE_FIELDS)
+BASE_EPOCH = 1_700_000_000
+
+
+def random_values(rng):
+    return [rng.randint(-10 ** 6, 10 ** 12) for _ in VALUE_FIELDS]
+
+
+class ReferenceTier:
+    """구간 번호 -> [count, mins, maxs, sums] 단순 집계 (보존 기간은 가장 최근 구간 기준)"""
+
+    def __init__(self, resolution, retention):
+        self.resolution = resolution
+        self.retention = retention
+        self.buckets = {}
+
+    def add(self, epoch, values):
+        bucket = int(epoch // self.resolution)
+        newest = max(self.buckets, default=bucket)
+        if bucket < newest - self.retention // self.resolution:
+            return
+        stats = self.buckets.setdefault(bucket, [0, list(values), list(values), [0] * FIELDS])
+        stats[0] += 1
+        stats[1] = [min(pair) for pair in zip(stats[1], values)]
+        stats[2] = [max(pair) for pair in zip(stats[2], values)]
+        stats[3] = [total + value for total, value in zip(stats[3], values)]
+
+    def rows(self, cutoff):
+        newest = max(self.buckets)
+        oldest = newest - self.retention // self.resolution
+        return [(float(bucket * self.resolution), count, *mins, *maxs, *sums)
+                for bucket, (count, mins, maxs, sums) in sorted(self.buckets.items())
+                if bucket >= oldest and (bucket + 1) * self.resolution > cutoff]
+
+
+class TierBufferTest(unittest.TestCase):
+
+    def feed(self, resolution, retention, epochs, seed=0, block_buckets=None):
+        rng = random.Random(seed)
+        tier = TierBuffer(resolution, retention) if block_buckets is None else \
+            TierBuffer(resolution, retention, block_buckets)
+        reference = ReferenceTier(resolution, retention)
+        for epoch in epochs:
+            values = random_values(rng)
+            tier.add(epoch, values)
+            reference.add(epoch, values)
+        return tier, reference
+
+    def test_matches_reference_for_regular_samples(self):
+        epochs = [BASE_EPOCH + index * 30 for index in range(5000)]
+        tier, reference = self.feed(600, 86400, epochs)
+        self.assertEqual(tier.window_rows(0), reference.rows(0))
+        self.assertTrue(tier.blocks)
+
+    def test_gaps_and_late_samples(self):
+        rng = random.Random(1)
+        epochs = []
+        epoch = BASE_EPOCH
+        for _ in range(3000):
+            epoch += rng.choice((10, 30, 30, 30, 7200))  # 가끔 수집 중단으로 빈 구간
+            # 일부 샘플은 닫힌 블록이나 보존 기간 밖으로 늦게 도착
+            epochs.append(epoch - rng.choice((0, 0, 0, 600, 3 * 3600, 40 * 3600)))
+        for block_buckets in (1, 4, 32):
+            with self.subTest(block_buckets=block_buckets):
+                tier, reference = self.feed(60, 86400, epochs, seed=2, block_buckets=block_buckets)
+                self.assertEqual(tier.window_rows(0), reference.rows(0))
+
+    def test_window_cutoff_includes_bucket_containing_cutoff(self):
+        epochs = [BASE_EPOCH + index * 60 for index in range(200)]
+        tier, reference = self.feed(600, 86400, epochs)
+        for cutoff in (BASE_EPOCH + 1200, BASE_EPOCH + 1201, BASE_EPOCH + 1799.5, BASE_EPOCH + 12000):
+            with self.subTest(cutoff=cutoff):
+                self.assertEqual(tier.window_rows(cutoff), reference.rows(cutoff))
+        self.assertEqual(tier.window_rows(BASE_EPOCH + 10 ** 6), [])
+        self.assertEqual(TierBuffer(60, 3600).window_rows(0), [])
+
+    def test_expired_blocks_are_dropped_eagerly(self):
+        resolution, retention = 60, 3600
+        epochs = [BASE_EPOCH + index * 15 for index in range(20000)]
+        tier, reference = self.feed(resolution, retention, epochs)
+        # 보존 구간 + 블록 1개를 넘는 구간을 들고 있지 않음
+        kept = sum(block.count for block in tier.blocks)
+        self.assertLessEqual(kept, retention // resolution + tier.block_buckets)
+        self.assertEqual(tier.window_rows(0), reference.rows(0))
+        self.assertEqual(len(tier.window_rows(0)), retention // resolution + 1)
+
+    def test_block_size_is_limited_by_retention(self):
+        self.assertEqual(TierBuffer(3600, 4 * 3600).block_buckets, 4)
+        self.assertEqual(TierBuffer(3600, 1800).block_buckets, 1)
+
+    def test_export_and_load_round_trip(self):
+        epochs = [BASE_EPOCH + index * 45 for index in range(6000)]
+        tier, _ = self.feed(600, 7 * 86400, epochs)
+        # 세그먼트 구간(1시간) 단위로 나눠 봉인한 컬럼을 새 버퍼에 차례로 복원
+        restored = TierBuffer(600, 7 * 86400)
+        start = BASE_EPOCH // 3600 * 3600
+        while start <= epochs[-1]:
+            columns = tier.export_range(start, start + 3600)
+            self.assertEqual(len(columns), 2 + 3 * FIELDS)
+            self.assertEqual(columns[0].typecode, 'd')
+            restored.load([memoryview(column) for column in columns], 0)
+            start += 3600
+        self.assertEqual(restored.window_rows(0), tier.window_rows(0))
+
+    def test_load_skips_rows_before_cutoff(self):
+        epochs = [BASE_EPOCH + index * 60 for index in range(100)]
+        tier, reference = self.feed(600, 86400, epochs)
+        restored = TierBuffer(600, 86400)
+        columns = tier.export_range(0, BASE_EPOCH + 10 ** 6)
+        restored.load([memoryview(column) for column in columns], BASE_EPOCH + 3000)
+        self.assertEqual(restored.window_rows(0), [row for row in reference.rows(0) if row[0] >= BASE_EPOCH + 3000])
+
+    def test_materialize_row(self):
+        tier = TierBuffer(60, 3600)
+        tier.add(BASE_EPOCH + 1, [10, 100, 1, 2, 3, 4])
+        tier.add(BASE_EPOCH + 2, [20, 300, 1, 2, 3, 4])
+        (row,) = tier.window_rows(0)
+        sample = tier.materialize_row({'node_name': 'node-1'}, row)
+        self.assertEqual((sample['node_name'], sample['count'], sample['resolution']), ('node-1', 2, 60))
+        self.assertEqual(sample['cpu_millicores'], 15)
+        self.assertEqual(sample['memory_bytes'], 200)
+        self.assertEqual(sample['stats']['cpu_millicores'], {'min': 10, 'max': 20, 'avg': 15, 'sum': 30, 'count': 2})
+
+
+class ParseTiersTest(unittest.TestCase):
+
+    def test_sorted_and_limited_by_retention(self):
+        self.assertEqual(parse_tiers('3600:604800, 600:172800,', 86400), [(600, 86400), (3600, 86400)])
+
+    def test_invalid_tier(self):
+        with self.assertRaises(ValueError):
+            parse_tiers('0:3600', 86400)
+
+
+if __name__ == '__main__':
+    unittest.main()
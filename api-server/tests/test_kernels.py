@@ -0,0 +1,108 @@
+"""
+일괄 집계 커널 테스트: 컬럼 배열/저장소 컬럼 표 집계를 파드 dict 단순 합산과 비교 (numpy 유무 모두)
+api-server 디렉터리에서 실행: python -m unittest discover tests
+"""
+
+import random
+import statistics
+import unittest
+from unittest import mock
+
+from services import kernels
+from services.compute import MetricsComputer
+from services.storage import StorageService
+
+
+def pod(rng, index, node_count=7):
+    owner = f"app{index % 5}" if index % 4 else None
+    metrics = {
+        'namespace': f"ns-{index % 3}",
+        'pod_name': f"pod-{index}",
+        'node_name': f"node-{rng.randrange(node_count)}",
+        'cpu_millicores': rng.randint(0, 4000),
+        'memory_bytes': rng.randint(0, 2 ** 40),
+        'disk_io': {'read_bytes': rng.randint(0, 10 ** 9), 'write_bytes': rng.randint(0, 10 ** 9)},
+        'network_io': {'bytes_sent': rng.randint(0, 10 ** 9), 'bytes_recv': rng.randint(0, 10 ** 9)}
+    }
+    if owner:
+        metrics.update(owner_kind='Deployment', owner_name=owner)
+    return metrics
+
+
+def reference(pods):
+    """파드 dict를 하나씩 더한 기대값"""
+    rows = kernels.metric_rows(pods)
+    columns = list(zip(*rows))
+    groups = {'namespace': {}, 'deployment': {}, 'node': {}}
+    for metrics, row in zip(pods, rows):
+        owner = metrics.get('owner_name')
+        for name, label in (('namespace', metrics['namespace']), ('node', metrics['node_name']),
+                            ('deployment', f"{metrics['namespace']}/{owner}" if owner else None)):
+            if label is not None:
+                total = groups[name].setdefault(label, [0] * len(row))
+                groups[name][label] = [a + b for a, b in zip(total, row)]
+    return {
+        'count': len(pods),
+        'sum': kernels.to_metrics([sum(column) for column in columns]),
+        'mean': kernels.to_metrics([int(statistics.mean(column)) for column in columns]),
+        'min': kernels.to_metrics([min(column) for column in columns]),
+        'max': kernels.to_metrics([max(column) for column in columns]),
+        'groups': {name: {label: kernels.to_metrics(row) for label, row in totals.items()}
+                   for name, totals in groups.items()}
+    }
+
+
+class KernelTest(unittest.TestCase):
+
+    def for_each_backend(self):
+        backends = [('numpy', kernels.np)] if kernels.available() else []
+        backends.append(('python', None))
+        for name, module in backends:
+            with self.subTest(backend=name), mock.patch.object(kernels, 'np', module):
+                yield
+
+    def test_summary_follows_storage_updates(self):
+        rng = random.Random(0)
+        service = StorageService()
+        pods = {}
+        for index in range(200):
+            pods[index] = pod(rng, index)
+        # 같은 파드 재저장(노드/디플로이먼트 이동 포함)과 제거
+        for index in rng.sample(range(200), 60):
+            pods[index] = pod(rng, index, node_count=3)
+        for metrics in pods.values():
+            service.store_pod_metrics(metrics['namespace'], metrics['pod_name'], metrics)
+        removed = rng.sample(range(200), 50)
+        with service.write_lock:
+            service._remove_latest_locked([('pod', f"{pods[index]['namespace']}/pod-{index}") for index in removed])
+        for index in removed:
+            del pods[index]
+
+        expected = reference(list(pods.values()))
+        for _ in self.for_each_backend():
+            self.assertEqual(service.get_pod_summary(), expected)
+        self.assertEqual(sorted(service.latest_pod_columns()[0]), sorted(service.latest_pods))
+        # 비어 있는 그룹 번호는 재사용되고 표에 남은 라벨은 사용 중인 것뿐
+        table = service.pod_columns.tables['node']
+        self.assertEqual(set(table.codes), set(expected['groups']['node']))
+
+    def test_dict_wrappers(self):
+        rng = random.Random(1)
+        pods = [pod(rng, index) for index in range(50)]
+        expected = reference(pods)
+        for _ in self.for_each_backend():
+            self.assertEqual(MetricsComputer.aggregate_pod_metrics(pods), expected['sum'])
+            self.assertEqual(MetricsComputer.calculate_average_metrics(pods), expected['mean'])
+            self.assertEqual(MetricsComputer.aggregate_pod_metrics([]), kernels.to_metrics([0] * kernels.FIELDS))
+            self.assertEqual(MetricsComputer.calculate_average_metrics([]), {})
+
+    def test_mean_matches_statistics_for_floats_and_large_values(self):
+        values = [{'cpu_millicores': 0.1 * index, 'memory_bytes': 2 ** 62 + index} for index in range(1, 8)]
+        for _ in self.for_each_backend():
+            averaged = MetricsComputer.calculate_average_metrics(values)
+            self.assertEqual(averaged['cpu_millicores'], int(statistics.mean(v['cpu_millicores'] for v in values)))
+            self.assertEqual(averaged['memory_bytes'], int(statistics.mean(v['memory_bytes'] for v in values)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+"""
+디스크 영속화 테스트: WAL/세그먼트에 기록한 뒤 새 StorageService로 재시작하여 복원 확인
+storage/series 모듈의 시계를 바꿔 끼워 구간 종료 후 봉인 루프가 세그먼트를 기록하도록 진행
+api-server 디렉터리에서 실행: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from config import Config
+from services.series import from_epoch, to_epoch
+from services.storage import StorageService
+
+WINDOW = 6 * 3600
+MAX_POINTS = 10_000
+
+
+def node_sample(index):
+    return {
+        'cpu_millicores': 100 + index * 7,
+        'memory_bytes': 1_000_000 + index * 4096,
+        'disk_io': {'read_bytes': index * 512, 'write_bytes': index * 1024},
+        'network_io': {'bytes_sent': index * 300, 'bytes_recv': index * 900}
+    }
+
+
+def pod_sample(index):
+    return dict(node_sample(index), namespace='default', pod_name='web-1',
+                owner_kind='Deployment', owner_name='web', summary={'cpu_millicores': {'max': index}})
+
+
+class FakeClock:
+    """time 모듈 대신 storage/series 모듈에 넣는 시계 (time()만 수동으로 진행)"""
+
+    def __init__(self, now: float):
+        self.now = now
+        self.module = SimpleNamespace(time=lambda: self.now, monotonic=time.monotonic)
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class PersistenceRestartTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        # 구간 시작 직후에서 출발하여 한 구간 안에 샘플을 쌓은 뒤 구간 종료 시점으로 진행
+        self.clock = FakeClock(time.time() // Config.SEGMENT_DURATION * Config.SEGMENT_DURATION + 1)
+        for target in ('services.storage.time', 'services.series.time'):
+            patcher = mock.patch(target, self.clock.module)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(Config, 'WAL_FSYNC_INTERVAL', 0.1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.services = []
+
+    def tearDown(self):
+        for service in self.services:
+            service.shutdown()
+
+    def start_service(self):
+        service = StorageService()
+        service.enable_persistence(self.directory)
+        self.services.append(service)
+        return service
+
+    def restart(self, service):
+        service.shutdown()
+        self.services.remove(service)
+        return self.start_service()
+
+    def store_samples(self, service, indexes, step=10):
+        # 가짜 시계 시각을 수집 시각으로 보내고 그대로 유지 (스풀 재전송과 같은 경로)
+        for index in indexes:
+            timestamp = from_epoch(self.clock.now)
+            service.store_batch_metrics('node-1', dict(node_sample(index), timestamp=timestamp),
+                                        [dict(pod_sample(index), timestamp=timestamp)], keep_timestamp=True)
+            self.clock.advance(step)
+
+    def wait_sealed(self, service, until):
+        """봉인 루프가 until까지 봉인할 때까지 대기"""
+        deadline = time.monotonic() + 5
+        while service.sealed_until < until:
+            self.assertLess(time.monotonic(), deadline, 'persistence loop did not seal the partition')
+            time.sleep(0.05)
+
+    def finish_partition(self, service):
+        """현재 구간이 끝나고 SEGMENT_SEAL_DELAY가 지난 시점으로 시계를 옮긴 뒤 봉인 대기"""
+        end = service.sealed_until + Config.SEGMENT_DURATION
+        self.clock.now = end + Config.SEGMENT_SEAL_DELAY + 1
+        self.wait_sealed(service, end)
+
+    @staticmethod
+    def timeseries(service):
+        return {
+            'node': service.get_node_timeseries('node-1', WINDOW, MAX_POINTS),
+            'pod': service.get_pod_timeseries('default', 'web-1', WINDOW, MAX_POINTS)
+        }
+
+    def test_wal_replay_restores_series_and_latest(self):
+        service = self.start_service()
+        self.store_samples(service, range(50))
+        expected = self.timeseries(service)
+        latest_pod = service.get_pod_by_name('default', 'web-1')
+
+        restored = self.restart(service)
+
+        self.assertEqual(len(expected['node']), 50)
+        self.assertEqual(self.timeseries(restored), expected)
+        self.assertEqual(restored.get_node_by_name('node-1')['cpu_millicores'], 100 + 49 * 7)
+        self.assertEqual(restored.get_pod_by_name('default', 'web-1'), latest_pod)
+        self.assertEqual([pod['pod_name'] for pod in restored.get_pods_by_deployment('default', 'web')], ['web-1'])
+
+    def test_sealed_segments_restore_series(self):
+        service = self.start_service()
+        self.store_samples(service, range(300))
+        expected = self.timeseries(service)
+        self.finish_partition(service)
+
+        self.assertTrue(os.listdir(os.path.join(self.directory, 'segments')))
+        # 봉인된 구간의 레코드만 담은 WAL 파일은 삭제되고 기록 중인 파일만 남음
+        self.assertEqual(service.wal.files(), [service.wal.path])
+
+        restored = self.restart(service)
+
+        self.assertEqual(restored.sealed_until, service.sealed_until)
+        self.assertEqual(len(expected['pod']), 300)
+        self.assertEqual(self.timeseries(restored), expected)
+        self.assertEqual(expected['pod'][-1]['summary'], {'cpu_millicores': {'max': 299}})
+
+    def test_restore_combines_segments_and_wal_tail(self):
+        service = self.start_service()
+        self.store_samples(service, range(100))
+        self.finish_partition(service)
+        # 봉인 이후 구간의 샘플은 WAL에만 있음
+        self.store_samples(service, range(100, 130))
+        expected = self.timeseries(service)
+
+        restored = self.restart(service)
+        self.assertEqual(self.timeseries(restored), expected)
+
+        # 복원 후 기록한 샘플도 다음 재시작에서 복원
+        self.store_samples(restored, range(130, 140))
+        expected = self.timeseries(restored)
+        again = self.restart(restored)
+
+        self.assertEqual(len(expected['node']), 140)
+        self.assertEqual(self.timeseries(again), expected)
+        self.assertEqual(again.get_node_by_name('node-1')['cpu_millicores'], 100 + 139 * 7)
+
+    def test_limit_eviction_seals_unsealed_samples(self):
+        service = self.start_service()
+        self.store_samples(service, range(100))
+        self.finish_partition(service)
+        self.store_samples(service, range(100, 130))
+        kind, key = victim = next(iter(service.series_activity))
+        expected = service._read_timeseries(kind, key, WINDOW, MAX_POINTS)
+
+        # 봉인 전 샘플이 남은 시리즈를 상한 초과로 제거하면 다음 봉인까지 미봉인 구간만 보관
+        service.max_series = len(service.series_activity) - 1
+        service._enforce_series_limit()
+        self.assertNotIn(key, service.series_by_kind[kind])
+        unsealed = [sample for sample in expected if to_epoch(sample['timestamp']) >= service.sealed_until]
+        self.assertTrue(unsealed)
+        self.assertEqual(len(service.retired_series[victim]), len(unsealed))
+        self.finish_partition(service)
+        self.assertEqual(service.retired_series, {})
+
+        restored = self.restart(service)
+        self.assertEqual(restored._read_timeseries(kind, key, WINDOW, MAX_POINTS), expected)
+
+    def test_restore_enforces_series_limit(self):
+        service = self.start_service()
+        self.store_samples(service, range(100))
+        self.finish_partition(service)
+        self.store_samples(service, range(100, 110))
+        total = len(service.series_activity)
+        self.assertGreater(total, 1)
+
+        with mock.patch.object(Config, 'MAX_SERIES', 1):
+            restored = self.restart(service)
+        self.assertEqual(len(restored.series_activity), 1)
+        self.assertEqual(sum(len(series) for series in restored.series_by_kind.values()), 1)
+        self.assertEqual(sum(restored.evictions['limit'].values()), total - 1)
+
+
+class PersistenceLoopTest(unittest.TestCase):
+
+    def test_loop_survives_unexpected_errors(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(Config, 'WAL_FSYNC_INTERVAL', 0.1):
+            service = StorageService()
+            service.enable_persistence(directory)
+            try:
+                retried = threading.Event()
+                calls = []
+
+                def compact(*args):
+                    calls.append(args)
+                    if len(calls) == 1:
+                        raise RuntimeError('unexpected')
+                    retried.set()
+
+                with mock.patch.object(service.segment_store, 'compact', side_effect=compact), \
+                        mock.patch('builtins.print'):
+                    # 첫 유지보수 주기에서 예외가 나도 스레드가 살아서 다음 주기에 다시 시도
+                    self.assertTrue(retried.wait(5))
+                self.assertTrue(service._persistence_thread.is_alive())
+            finally:
+                service.shutdown()
+            self.assertFalse(service._persistence_thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
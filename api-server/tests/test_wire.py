@@ -0,0 +1,296 @@
+"""
+compact 전송 형식 테스트: collector 인코더 -> API 서버 디코더 round-trip, 세션/오류 처리
+api-server 디렉터리에서 실행: python -m unittest discover tests
+"""
+
+import importlib.util
+import math
+import os
+import time
+import unittest
+from datetime import datetime, timezone
+
+from services.storage import StorageService
+from services.wire import CompactDecoder, CompactSessionError, HEADER, COMPACT_MAGIC
+
+# collector 인코더 (같은 형식 정의를 공유하므로 파일 경로로 불러옴)
+_COLLECTOR_WIRE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'collector', 'wire.py')
+_spec = importlib.util.spec_from_file_location('collector_wire', _COLLECTOR_WIRE)
+collector_wire = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(collector_wire)
+CompactEncoder = collector_wire.CompactEncoder
+
+INT32_MAX = 2 ** 31 - 1
+INT32_MIN = -2 ** 31
+NODE = 'node-1'
+TIMESTAMP = '2024-05-01T12:00:05.250000Z'
+
+
+def metrics(cpu=100, memory=2048, read=0, write=0, sent=0, recv=0, **extra):
+    return dict({
+        'timestamp': TIMESTAMP,
+        'cpu_millicores': cpu,
+        'memory_bytes': memory,
+        'disk_io': {'read_bytes': read, 'write_bytes': write},
+        'network_io': {'bytes_sent': sent, 'bytes_recv': recv}
+    }, **extra)
+
+
+def pod(name, namespace='default', **values):
+    return metrics(namespace=namespace, pod_name=name, **values)
+
+
+def values_of(sample):
+    disk_io, network_io = sample['disk_io'], sample['network_io']
+    return [sample['cpu_millicores'], sample['memory_bytes'], disk_io['read_bytes'], disk_io['write_bytes'],
+            network_io['bytes_sent'], network_io['bytes_recv']]
+
+
+def epoch_of(timestamp):
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+
+def timestamp_of(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+class CompactRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = CompactEncoder()
+        self.decoder = CompactDecoder()
+
+    def send(self, batches, commit=True):
+        body, state = self.encoder.encode(batches)
+        decoded = self.decoder.decode(NODE, body)
+        if commit:
+            self.encoder.commit(state)
+        return decoded
+
+    def assert_batch(self, decoded, batch):
+        if batch.get('node') is None:
+            self.assertIsNone(decoded.node)
+        else:
+            self.assertEqual(decoded.node.values, values_of(batch['node']))
+            self.assertEqual(decoded.node.labels, {'node_name': NODE})
+            self.assertEqual(decoded.node.epoch, epoch_of(batch['node']['timestamp']))
+        self.assertEqual(len(decoded.pods), len(batch.get('pods') or []))
+        for decoded_pod, sent_pod in zip(decoded.pods, batch.get('pods') or []):
+            self.assertEqual(decoded_pod.values, values_of(sent_pod))
+            self.assertEqual(decoded_pod.labels['node_name'], NODE)
+            for field in ('namespace', 'pod_name', 'owner_kind', 'owner_name', 'replicaset_name'):
+                self.assertEqual(decoded_pod.labels.get(field), sent_pod.get(field) or None)
+            self.assertAlmostEqual(decoded_pod.epoch, epoch_of(sent_pod['timestamp']), places=3)
+
+    def test_node_and_pods_round_trip(self):
+        batch = {
+            'node': metrics(cpu=1500, memory=8 * 2 ** 30, read=10, write=20, sent=30, recv=40),
+            'pods': [
+                pod('web-1', cpu=250, memory=128 * 2 ** 20, owner_kind='Deployment', owner_name='web',
+                    replicaset_name='web-5d9c'),
+                pod('job-1', namespace='batch', cpu=0, memory=0),
+                pod('한글-파드', cpu=1, memory=1)
+            ]
+        }
+        (decoded,) = self.send([batch])
+        self.assert_batch(decoded, batch)
+        self.assertEqual(timestamp_of(decoded.node.epoch), TIMESTAMP)
+        self.assertEqual(timestamp_of(decoded.pods[0].epoch), TIMESTAMP)
+        self.assertFalse(decoded.replayed)
+
+    def test_pods_keep_their_own_timestamps(self):
+        # 파드별 수집 시각이 노드 시각과 달라도 밀리초 단위로 유지 (앞/뒤 오프셋 모두)
+        times = ['2024-05-01T12:00:03.125000Z', '2024-05-01T12:00:09.999000Z', '2024-05-01T11:59:58Z']
+        batch = {
+            'node': metrics(),
+            'pods': [dict(pod(f'web-{index}'), timestamp=timestamp) for index, timestamp in enumerate(times)]
+        }
+        (decoded,) = self.send([batch])
+        self.assert_batch(decoded, batch)
+        self.assertEqual([timestamp_of(record.epoch) for record in decoded.pods], times)
+
+    def test_deltas_across_messages(self):
+        sequence = [
+            [pod('web-1', cpu=100, memory=1000)],
+            [pod('web-1', cpu=100, memory=1000)],  # 변경 없음 (mask 0)
+            [pod('web-1', cpu=90, memory=1000, sent=5)],  # 일부 필드만 변경, 음수 델타
+            [pod('web-1', cpu=90, memory=0, sent=5), pod('web-2', cpu=7)],  # 새 시리즈 추가
+        ]
+        for pods in sequence:
+            batch = {'node': metrics(cpu=len(pods)), 'pods': pods}
+            (decoded,) = self.send([batch])
+            self.assert_batch(decoded, batch)
+
+    def test_int32_boundary_deltas(self):
+        previous = 0
+        for value in (INT32_MAX, INT32_MAX + INT32_MAX + 1, INT32_MAX, INT32_MIN, 2 ** 61, -2 ** 61, 0):
+            batch = {'node': metrics(cpu=value, memory=value - previous, read=-value), 'pods': []}
+            (decoded,) = self.send([batch])
+            self.assert_batch(decoded, batch)
+            previous = value
+
+    def test_summary_round_trip(self):
+        summary = {
+            'cpu_millicores': {'min': 10, 'max': 900, 'mean': 123.45, 'last': 88, 'p95': 850, 'count': 30},
+            'memory_bytes': {'min': 2 ** 40, 'max': 2 ** 41, 'mean': 2.5, 'last': 2 ** 40, 'p95': 2 ** 41,
+                             'count': 1}
+        }
+        batch = {
+            'node': metrics(summary=summary),
+            'pods': [pod('web-1', summary={'memory_bytes': summary['memory_bytes']})]
+        }
+        (decoded,) = self.send([batch])
+        self.assertEqual(decoded.node.summary, summary)
+        self.assertEqual(decoded.pods[0].summary, {'memory_bytes': summary['memory_bytes']})
+        self.assertIsNone(self.send([{'node': metrics(), 'pods': []}])[0].node.summary)
+
+    def test_multiple_frames_keep_their_timestamps(self):
+        times = ['2024-05-01T12:00:00Z', '2024-05-01T12:00:05Z', '2024-05-01T12:00:10.500000Z']
+        batches = [
+            {'node': dict(metrics(cpu=1), timestamp=times[0]), 'pods': [pod('web-1', cpu=1)]},
+            {'node': dict(metrics(cpu=2), timestamp=times[1]), 'pods': []},
+            {'node': dict(metrics(cpu=3), timestamp=times[2]), 'pods': [pod('web-1', cpu=3)], 'replayed': True}
+        ]
+        decoded = self.send(batches)
+        self.assertEqual([timestamp_of(batch.node.epoch) for batch in decoded], times)
+        self.assertEqual([batch.replayed for batch in decoded], [False, False, True])
+        for decoded_batch, batch in zip(decoded, batches):
+            self.assert_batch(decoded_batch, batch)
+
+    def test_pods_only_frame(self):
+        batch = {'node': None, 'pods': [dict(pod('web-1', cpu=5), timestamp='2024-05-01T12:00:07Z')]}
+        (decoded,) = self.send([batch])
+        self.assert_batch(decoded, batch)
+        self.assertEqual(timestamp_of(decoded.pods[0].epoch), '2024-05-01T12:00:07Z')
+
+    def test_empty_frame(self):
+        (decoded,) = self.send([{'node': None, 'pods': []}])
+        self.assertEqual((decoded.node, decoded.pods), (None, []))
+
+    def test_owner_change_defines_new_series(self):
+        first = {'node': None, 'pods': [pod('web-1', cpu=1)]}
+        second = {'node': None, 'pods': [pod('web-1', cpu=2, owner_kind='Deployment', owner_name='web')]}
+        self.send([first])
+        (decoded,) = self.send([second])
+        self.assert_batch(decoded, second)
+
+    def test_series_overflow_starts_new_session(self):
+        self.send([{'node': None, 'pods': [pod('web-1')]}])
+        session_id = self.encoder.session_id
+        self.encoder.next_series_id = collector_wire.MAX_SERIES_ID
+        batch = {'node': metrics(), 'pods': [pod('web-2', cpu=2), pod('web-3', cpu=3)]}
+        (decoded,) = self.send([batch])
+        self.assertNotEqual(self.encoder.session_id, session_id)
+        self.assert_batch(decoded, batch)
+
+    def test_uncommitted_message_is_resent_with_same_sequence(self):
+        # 전송 실패로 commit하지 않으면 같은 seq/기준 값으로 다시 인코딩
+        batch = {'node': metrics(cpu=5), 'pods': [pod('web-1', cpu=5)]}
+        first, _ = self.encoder.encode([batch])
+        second, _ = self.encoder.encode([batch])
+        self.assertEqual(first, second)
+
+
+class CompactStorageTest(unittest.TestCase):
+    """compact 레코드를 시계열 컬럼에 바로 추가한 결과가 JSON 경로(store_batch_metrics)와 같은지 확인"""
+
+    def test_matches_json_path(self):
+        now = time.time()
+        encoder, decoder = CompactEncoder(), CompactDecoder()
+        compact, json_path = StorageService(), StorageService()
+        for step in range(3):
+            base = now - 60 + step * 10
+            batch = {
+                'node': dict(metrics(cpu=100 + step, read=step), timestamp=timestamp_of(base)),
+                'pods': [
+                    dict(pod('web-1', cpu=10 * step, owner_kind='Deployment', owner_name='web',
+                             summary={'cpu_millicores': {'min': 1, 'max': 9, 'mean': 4.5, 'last': 2, 'p95': 8,
+                                                         'count': 3}}),
+                         timestamp=timestamp_of(base + 1.5)),
+                    dict(pod('job-1', namespace='batch', memory=step), timestamp=timestamp_of(base - 2))
+                ]
+            }
+            body, state = encoder.encode([batch])
+            encoder.commit(state)
+            (decoded,) = decoder.decode(NODE, body)
+
+            self.assertEqual(compact.store_compact_batch(NODE, decoded),
+                             json_path.store_batch_metrics(NODE, dict(batch['node']),
+                                                           [dict(item, node_name=NODE) for item in batch['pods']]))
+
+        for service in (compact, json_path):
+            self.assertEqual(len(service.get_pod_timeseries('default', 'web-1', 3600)), 3)
+        self.assertEqual(compact.get_node_timeseries(NODE, 3600), json_path.get_node_timeseries(NODE, 3600))
+        for namespace, name in (('default', 'web-1'), ('batch', 'job-1')):
+            self.assertEqual(compact.get_pod_timeseries(namespace, name, 3600),
+                             json_path.get_pod_timeseries(namespace, name, 3600))
+            self.assertEqual(compact.get_pod_by_name(namespace, name), json_path.get_pod_by_name(namespace, name))
+        self.assertEqual(compact.get_node_by_name(NODE), json_path.get_node_by_name(NODE))
+        self.assertEqual(compact.get_pods_by_deployment('default', 'web'),
+                         json_path.get_pods_by_deployment('default', 'web'))
+
+
+class CompactErrorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = CompactEncoder()
+        self.decoder = CompactDecoder()
+        self.batch = {'node': metrics(), 'pods': [pod('web-1')]}
+
+    def test_unknown_session_requires_reset(self):
+        self.encoder.seq = 3
+        body, _ = self.encoder.encode([self.batch])
+        with self.assertRaises(CompactSessionError):
+            self.decoder.decode(NODE, body)
+
+    def test_sequence_gap(self):
+        body, state = self.encoder.encode([self.batch])
+        self.decoder.decode(NODE, body)
+        self.encoder.commit(state)
+        self.encoder.seq += 1
+        body, _ = self.encoder.encode([self.batch])
+        with self.assertRaises(CompactSessionError):
+            self.decoder.decode(NODE, body)
+
+    def test_sessions_are_per_node(self):
+        body, _ = self.encoder.encode([self.batch])
+        self.decoder.decode(NODE, body)
+        (decoded,) = self.decoder.decode('node-2', body)
+        self.assertEqual([record.labels['node_name'] for record in decoded.pods], ['node-2'])
+
+    def test_malformed_messages(self):
+        body, _ = self.encoder.encode([self.batch])
+        for data in (b'', body[:HEADER.size - 1], b'XXXX' + body[4:], body[:-1], body + b'\0'):
+            with self.subTest(data=data[:8]):
+                with self.assertRaises(ValueError):
+                    CompactDecoder().decode(NODE, data)
+
+    def test_failed_decode_keeps_session_state(self):
+        body, state = self.encoder.encode([self.batch])
+        self.decoder.decode(NODE, body)
+        self.encoder.commit(state)
+
+        changed = {'node': metrics(cpu=999), 'pods': [pod('web-1', cpu=999), pod('web-2', cpu=1)]}
+        body, state = self.encoder.encode([changed])
+        with self.assertRaises(ValueError):
+            self.decoder.decode(NODE, body[:-2])
+        # 잘린 메시지는 반영되지 않으므로 같은 메시지를 다시 보내면 정상 디코딩
+        (decoded,) = self.decoder.decode(NODE, body)
+        self.assertEqual([record.values[0] for record in decoded.pods], [999, 1])
+
+    def test_invalid_frame_time_decodes_as_nan(self):
+        body, _ = self.encoder.encode([{'node': dict(metrics(), timestamp='2024-05-01T12:00:00Z'), 'pods': []}])
+        frame_time = collector_wire.FRAME.pack(
+            datetime.fromisoformat('2024-05-01T12:00:00+00:00').timestamp(), 0x01, 0)
+        self.assertIn(frame_time, body)
+        body = body.replace(frame_time, collector_wire.FRAME.pack(float('nan'), 0x01, 0))
+        (decoded,) = self.decoder.decode(NODE, body)
+        self.assertTrue(math.isnan(decoded.node.epoch))
+
+    def test_header_magic(self):
+        body, _ = self.encoder.encode([self.batch])
+        self.assertEqual(body[:4], COMPACT_MAGIC)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import re
+import time
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# kubepods 최상위 디렉토리 (systemd 드라이버 / cgroupfs 드라이버)
+KUBEPODS_DIRS = ('kubepods.slice', 'kubepods')
+
+# QoS 클래스 하위 디렉토리 (Guaranteed 파드는 kubepods 바로 아래)
+QOS_DIRS = ('kubepods-burstable.slice', 'kubepods-besteffort.slice', 'burstable', 'besteffort')
+
+# 파드 cgroup 디렉토리 이름
+#   systemd:  kubepods-pod<uid>.slice, kubepods-burstable-pod<uid>.slice (uid의 '-'는 '_')
+#   cgroupfs: pod<uid>
+# 새 파드는 아래 후보 경로(kubepods 기준, QoS 클래스 Guaranteed/Burstable/BestEffort 순)만 확인
+#   {uid}: cgroupfs 표기 uid, {slice_uid}: systemd 표기 uid ('-' -> '_')
+POD_DIR_CANDIDATES = (
+    'kubepods.slice/kubepods-pod{slice_uid}.slice',
+    'kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod{slice_uid}.slice',
+    'kubepods.slice/kubepods-besteffort.slice/kubepods-besteffort-pod{slice_uid}.slice',
+    'kubepods/pod{uid}',
+    'kubepods/burstable/pod{uid}',
+    'kubepods/besteffort/pod{uid}',
+)
+POD_DIR_PATTERN = re.compile(r'(?:^|-)pod([0-9a-fA-F]{8}[-_][0-9a-fA-F]{4}[-_][0-9a-fA-F]{4}[-_][0-9a-fA-F]{4}[-_][0-9a-fA-F]{12})(?:\.slice)?$')
+
+class CgroupResolver:
+    """
+    파드 UID -> cgroup 디렉토리 인덱스 (cgroup v1/v2, systemd/cgroupfs 드라이버 지원)
+    - 처음 한 번 kubepods 계층을 os.scandir로 스캔하여 인덱스 구성
+    - 이후 새 파드는 QoS 클래스별 후보 경로만 확인 (전체 재스캔 없음), 사라진 파드는 인덱스에서 제거
+    """
+
+    # cgroup v1 컨트롤러별 마운트 디렉토리 후보
+    V1_CONTROLLERS = {
+        'memory': ('memory',),
+        'cpu': ('cpu,cpuacct', 'cpuacct,cpu', 'cpuacct'),
+        'io': ('blkio',),
+    }
+
+    def __init__(self, root: str = CGROUP_ROOT, rescan_interval: float = 30.0):
+        self.root = root
+        self.rescan_interval = rescan_interval  # 못 찾은 파드의 후보 경로 재확인 최소 간격
+        self.last_scan_time = 0.0
+        self.last_probe_time = 0.0
+        self.version = 2 if os.path.exists(os.path.join(root, 'cgroup.controllers')) else 1
+        self.index: Dict[str, str] = {}  # pod uid -> kubepods 기준 상대 경로
+        self._unresolved: Set[str] = set()  # 마지막 스캔에서도 찾지 못한 uid
+
+        # 컨트롤러별 루트 (v2는 단일 계층)
+        self.controller_roots = {}
+        for controller, candidates in self.V1_CONTROLLERS.items():
+            if self.version == 2:
+                self.controller_roots[controller] = root
+                continue
+            for candidate in candidates:
+                path = os.path.join(root, candidate)
+                if os.path.isdir(path):
+                    self.controller_roots[controller] = path
+                    break
+
+        logger.info(f"cgroup v{self.version} 감지 ({root})")
+
+    @property
+    def scan_root(self) -> Optional[str]:
+        """파드 디렉토리 스캔 기준 계층 (v1은 memory 컨트롤러)"""
+        return self.controller_roots.get('memory')
+
+    @staticmethod
+    def _normalize_uid(uid: str) -> str:
+        return uid.replace('_', '-').lower()
+
+    def scan(self) -> Dict[str, str]:
+        """kubepods 계층 전체 스캔하여 uid -> 상대 경로 인덱스 재구성"""
+        index = {}
+        scan_root = self.scan_root
+        if not scan_root:
+            return index
+
+        for kubepods in KUBEPODS_DIRS:
+            kubepods_path = os.path.join(scan_root, kubepods)
+            try:
+                with os.scandir(kubepods_path) as kubepods_entries:
+                    entries = list(kubepods_entries)
+            except OSError:
+                continue
+
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if entry.name in QOS_DIRS:
+                    try:
+                        with os.scandir(entry.path) as qos_entries:
+                            for qos_entry in qos_entries:
+                                self._index_pod_dir(index, qos_entry, f"{kubepods}/{entry.name}")
+                    except OSError:
+                        continue
+                else:
+                    self._index_pod_dir(index, entry, kubepods)
+
+        self.index = index
+        self.last_scan_time = time.monotonic()
+        return index
+
+    def _index_pod_dir(self, index: Dict[str, str], entry, parent: str):
+        """파드 디렉토리면 인덱스에 추가"""
+        match = POD_DIR_PATTERN.search(entry.name)
+        if match and entry.is_dir(follow_symlinks=False):
+            index[self._normalize_uid(match.group(1))] = f"{parent}/{entry.name}"
+
+    def probe(self, pod_uid: str) -> Optional[str]:
+        """새 파드의 QoS 클래스별 후보 경로만 확인하여 찾으면 인덱스에 추가 (kubepods 기준 상대 경로 반환)"""
+        scan_root = self.scan_root
+        if not scan_root:
+            return None
+        uid = self._normalize_uid(pod_uid)
+        for candidate in POD_DIR_CANDIDATES:
+            relative = candidate.format(uid=uid, slice_uid=uid.replace('-', '_'))
+            if os.path.isdir(os.path.join(scan_root, relative)):
+                self.index[uid] = relative
+                return relative
+        return None
+
+    def resolve(self, pod_uids: Iterable[str]) -> Dict[str, str]:
+        """
+        현재 파드 집합의 uid -> cgroup 디렉토리(memory/통합 계층) 반환
+        첫 호출에서만 전체 스캔하고, 인덱스에 없는 새 파드는 후보 경로만 확인하며, 사라진 파드는 제거
+        """
+        wanted = {self._normalize_uid(uid): uid for uid in pod_uids}
+
+        if not self.last_scan_time:
+            self.scan()
+        missing = set(wanted) - set(self.index)
+        # 이전에 못 찾은 uid는 rescan_interval마다만 다시 확인
+        # (cgroup이 파드 Running 전환보다 늦게 생성되는 경우를 위해 주기적으로 재시도)
+        now = time.monotonic()
+        retry = now - self.last_probe_time >= self.rescan_interval
+        for uid in missing:
+            if uid not in self._unresolved or retry:
+                self.probe(uid)
+        if retry:
+            self.last_probe_time = now
+        self._unresolved = missing - set(self.index)
+
+        # 사라진 파드 정리
+        for uid in set(self.index) - set(wanted):
+            del self.index[uid]
+
+        return {
+            original: self.path(uid)
+            for uid, original in wanted.items()
+            if uid in self.index
+        }
+
+    def path(self, pod_uid: str, controller: str = 'memory') -> Optional[str]:
+        """파드의 컨트롤러별 cgroup 절대 경로"""
+        relative = self.index.get(self._normalize_uid(pod_uid))
+        controller_root = self.controller_roots.get(controller)
+        if relative is None or controller_root is None:
+            return None
+        return os.path.join(controller_root, relative)
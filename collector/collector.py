@@ -2,15 +2,23 @@
 
 import time
 import json
+import uuid
 import logging
-import requests
 from datetime import datetime
-from threading import Thread, Event
-from kubernetes import client, config
-from typing import Dict, List, Optional
+from threading import Event, Lock
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 
 from config import CollectorConfig
 from utils import ResourceParser, PodResourceParser, format_bytes, format_millicores
+from transport import MetricsTransport
+from pod_cache import PodInfo, PodInformer, KubernetesPodSource, RestPodSource
+from kube_client import KubeClient
+from cgroups import CgroupResolver
+from spool import MetricsSpool
+from scheduler import Scheduler
+from sampler import HighFrequencySampler
+from telemetry import telemetry, TelemetryServer, read_rss_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -25,33 +33,100 @@ class ResourceCollector:
         self.prev_cpu_stats = {}
         self.prev_disk_stats = {}
         self.prev_network_stats = {}
-        self.last_collection_time = time.time()
+        self.prev_pod_counters = {}  # pod uid -> 이전 누적 카운터 (CPU/디스크/네트워크)
+        self.last_collection_time = time.monotonic()
+        
+        # 파드 샘플링 워커 풀 (느린 cgroup/overlay 읽기가 전체 주기를 막지 않도록)
+        self.pod_sampling_pool = ThreadPoolExecutor(max_workers=self.config.POD_SAMPLING_WORKERS,
+                                                    thread_name_prefix='pod-sample')
+        self.pod_sampling_lock = Lock()
+        self.pod_sampling_inflight = set()  # 샘플링 진행 중인 pod uid
+        self.last_pod_sweep = (0.0, 0)  # (소요 시간 초, 파드 수)
+        
+        # 수집 단계 -> 전송 단계 대기열
+        self.outbox_lock = Lock()
+        self.pending_nodes: List[Dict] = []
+        self.pending_pod_sweeps: List[List[Dict]] = []
+        self.scheduler: Optional[Scheduler] = None
+        
+        # pull 모드: API 서버가 가져갈 최신 수집 결과 (노드/파드별 갱신 순번 포함)
+        self.snapshot_lock = Lock()
+        self.snapshot = {
+            'node_name': self.config.NODE_NAME,
+            'instance': uuid.uuid4().hex,  # 재시작 시 순번 초기화를 서버가 감지하도록
+            'node_seq': 0, 'node': None,
+            'pod_seq': 0, 'pods': []
+        }
+        
+        # API 서버 전송 계층 (커넥션 풀 재사용)
+        self.transport = MetricsTransport(self.config)
+        
+        # 전송 실패 메트릭 스풀 (서버 복구 후 순서대로 재전송)
+        self.spool = MetricsSpool(
+            self.config.SPOOL_DIR,
+            segment_bytes=self.config.SPOOL_SEGMENT_BYTES,
+            max_bytes=self.config.SPOOL_MAX_BYTES,
+            max_age_seconds=self.config.SPOOL_MAX_AGE_SECONDS
+        )
         
         # Kubernetes 클라이언트 초기화
         self._init_kubernetes_client()
         
+        # collector 자체 성능 지표 (/metrics)
+        self.telemetry_server: Optional[TelemetryServer] = None
+        telemetry.register_gauge('spool_pending_bytes', 'Bytes waiting in the send spool', self.spool.pending_bytes)
+        telemetry.register_gauge('spool_dropped_records', 'Spool records dropped by size/age limits',
+                                 lambda: self.spool.dropped_records)
+        telemetry.register_gauge('tracked_pods', 'Pods with cgroup counters tracked', lambda: len(self.prev_pod_counters))
+        telemetry.register_gauge('pod_sweep_seconds', 'Duration of the last pod sampling sweep',
+                                 lambda: self.last_pod_sweep[0])
+        telemetry.register_gauge('pod_sweep_pods', 'Pods sampled in the last sweep', lambda: self.last_pod_sweep[1])
+        telemetry.register_gauge('resident_memory_bytes', 'Collector resident set size', read_rss_bytes)
+        
     def _init_kubernetes_client(self):
         """Kubernetes 클라이언트 초기화"""
+        # 클러스터 내부에서 실행 중인 경우: 서비스 어카운트 토큰/CA로 경량 REST 클라이언트 사용
+        self.kube_client = KubeClient.in_cluster(timeout=self.config.API_TIMEOUT)
+        if self.kube_client is not None:
+            logger.info("클러스터 내부 config 로드 완료 (경량 REST 클라이언트)")
+            pod_source = RestPodSource(self.kube_client, self.config.NODE_NAME)
+        else:
+            pod_source = self._init_fallback_pod_source()
+        
+        # 파드 UID -> cgroup 경로 인덱스 (cgroup v1/v2)
+        self.cgroup_resolver = CgroupResolver(self.config.CGROUP_ROOT)
+        
+        # 노드 범위 파드 list+watch 캐시
+        self.pod_informer = PodInformer(
+            pod_source,
+            watch_timeout=self.config.POD_WATCH_TIMEOUT,
+            cgroup_resolver=self.cgroup_resolver
+        )
+        
+        # 수집 주기 사이 고빈도 샘플링 (min/max/mean/last/p95 요약)
+        self.sampler = None
+        if self.config.SAMPLE_INTERVAL > 0:
+            self.sampler = HighFrequencySampler(
+                self.cgroup_resolver.version,
+                sample_pods=self.config.ENABLE_POD_METRICS and self.config.ENABLE_POD_SAMPLING
+            )
+    
+    def _init_fallback_pod_source(self) -> KubernetesPodSource:
+        """로컬 개발 환경: kubernetes 패키지로 kube config 로드 (필요할 때만 import)"""
         try:
-            # 클러스터 내부에서 실행 중인 경우
-            config.load_incluster_config()
-            logger.info("클러스터 내부 config 로드 완료")
-        except Exception:
-            try:
-                # 로컬 개발 환경
-                config.load_kube_config()
-                logger.info("로컬 kube config 로드 완료")
-            except Exception as e:
-                logger.error(f"Kubernetes config 로드 실패: {e}")
-                raise
-        
-        self.k8s_core_v1 = client.CoreV1Api()
-        self.k8s_apps_v1 = client.AppsV1Api()
+            from kubernetes import client, config
+            config.load_kube_config()
+            logger.info("로컬 kube config 로드 완료")
+        except Exception as e:
+            logger.error(f"Kubernetes config 로드 실패: {e}")
+            raise
+        
+        return KubernetesPodSource(client.CoreV1Api(), client.AppsV1Api(), self.config.NODE_NAME)
     
     def collect_node_metrics(self) -> Optional[Dict]:
         """노드 리소스 메트릭 수집"""
         try:
-            current_time = time.time()
+            current_time = time.monotonic()
             time_delta = current_time - self.last_collection_time
             
             # CPU 통계 수집
@@ -101,6 +176,11 @@ class ResourceCollector:
                 'network_io': network_io
             }
             
+            if self.sampler:
+                summary = self.sampler.take_node_summary()
+                if summary:
+                    metrics['summary'] = summary
+            
             logger.info(f"노드 메트릭 수집 완료: CPU={format_millicores(cpu_millicores)}, "
                        f"Memory={format_bytes(memory_bytes)}")
             
@@ -110,168 +190,388 @@ class ResourceCollector:
             logger.error(f"노드 메트릭 수집 실패: {e}")
             return None
     
+    def _sample_pod(self, pod: PodInfo, prev_counters: Optional[Dict]) -> Tuple[Dict, Optional[Dict]]:
+        """
+        파드 1개 샘플링 (워커 스레드에서 실행, 공유 상태를 수정하지 않음)
+        Returns: (파드 메트릭, 이번 누적 카운터 또는 None)
+        """
+        # 기본 파드 정보
+        pod_metric = {
+            'namespace': pod.namespace,
+            'pod_name': pod.name,
+            'node_name': self.config.NODE_NAME,
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'cpu_millicores': 0,
+            'memory_bytes': 0,
+            'disk_io': {'read_bytes': 0, 'write_bytes': 0},
+            'network_io': {'bytes_sent': 0, 'bytes_recv': 0}
+        }
+        
+        # 소유자 정보 (API 서버의 디플로이먼트 집계 기준)
+        if pod.owner_kind:
+            pod_metric['owner_kind'] = pod.owner_kind
+            pod_metric['owner_name'] = pod.owner_name
+            if pod.replicaset:
+                pod_metric['replicaset_name'] = pod.replicaset
+        
+        # 실제 파드 리소스 수집 (cgroup 누적 카운터 기반)
+        try:
+            # cgroup 경로는 인덱스에서 조회 (파드 변경 시에만 탐색)
+            cgroup_path = pod.cgroup_path
+            if not cgroup_path:
+                return pod_metric, None
+            
+            curr_counters = PodResourceParser.read_pod_counters(
+                cgroup_path,
+                self.cgroup_resolver.path(pod.uid, 'cpu'),
+                self.cgroup_resolver.path(pod.uid, 'io'),
+                self.cgroup_resolver.version,
+                pid=prev_counters.get('pid') if prev_counters else None,
+                collect_disk_io=self.config.ENABLE_DISK_IO,
+                # hostNetwork 파드는 노드 netns를 공유하므로 제외
+                collect_network_io=self.config.ENABLE_NETWORK_IO and not pod.host_network
+            )
+            curr_counters['time'] = time.monotonic()
+            
+            time_delta = curr_counters['time'] - prev_counters['time'] if prev_counters else 0
+            usage = PodResourceParser.calculate_pod_usage(prev_counters, curr_counters, time_delta)
+            
+            pod_metric['memory_bytes'] = curr_counters['memory_bytes']
+            pod_metric['cpu_millicores'] = usage['cpu_millicores']
+            pod_metric['disk_io'] = usage['disk_io']
+            pod_metric['network_io'] = usage['network_io']
+            return pod_metric, curr_counters
+            
+        except Exception as e:
+            logger.warning(f"파드 {pod.name} 실제 리소스 수집 실패, 기본값 사용: {e}")
+            return pod_metric, None
+    
+    def _run_pod_sweep(self, pods: List[PodInfo]) -> Dict[str, Tuple[Dict, Optional[Dict]]]:
+        """
+        파드 샘플링을 워커 풀에서 동시 실행
+        시작 후 POD_SAMPLE_TIMEOUT 안에 끝나지 않은 파드는 이번 주기에서 제외 (느린 파드가 전체를 막지 않음)
+        Returns: uid -> (파드 메트릭, 누적 카운터)
+        """
+        results = {}
+        started: Dict[str, float] = {}  # uid -> 샘플링 시작 시각 (워커에서 기록)
+        
+        def sample(pod):
+            started[pod.uid] = time.monotonic()
+            try:
+                return self._sample_pod(pod, self.prev_pod_counters.get(pod.uid))
+            finally:
+                with self.pod_sampling_lock:
+                    self.pod_sampling_inflight.discard(pod.uid)
+        
+        futures = {}
+        with self.pod_sampling_lock:
+            for pod in pods:
+                # 이전 주기에서 시간 초과된 샘플링이 아직 진행 중이면 중복 제출하지 않음
+                if pod.uid in self.pod_sampling_inflight:
+                    logger.warning(f"파드 {pod.name} 이전 샘플링이 아직 진행 중, 이번 주기 건너뜀")
+                    continue
+                self.pod_sampling_inflight.add(pod.uid)
+                futures[self.pod_sampling_pool.submit(sample, pod)] = pod
+        
+        timeout = self.config.POD_SAMPLE_TIMEOUT
+        # 워커가 모두 멈춘 경우에도 수집 주기 안에는 끝나도록 전체 상한
+        sweep_deadline = time.monotonic() + self.config.POD_METRICS_INTERVAL * 0.8
+        pending = set(futures)
+        timed_out = []
+        
+        while pending:
+            done, pending = wait(pending, timeout=min(timeout, 0.1))
+            for future in done:
+                pod = futures[future]
+                try:
+                    results[pod.uid] = future.result()
+                except Exception as e:
+                    logger.warning(f"파드 {pod.name} 메트릭 수집 실패: {e}")
+            
+            now = time.monotonic()
+            for future in list(pending):
+                pod = futures[future]
+                began = started.get(pod.uid)
+                if now >= sweep_deadline or (began is not None and now - began > timeout):
+                    # 진행 중인 파일 읽기는 중단할 수 없으므로 결과만 버림
+                    pending.discard(future)
+                    if future.cancel():
+                        # 시작 전 취소된 작업은 finally가 실행되지 않음
+                        with self.pod_sampling_lock:
+                            self.pod_sampling_inflight.discard(pod.uid)
+                    timed_out.append(pod.name)
+        
+        if timed_out:
+            telemetry.increment('pod_sample_timeouts', len(timed_out))
+            logger.warning(f"파드 {len(timed_out)}개 샘플링 시간 초과 ({timeout}s): {', '.join(timed_out[:10])}")
+        return results
+    
     def collect_pod_metrics(self) -> List[Dict]:
         """파드 리소스 메트릭 수집"""
         try:
+            sweep_started = time.perf_counter()
             pod_metrics = []
             
-            # 현재 노드의 파드 목록 가져오기
-            pods = self.k8s_core_v1.list_pod_for_all_namespaces(
-                field_selector=f"spec.nodeName={self.config.NODE_NAME}"
-            )
+            # 파드 캐시가 아직 동기화되지 않았으면 이번 주기는 건너뜀 (apiserver 대기 없음)
+            if not self.pod_informer.synced.is_set():
+                logger.info("파드 캐시 동기화 대기 중, 파드 메트릭 수집 건너뜀")
+                return []
             
-            for pod in pods.items:
-                # 제외할 네임스페이스 필터링
-                if pod.metadata.namespace in self.config.EXCLUDE_NAMESPACES:
-                    continue
-                
-                # 실행 중인 파드만 수집
-                if pod.status.phase != 'Running':
+            # 현재 노드의 실행 중인 파드 목록 (메모리 인덱스)
+            running_pods = self.pod_informer.running_pods()
+            
+            # 사라진 파드의 이전 카운터 정리
+            running_uids = {pod.uid for pod in running_pods}
+            for uid in list(self.prev_pod_counters):
+                if uid not in running_uids:
+                    del self.prev_pod_counters[uid]
+            
+            # 제외할 네임스페이스 필터링
+            pods = [pod for pod in running_pods if pod.namespace not in self.config.EXCLUDE_NAMESPACES]
+            results = self._run_pod_sweep(pods)
+            
+            sample_targets = []  # 고빈도 샘플링 대상 (uid, memory 경로, cpu 경로)
+            
+            # 결과 반영은 수집 스레드에서 파드 목록 순서대로
+            for pod in pods:
+                if pod.uid not in results:
                     continue
+                pod_metric, curr_counters = results[pod.uid]
                 
-                try:
-                    # 기본 파드 정보
-                    pod_metric = {
-                        'namespace': pod.metadata.namespace,
-                        'pod_name': pod.metadata.name,
-                        'node_name': self.config.NODE_NAME,
-                        'timestamp': datetime.utcnow().isoformat() + 'Z',
-                        'cpu_millicores': 0,
-                        'memory_bytes': 0,
-                        'disk_io': {'read_bytes': 0, 'write_bytes': 0},
-                        'network_io': {'bytes_sent': 0, 'bytes_recv': 0}
-                    }
-                    
-                    # 실제 파드 리소스 수집 (cgroup 기반)
-                    try:
-                        # 파드 UID와 컨테이너 ID 추출
-                        pod_uid = pod.metadata.uid.replace('-', '_')
-                        
-                        # 첫 번째 컨테이너의 리소스 사용량 수집
-                        if pod.status.container_statuses:
-                            container_id = pod.status.container_statuses[0].container_id
-                            if container_id and container_id.startswith('containerd://'):
-                                container_id = container_id.replace('containerd://', '')[:12]
-                                
-                                # cgroup 경로 찾기
-                                cgroup_path = PodResourceParser.get_pod_cgroup_path(pod_uid, container_id)
-                                
-                                if cgroup_path:
-                                    # 실제 메모리 사용량
-                                    pod_metric['memory_bytes'] = PodResourceParser.parse_pod_memory_usage(cgroup_path)
-                                    
-                                    # CPU 사용량은 노드 전체 대비 비율로 추정
-                                    # (정확한 파드별 CPU는 더 복잡한 구현 필요)
-                                    pod_metric['cpu_millicores'] = max(10, int(pod_metric['memory_bytes'] / (1024 * 1024 * 10)))  # 메모리 기반 추정
-                                
-                        # 디스크/네트워크 I/O는 노드 레벨에서 파드별 분할 (간단한 추정)
-                        # 실제로는 더 정교한 수집이 필요하지만, 현재는 기본값 사용
-                        pod_metric['disk_io']['read_bytes'] = 0
-                        pod_metric['disk_io']['write_bytes'] = 0
-                        pod_metric['network_io']['bytes_sent'] = 0
-                        pod_metric['network_io']['bytes_recv'] = 0
-                        
-                    except Exception as e:
-                        logger.warning(f"파드 {pod.metadata.name} 실제 리소스 수집 실패, 기본값 사용: {e}")
-                        # 실패 시 기본값
-                        pod_metric['cpu_millicores'] = 0
-                        pod_metric['memory_bytes'] = 0
+                if curr_counters is not None:
+                    self.prev_pod_counters[pod.uid] = curr_counters
                     
-                    pod_metrics.append(pod_metric)
-                    
-                except Exception as e:
-                    logger.warning(f"파드 {pod.metadata.name} 메트릭 수집 실패: {e}")
-                    continue
+                    if self.sampler:
+                        summary = self.sampler.take_pod_summary(pod.uid)
+                        if summary:
+                            pod_metric['summary'] = summary
+                        sample_targets.append((pod.uid, pod.cgroup_path, self.cgroup_resolver.path(pod.uid, 'cpu')))
+                
+                pod_metrics.append(pod_metric)
+            
+            if self.sampler:
+                self.sampler.update_pods(sample_targets)
             
-            logger.info(f"파드 메트릭 수집 완료: {len(pod_metrics)}개 파드")
+            self.last_pod_sweep = (time.perf_counter() - sweep_started, len(pods))
+            logger.info(f"파드 메트릭 수집 완료: {len(pod_metrics)}/{len(pods)}개 파드 "
+                        f"(sweep {self.last_pod_sweep[0] * 1000:.1f}ms, 워커 {self.config.POD_SAMPLING_WORKERS}개)")
             return pod_metrics
             
         except Exception as e:
             logger.error(f"파드 메트릭 수집 실패: {e}")
             return []
     
-    def send_metrics_to_api_server(self, metrics_data: Dict, endpoint: str) -> bool:
-        """API 서버로 메트릭 전송"""
+    def send_metrics_to_api_server(self, metrics_data, endpoint: str, compact: bool = False) -> bool:
+        """API 서버로 메트릭 전송 (compact: 배치 목록을 compact 바이너리 형식으로 전송)"""
         if self.config.DRY_RUN:
             logger.info(f"[DRY RUN] {endpoint}로 메트릭 전송: {json.dumps(metrics_data, indent=2)}")
             return True
         
         try:
-            url = f"{self.config.API_SERVER_URL}{endpoint}"
+            with telemetry.timed('send'):
+                if compact:
+                    response = self.transport.post_compact(endpoint, metrics_data)
+                else:
+                    response = self.transport.post(endpoint, metrics_data)
+            if response is None:
+                telemetry.increment('send_failures')
+                return False
             
-            for attempt in range(self.config.API_RETRY_COUNT):
-                try:
-                    response = requests.post(
-                        url,
-                        json=metrics_data,
-                        timeout=self.config.API_TIMEOUT,
-                        headers={'Content-Type': 'application/json'}
-                    )
-                    
-                    if response.status_code in [200, 201]:
-                        logger.debug(f"메트릭 전송 성공: {endpoint}")
-                        return True
-                    else:
-                        logger.warning(f"메트릭 전송 실패 (HTTP {response.status_code}): {response.text}")
-                        
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"메트릭 전송 시도 {attempt + 1} 실패: {e}")
-                    if attempt < self.config.API_RETRY_COUNT - 1:
-                        time.sleep(self.config.API_RETRY_DELAY)
+            # 배치 항목별 실패 로그 (검증 실패 항목은 재전송해도 실패하므로 저장하지 않음)
+            if response.status_code == 207:
+                result = response.json()
+                for batch_result in result.get('batches', [result]):
+                    self._log_batch_failures(batch_result)
             
-            return False
+            return True
             
         except Exception as e:
             logger.error(f"메트릭 전송 중 오류: {e}")
             return False
     
-    def save_metrics_locally(self, metrics_data: Dict, metric_type: str):
-        """로컬에 메트릭 저장 (API 서버 전송 실패 시 대안)"""
-        try:
-            filename = f"/tmp/metrics_{metric_type}_{int(time.time())}.json"
-            with open(filename, 'w') as f:
-                json.dump(metrics_data, f, indent=2)
-            logger.info(f"메트릭을 로컬에 저장: {filename}")
-        except Exception as e:
-            logger.error(f"로컬 메트릭 저장 실패: {e}")
+    @staticmethod
+    def _log_batch_failures(result: Dict):
+        """배치 응답의 항목별 실패 로그"""
+        node_result = result.get('node')
+        if node_result and node_result.get('status') != 'stored':
+            logger.warning(f"노드 메트릭 저장 실패: {node_result.get('error')}")
+        for pod_result in result.get('pods', []):
+            if pod_result.get('status') != 'stored':
+                logger.warning(f"파드 {pod_result.get('namespace')}/{pod_result.get('pod_name')} "
+                               f"메트릭 저장 실패: {pod_result.get('error')}")
+    
+    def deliver_metrics(self, metrics_data, endpoint: str, compact: bool = False) -> bool:
+        """
+        메트릭 전송, 실패 시 스풀에 저장
+        스풀에 재전송 대기 중인 데이터가 있으면 순서 보장을 위해 바로 스풀에 추가
+        """
+        # 배치 배열은 배치별로 나누어 스풀에 저장
+        records = metrics_data if isinstance(metrics_data, list) else [metrics_data]
+        
+        if not self.config.DRY_RUN and self.spool.has_backlog():
+            for record in records:
+                self.spool.append(endpoint, record)
+            return False
+        
+        if self.send_metrics_to_api_server(metrics_data, endpoint, compact=compact):
+            return True
+        
+        logger.info(f"전송 실패 메트릭을 스풀에 저장: {endpoint}")
+        for record in records:
+            self.spool.append(endpoint, record)
+        return False
+    
+    def send_batches_to_api_server(self, batches: List[Dict]) -> bool:
+        """배치(노드 + 파드 메트릭) 목록을 배치 엔드포인트로 1회 전송"""
+        endpoint = f"/api/nodes/{self.config.NODE_NAME}/batch"
+        
+        if self.config.DRY_RUN:
+            pod_count = sum(len(batch['pods']) for batch in batches)
+            logger.info(f"[DRY RUN] {endpoint}로 배치 {len(batches)}개 전송: 파드 {pod_count}개")
+            return True
+        
+        if self.transport.compact_encoder is not None:
+            # compact 형식은 배치 목록 그대로 인코딩 (실패 시 스풀에는 JSON으로 저장)
+            success = self.deliver_metrics(batches, endpoint, compact=True)
+        else:
+            success = self.deliver_metrics(batches[0] if len(batches) == 1 else batches, endpoint)
+        if success:
+            logger.debug(f"배치 전송 완료: {len(batches)}개")
+        return success
+    
+    def _replay_records(self, records: List[Dict]) -> bool:
+        """스풀 레코드 재전송 (같은 배치 엔드포인트의 연속 레코드는 배열로 묶어 1회 전송)"""
+        groups = []
+        for record in records:
+            payload = record['p']
+            payload['replayed'] = True
+            if groups and groups[-1][0] == record['e']:
+                groups[-1][1].append(payload)
+            else:
+                groups.append((record['e'], [payload]))
+        
+        for endpoint, payloads in groups:
+            if endpoint.endswith('/batch'):
+                if not self.send_metrics_to_api_server(payloads, endpoint):
+                    return False
+            else:
+                for payload in payloads:
+                    if not self.send_metrics_to_api_server(payload, endpoint):
+                        return False
+        return True
+    
+    def drain_spool(self):
+        """스풀 백로그를 순서대로 배치 재전송 (서버 미복구 시 다음 주기에 재시도)"""
+        while not self.shutdown_event.is_set():
+            records, position = self.spool.read_batch(
+                self.config.SPOOL_REPLAY_BATCH, self.config.SPOOL_REPLAY_MAX_BYTES
+            )
+            if not records:
+                return
+            
+            if not self._replay_records(records):
+                logger.info(f"스풀 재전송 실패, {self.config.SPOOL_DRAIN_INTERVAL}초 후 재시도 "
+                            f"(대기 {self.spool.pending_bytes()} bytes)")
+                return
+            
+            self.spool.commit(position)
+            logger.info(f"스풀 재전송 완료: {len(records)}건 (남은 {self.spool.pending_bytes()} bytes)")
+    
+    # ==================== 수집/전송 단계 (스케줄러 작업) ====================
+    
+    def node_stage(self):
+        """노드 메트릭 수집 단계 (NODE_METRICS_INTERVAL 주기)"""
+        with telemetry.timed('node_collect'):
+            node_metrics = self.collect_node_metrics()
+        if not node_metrics:
+            return
+        
+        if self.config.COLLECTOR_MODE == 'pull':
+            with self.snapshot_lock:
+                self.snapshot['node'] = node_metrics
+                self.snapshot['node_seq'] += 1
+        else:
+            with self.outbox_lock:
+                self.pending_nodes.append(node_metrics)
+    
+    def pod_stage(self):
+        """파드 메트릭 수집 단계 (POD_METRICS_INTERVAL 주기)"""
+        with telemetry.timed('pod_collect'):
+            pod_metrics_list = self.collect_pod_metrics()
+        if not pod_metrics_list:
+            return
+        
+        if self.config.COLLECTOR_MODE == 'pull':
+            with self.snapshot_lock:
+                self.snapshot['pods'] = pod_metrics_list
+                self.snapshot['pod_seq'] += 1
+        else:
+            with self.outbox_lock:
+                self.pending_pod_sweeps.append(pod_metrics_list)
+    
+    def send_stage(self):
+        """수집된 메트릭 전송 단계 (COLLECTION_INTERVAL 주기)"""
+        with self.outbox_lock:
+            nodes, self.pending_nodes = self.pending_nodes, []
+            pod_sweeps, self.pending_pod_sweeps = self.pending_pod_sweeps, []
+        
+        if not nodes and not pod_sweeps:
+            return
+        
+        if self.config.ENABLE_BATCH_SEND:
+            # 노드 샘플과 파드 수집 결과를 순서대로 짝지어 배치 구성 (주기가 같으면 배치 1개)
+            batches = []
+            for i in range(max(len(nodes), len(pod_sweeps))):
+                batches.append({
+                    'node': nodes[i] if i < len(nodes) else None,
+                    'pods': pod_sweeps[i] if i < len(pod_sweeps) else []
+                })
+            self.send_batches_to_api_server(batches)
+        else:
+            # 항목별 개별 전송
+            for node_metrics in nodes:
+                endpoint = f"/api/nodes/{self.config.NODE_NAME}/metrics"
+                self.deliver_metrics(node_metrics, endpoint)
+            
+            for pod_metrics_list in pod_sweeps:
+                for pod_metric in pod_metrics_list:
+                    endpoint = f"/api/namespaces/{pod_metric['namespace']}/pods/{pod_metric['pod_name']}/metrics"
+                    self.deliver_metrics(pod_metric, endpoint)
+    
+    def snapshot_response(self):
+        """pull 모드 /snapshot 응답 (JSON 본문, Content-Type)"""
+        with self.snapshot_lock:
+            body = json.dumps(self.snapshot, separators=(',', ':'))
+        return body.encode('utf-8'), 'application/json'
+    
+    def spool_stage(self):
+        """스풀 재전송 단계 (SPOOL_DRAIN_INTERVAL 주기)"""
+        if self.spool.has_backlog():
+            with telemetry.timed('spool_replay'):
+                self.drain_spool()
     
     def run_collection_loop(self):
-        """메인 수집 루프"""
+        """
+        메인 수집 루프
+        노드 수집, 파드 수집, 고빈도 샘플링, 전송, 스풀 재전송을 각자의 주기로 독립 실행 (monotonic 틱, 드리프트 없음)
+        pull 모드에서는 전송/스풀 단계 없이 최신 결과만 /snapshot으로 제공
+        """
         logger.info("메트릭 수집 시작")
         
-        while not self.shutdown_event.is_set():
-            try:
-                # 노드 메트릭 수집 및 전송
-                if self.config.ENABLE_NODE_METRICS:
-                    node_metrics = self.collect_node_metrics()
-                    if node_metrics:
-                        # API 서버에 POST 엔드포인트가 있다면 전송
-                        endpoint = f"/api/nodes/{self.config.NODE_NAME}/metrics"
-                        success = self.send_metrics_to_api_server(node_metrics, endpoint)
-                        if not success:
-                            self.save_metrics_locally(node_metrics, "node")
-                
-                # 파드 메트릭 수집 및 전송
-                if self.config.ENABLE_POD_METRICS:
-                    pod_metrics_list = self.collect_pod_metrics()
-                    for pod_metric in pod_metrics_list:
-                        endpoint = f"/api/namespaces/{pod_metric['namespace']}/pods/{pod_metric['pod_name']}/metrics"
-                        success = self.send_metrics_to_api_server(pod_metric, endpoint)
-                        if not success:
-                            self.save_metrics_locally(pod_metric, f"pod_{pod_metric['pod_name']}")
-                
-                # 다음 수집까지 대기
-                if not self.shutdown_event.wait(self.config.COLLECTION_INTERVAL):
-                    continue
-                else:
-                    break
-                    
-            except KeyboardInterrupt:
-                logger.info("수집 중단 요청 받음")
-                break
-            except Exception as e:
-                logger.error(f"수집 루프 중 오류: {e}")
-                time.sleep(5)  # 에러 발생 시 5초 대기 후 재시도
+        self.scheduler = Scheduler()
+        if self.config.ENABLE_NODE_METRICS:
+            self.scheduler.add('node', self.config.NODE_METRICS_INTERVAL, self.node_stage)
+        if self.config.ENABLE_POD_METRICS:
+            self.scheduler.add('pod', self.config.POD_METRICS_INTERVAL, self.pod_stage)
+        if self.config.COLLECTOR_MODE == 'push':
+            # 같은 틱에 수집된 결과를 싣도록 전송은 약간 늦게 시작
+            self.scheduler.add('send', self.config.COLLECTION_INTERVAL, self.send_stage,
+                               offset=self.config.SEND_STAGE_OFFSET)
+            self.scheduler.add('spool', self.config.SPOOL_DRAIN_INTERVAL, self.spool_stage)
+        if self.sampler:
+            self.scheduler.add('sample', self.config.SAMPLE_INTERVAL, self.sampler.sample)
+        
+        self.scheduler.run()
         
         logger.info("메트릭 수집 종료")
     
@@ -289,6 +589,18 @@ class ResourceCollector:
             
             logger.info(f"Resource Collector 시작 - Node: {self.config.NODE_NAME}")
             
+            # 자체 성능 지표 엔드포인트 시작
+            if self.config.TELEMETRY_PORT:
+                self.telemetry_server = TelemetryServer(telemetry, self.config.TELEMETRY_PORT,
+                                                        self.config.TELEMETRY_BIND)
+                if self.config.COLLECTOR_MODE == 'pull':
+                    self.telemetry_server.add_route('/snapshot', self.snapshot_response)
+                self.telemetry_server.start()
+            
+            # 파드 캐시 list+watch 시작 (백그라운드)
+            if self.config.ENABLE_POD_METRICS:
+                self.pod_informer.start()
+            
             # 수집 루프 시작
             self.run_collection_loop()
             
@@ -300,6 +612,16 @@ class ResourceCollector:
         """collector 중지"""
         logger.info("Collector 중지 요청")
         self.shutdown_event.set()
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        self.pod_informer.stop()
+        if self.telemetry_server is not None:
+            self.telemetry_server.stop()
+        self.pod_sampling_pool.shutdown(wait=False)
+        self.spool.close()
+        self.transport.close()
+        if self.kube_client is not None:
+            self.kube_client.close()
 
 def main():
     """메인 엔트리포인트"""
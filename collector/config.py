@@ -9,16 +9,44 @@ class CollectorConfig:
     API_TIMEOUT = int(os.getenv('API_TIMEOUT', '10'))
     API_RETRY_COUNT = int(os.getenv('API_RETRY_COUNT', '3'))
     API_RETRY_DELAY = int(os.getenv('API_RETRY_DELAY', '2'))
+    ENABLE_BATCH_SEND = os.getenv('ENABLE_BATCH_SEND', 'true').lower() == 'true'  # 노드+파드를 1회 요청으로 전송
+    API_POOL_SIZE = int(os.getenv('API_POOL_SIZE', '2'))  # keep-alive 커넥션 풀 크기
+    API_COMPRESSION = os.getenv('API_COMPRESSION', 'gzip')  # gzip, zstd, none
+    API_COMPRESSION_MIN_BYTES = int(os.getenv('API_COMPRESSION_MIN_BYTES', '1024'))  # 이보다 작은 요청은 압축하지 않음
+    API_WIRE_FORMAT = os.getenv('API_WIRE_FORMAT', 'json').lower()  # json, compact (배치 전송 바이너리 형식)
+    
+    # 수집 모드: push (API 서버로 전송) / pull (API 서버가 /snapshot을 주기적으로 가져감)
+    COLLECTOR_MODE = os.getenv('COLLECTOR_MODE', 'push').lower()
+    
+    # 전송 실패 스풀 설정
+    SPOOL_DIR = os.getenv('SPOOL_DIR', '/tmp/collector-spool')
+    SPOOL_SEGMENT_BYTES = int(os.getenv('SPOOL_SEGMENT_BYTES', str(1024 * 1024)))  # 세그먼트 파일 크기 (1MB)
+    SPOOL_MAX_BYTES = int(os.getenv('SPOOL_MAX_BYTES', str(64 * 1024 * 1024)))  # 스풀 전체 상한 (64MB)
+    SPOOL_MAX_AGE_SECONDS = int(os.getenv('SPOOL_MAX_AGE_SECONDS', '86400'))  # 보관 기간 (24시간)
+    SPOOL_DRAIN_INTERVAL = int(os.getenv('SPOOL_DRAIN_INTERVAL', '5'))  # 재전송 확인 주기 (초)
+    SPOOL_REPLAY_BATCH = int(os.getenv('SPOOL_REPLAY_BATCH', '20'))  # 재전송 1회당 최대 레코드 수
+    SPOOL_REPLAY_MAX_BYTES = int(os.getenv('SPOOL_REPLAY_MAX_BYTES', str(512 * 1024)))  # 재전송 1회당 최대 바이트
     
     # 수집 주기 설정 (초 단위)
-    COLLECTION_INTERVAL = int(os.getenv('COLLECTION_INTERVAL', '30'))
-    NODE_METRICS_INTERVAL = int(os.getenv('NODE_METRICS_INTERVAL', '30'))
-    POD_METRICS_INTERVAL = int(os.getenv('POD_METRICS_INTERVAL', '30'))
+    COLLECTION_INTERVAL = int(os.getenv('COLLECTION_INTERVAL', '30'))  # 전송 주기
+    NODE_METRICS_INTERVAL = int(os.getenv('NODE_METRICS_INTERVAL', str(COLLECTION_INTERVAL)))
+    POD_METRICS_INTERVAL = int(os.getenv('POD_METRICS_INTERVAL', str(COLLECTION_INTERVAL)))
+    SEND_STAGE_OFFSET = float(os.getenv('SEND_STAGE_OFFSET', '2'))  # 수집 틱 이후 전송 시작 지연 (초)
+    SAMPLE_INTERVAL = float(os.getenv('SAMPLE_INTERVAL', '1'))  # 고빈도 샘플링 주기 (0이면 비활성화)
+    ENABLE_POD_SAMPLING = os.getenv('ENABLE_POD_SAMPLING', 'true').lower() == 'true'  # 파드 cgroup 고빈도 샘플링
     
     # Kubernetes 설정
     NODE_NAME = os.getenv('NODE_NAME')  # DaemonSet에서 자동 주입
     NAMESPACE_FILTER = os.getenv('NAMESPACE_FILTER', '')  # 빈 문자열이면 모든 네임스페이스
     EXCLUDE_NAMESPACES = os.getenv('EXCLUDE_NAMESPACES', 'kube-system,kube-public').split(',')
+    POD_WATCH_TIMEOUT = int(os.getenv('POD_WATCH_TIMEOUT', '300'))  # 파드 watch 재연결 주기 (초)
+    CGROUP_ROOT = os.getenv('CGROUP_ROOT', '/sys/fs/cgroup')
+    POD_SAMPLING_WORKERS = int(os.getenv('POD_SAMPLING_WORKERS', '4'))  # 파드 동시 샘플링 워커 수
+    POD_SAMPLE_TIMEOUT = float(os.getenv('POD_SAMPLE_TIMEOUT', '2'))  # 파드 1개 샘플링 제한 시간 (초)
+    
+    # 자체 성능 지표 (Prometheus text 형식 /metrics, 0이면 비활성화)
+    TELEMETRY_PORT = int(os.getenv('TELEMETRY_PORT', '9105'))
+    TELEMETRY_BIND = os.getenv('TELEMETRY_BIND', '0.0.0.0')
     
     # 로깅 설정
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -55,6 +83,25 @@ class CollectorConfig:
         if cls.COLLECTION_INTERVAL < 5:
             raise ValueError("COLLECTION_INTERVAL은 최소 5초 이상이어야 합니다")
         
+        if cls.NODE_METRICS_INTERVAL < 1 or cls.POD_METRICS_INTERVAL < 1:
+            raise ValueError("NODE_METRICS_INTERVAL, POD_METRICS_INTERVAL은 최소 1초 이상이어야 합니다")
+        
+        if cls.SAMPLE_INTERVAL < 0 or (0 < cls.SAMPLE_INTERVAL and
+                                       cls.SAMPLE_INTERVAL >= min(cls.NODE_METRICS_INTERVAL, cls.POD_METRICS_INTERVAL)):
+            raise ValueError("SAMPLE_INTERVAL은 0(비활성화)이거나 수집 주기보다 짧아야 합니다")
+        
+        if cls.COLLECTOR_MODE not in ('push', 'pull'):
+            raise ValueError("COLLECTOR_MODE는 push 또는 pull이어야 합니다")
+        
+        if cls.COLLECTOR_MODE == 'pull' and not cls.TELEMETRY_PORT:
+            raise ValueError("pull 모드에서는 /snapshot 제공을 위해 TELEMETRY_PORT가 필요합니다")
+        
+        if cls.API_WIRE_FORMAT not in ('json', 'compact'):
+            raise ValueError("API_WIRE_FORMAT은 json 또는 compact여야 합니다")
+        
+        if cls.POD_SAMPLING_WORKERS < 1:
+            raise ValueError("POD_SAMPLING_WORKERS는 1 이상이어야 합니다")
+        
         if not cls.API_SERVER_URL:
             raise ValueError("API_SERVER_URL이 설정되지 않았습니다")
     
@@ -65,6 +112,13 @@ class CollectorConfig:
         print(f"API Server URL: {cls.API_SERVER_URL}")
         print(f"Node Name: {cls.NODE_NAME}")
         print(f"Collection Interval: {cls.COLLECTION_INTERVAL}s")
+        print(f"Node/Pod Metrics Interval: {cls.NODE_METRICS_INTERVAL}s / {cls.POD_METRICS_INTERVAL}s")
+        print(f"Sample Interval: {cls.SAMPLE_INTERVAL}s" if cls.SAMPLE_INTERVAL else "Sample Interval: disabled")
+        print(f"Collector Mode: {cls.COLLECTOR_MODE}")
+        print(f"Batch Send: {cls.ENABLE_BATCH_SEND}")
+        print(f"Compression: {cls.API_COMPRESSION}")
+        print(f"Wire Format: {cls.API_WIRE_FORMAT}")
+        print(f"Telemetry Port: {cls.TELEMETRY_PORT or 'disabled'}")
         print(f"Debug Mode: {cls.DEBUG_MODE}")
         print(f"Dry Run: {cls.DRY_RUN}")
         print(f"Log Level: {cls.LOG_LEVEL}")
@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ACCOUNT_DIR = '/var/run/secrets/kubernetes.io/serviceaccount'
+
+class KubeApiError(Exception):
+    """apiserver 오류 응답"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+class KubeClient:
+    """
+    클러스터 내부용 최소 apiserver REST 클라이언트
+    - load_incluster_config()와 같은 서비스 어카운트 토큰/CA 사용
+    - 응답은 모델 객체 없이 JSON dict 그대로 반환
+    """
+
+    TOKEN_REFRESH_INTERVAL = 60  # bound 토큰 교체 반영을 위한 토큰 파일 재읽기 주기 (초)
+
+    def __init__(self, host: str, token_path: str, ca_path: str, timeout: float = 10.0):
+        self.host = host.rstrip('/')
+        self.token_path = token_path
+        self.timeout = timeout
+        self._token = None
+        self._token_read_time = 0.0
+
+        self.session = requests.Session()
+        self.session.verify = ca_path
+        self.session.headers.update({'Accept': 'application/json'})
+
+    @classmethod
+    def in_cluster(cls, timeout: float = 10.0) -> Optional['KubeClient']:
+        """파드 내부 환경이면 클라이언트 생성, 아니면 None"""
+        host = os.getenv('KUBERNETES_SERVICE_HOST')
+        port = os.getenv('KUBERNETES_SERVICE_PORT')
+        token_path = os.path.join(SERVICE_ACCOUNT_DIR, 'token')
+        ca_path = os.path.join(SERVICE_ACCOUNT_DIR, 'ca.crt')
+        if not (host and port and os.path.exists(token_path) and os.path.exists(ca_path)):
+            return None
+
+        if ':' in host:  # IPv6
+            host = f"[{host}]"
+        return cls(f"https://{host}:{port}", token_path, ca_path, timeout)
+
+    def _headers(self) -> Dict[str, str]:
+        now = time.monotonic()
+        if self._token is None or now - self._token_read_time >= self.TOKEN_REFRESH_INTERVAL:
+            with open(self.token_path, 'r') as f:
+                self._token = f.read().strip()
+            self._token_read_time = now
+        return {'Authorization': f"Bearer {self._token}"}
+
+    @staticmethod
+    def _raise_for_status(response: requests.Response):
+        if response.status_code >= 400:
+            try:
+                message = response.json().get('message', response.text)
+            except ValueError:
+                message = response.text
+            raise KubeApiError(response.status_code, message)
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET 요청, JSON 응답 반환"""
+        response = self.session.get(f"{self.host}{path}", params=params, headers=self._headers(),
+                                    timeout=self.timeout)
+        self._raise_for_status(response)
+        return response.json()
+
+    def watch(self, path: str, params: Dict[str, Any], timeout_seconds: int) -> Iterator[Dict[str, Any]]:
+        """watch 스트림, 이벤트 dict ({"type", "object"}) 를 한 줄씩 반환"""
+        params = dict(params, watch='true', timeoutSeconds=timeout_seconds)
+        # 읽기 타임아웃은 서버측 watch 타임아웃보다 길게
+        with self.session.get(f"{self.host}{path}", params=params, headers=self._headers(),
+                              timeout=(self.timeout, timeout_seconds + 30), stream=True) as response:
+            self._raise_for_status(response)
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def close(self):
+        self.session.close()
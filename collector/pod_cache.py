@@ -0,0 +1,316 @@
+import logging
+from collections import namedtuple
+from threading import Thread, Event, Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cgroups import CgroupResolver
+from kube_client import KubeClient, KubeApiError
+from telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+# 노드에 배치된 파드 정보 (kubernetes 모델 객체 대신 가벼운 튜플)
+# owner_kind/owner_name: 컨트롤러 ownerReference (ReplicaSet은 소유 Deployment로 해석), replicaset: 경유한 ReplicaSet 이름
+PodInfo = namedtuple('PodInfo', ['uid', 'namespace', 'name', 'phase', 'host_network', 'container_ids', 'cgroup_path',
+                                 'owner_kind', 'owner_name', 'replicaset'])
+
+def controller_owner(owner_references) -> Tuple[Optional[str], Optional[str]]:
+    """ownerReferences JSON 목록에서 controller 소유자 (kind, name), 없으면 (None, None)"""
+    for reference in owner_references or []:
+        if reference.get('controller'):
+            return reference.get('kind'), reference.get('name')
+    return None, None
+
+class ResourceVersionExpired(Exception):
+    """watch 재개용 resourceVersion 만료 (HTTP 410 Gone) - 전체 list 필요"""
+
+class KubernetesPodSource:
+    """kubernetes 클라이언트 기반 노드 범위 파드 list/watch 소스"""
+
+    def __init__(self, core_v1, apps_v1, node_name: str):
+        self.core_v1 = core_v1
+        self.apps_v1 = apps_v1
+        self.field_selector = f"spec.nodeName={node_name}"
+
+    def list_pods(self) -> Tuple[List[PodInfo], str]:
+        """노드의 파드 전체 목록과 resourceVersion 반환"""
+        pods = self.core_v1.list_pod_for_all_namespaces(field_selector=self.field_selector)
+        return [self._to_pod_info(pod) for pod in pods.items], pods.metadata.resource_version
+
+    def watch_pods(self, resource_version: str, timeout_seconds: int) -> Iterator[Tuple[str, Optional[PodInfo], str]]:
+        """resourceVersion부터 파드 변경 이벤트 스트림 (event_type, pod, resource_version)"""
+        from kubernetes import watch
+        from kubernetes.client.rest import ApiException
+
+        watcher = watch.Watch()
+        try:
+            for event in watcher.stream(
+                self.core_v1.list_pod_for_all_namespaces,
+                field_selector=self.field_selector,
+                resource_version=resource_version,
+                timeout_seconds=timeout_seconds,
+                allow_watch_bookmarks=True
+            ):
+                pod = event['object']
+                rv = pod.metadata.resource_version
+                if event['type'] == 'BOOKMARK':
+                    yield 'BOOKMARK', None, rv
+                else:
+                    yield event['type'], self._to_pod_info(pod), rv
+        except ApiException as e:
+            if e.status == 410:
+                raise ResourceVersionExpired(str(e))
+            raise
+        finally:
+            watcher.stop()
+
+    def replicaset_owner(self, namespace: str, name: str) -> Tuple[Optional[str], Optional[str]]:
+        """ReplicaSet의 controller 소유자 (kind, name), ReplicaSet이 없으면 (None, None)"""
+        from kubernetes.client.rest import ApiException
+
+        try:
+            replicaset = self.apps_v1.read_namespaced_replica_set(name, namespace)
+        except ApiException as e:
+            if e.status == 404:
+                return None, None
+            raise
+        return self._controller_owner(replicaset.metadata.owner_references)
+
+    @staticmethod
+    def _controller_owner(owner_references) -> Tuple[Optional[str], Optional[str]]:
+        for reference in owner_references or []:
+            if reference.controller:
+                return reference.kind, reference.name
+        return None, None
+
+    @staticmethod
+    def _to_pod_info(pod) -> PodInfo:
+        """kubernetes 모델 객체를 PodInfo로 변환"""
+        container_ids = []
+        for status in (pod.status.container_statuses or []):
+            if status.container_id:
+                # "containerd://<id>" 형태에서 런타임 접두사 제거
+                container_ids.append(status.container_id.split('://', 1)[-1])
+
+        owner_kind, owner_name = KubernetesPodSource._controller_owner(pod.metadata.owner_references)
+        return PodInfo(
+            uid=pod.metadata.uid,
+            namespace=pod.metadata.namespace,
+            name=pod.metadata.name,
+            phase=pod.status.phase,
+            host_network=bool(pod.spec.host_network),
+            container_ids=tuple(container_ids),
+            cgroup_path=None,
+            owner_kind=owner_kind,
+            owner_name=owner_name,
+            replicaset=None
+        )
+
+class RestPodSource:
+    """경량 REST 클라이언트 기반 노드 범위 파드 list/watch 소스 (kubernetes 패키지 불필요)"""
+
+    PODS_PATH = '/api/v1/pods'
+    REPLICASET_PATH = '/apis/apps/v1/namespaces/{namespace}/replicasets/{name}'
+
+    def __init__(self, client: KubeClient, node_name: str):
+        self.client = client
+        self.field_selector = f"spec.nodeName={node_name}"
+
+    def list_pods(self) -> Tuple[List[PodInfo], str]:
+        """노드의 파드 전체 목록과 resourceVersion 반환"""
+        pods = self.client.get(self.PODS_PATH, {'fieldSelector': self.field_selector})
+        return [self._to_pod_info(pod) for pod in pods.get('items') or []], pods['metadata']['resourceVersion']
+
+    def watch_pods(self, resource_version: str, timeout_seconds: int) -> Iterator[Tuple[str, Optional[PodInfo], str]]:
+        """resourceVersion부터 파드 변경 이벤트 스트림 (event_type, pod, resource_version)"""
+        params = {
+            'fieldSelector': self.field_selector,
+            'resourceVersion': resource_version,
+            'allowWatchBookmarks': 'true'
+        }
+        try:
+            for event in self.client.watch(self.PODS_PATH, params, timeout_seconds):
+                event_type = event.get('type')
+                pod = event.get('object') or {}
+                if event_type == 'ERROR':
+                    # watch 도중 만료는 410 Status 객체로 전달됨
+                    if pod.get('code') == 410:
+                        raise ResourceVersionExpired(pod.get('message', ''))
+                    raise KubeApiError(pod.get('code', 500), pod.get('message', ''))
+
+                rv = pod.get('metadata', {}).get('resourceVersion')
+                if event_type == 'BOOKMARK':
+                    yield 'BOOKMARK', None, rv
+                else:
+                    yield event_type, self._to_pod_info(pod), rv
+        except KubeApiError as e:
+            if e.status == 410:
+                raise ResourceVersionExpired(str(e))
+            raise
+
+    def replicaset_owner(self, namespace: str, name: str) -> Tuple[Optional[str], Optional[str]]:
+        """ReplicaSet의 controller 소유자 (kind, name), ReplicaSet이 없으면 (None, None)"""
+        try:
+            replicaset = self.client.get(self.REPLICASET_PATH.format(namespace=namespace, name=name))
+        except KubeApiError as e:
+            if e.status == 404:
+                return None, None
+            raise
+        return controller_owner(replicaset.get('metadata', {}).get('ownerReferences'))
+
+    @staticmethod
+    def _to_pod_info(pod: Dict) -> PodInfo:
+        """파드 JSON을 PodInfo로 변환"""
+        metadata = pod.get('metadata', {})
+        spec = pod.get('spec', {})
+        status = pod.get('status', {})
+
+        container_ids = []
+        for container_status in status.get('containerStatuses') or []:
+            container_id = container_status.get('containerID')
+            if container_id:
+                container_ids.append(container_id.split('://', 1)[-1])
+
+        owner_kind, owner_name = controller_owner(metadata.get('ownerReferences'))
+        return PodInfo(
+            uid=metadata.get('uid'),
+            namespace=metadata.get('namespace'),
+            name=metadata.get('name'),
+            phase=status.get('phase'),
+            host_network=bool(spec.get('hostNetwork')),
+            container_ids=tuple(container_ids),
+            cgroup_path=None,
+            owner_kind=owner_kind,
+            owner_name=owner_name,
+            replicaset=None
+        )
+
+class OwnerResolver:
+    """
+    ReplicaSet -> Deployment 매핑 캐시
+    ReplicaSet 이름은 pod-template-hash마다 새로 만들어지고 소유자가 바뀌지 않으므로 한 번 조회한 결과를 재사용
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.owners: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]] = {}  # (namespace, rs) -> (kind, name)
+
+    def resolve(self, pod: PodInfo) -> PodInfo:
+        """ReplicaSet 소유 파드의 소유자를 ReplicaSet의 controller(Deployment 등)로 치환"""
+        if pod.owner_kind != 'ReplicaSet' or not pod.owner_name:
+            return pod
+
+        key = (pod.namespace, pod.owner_name)
+        owner = self.owners.get(key)
+        if owner is None:
+            try:
+                owner = self.owners[key] = self.source.replicaset_owner(pod.namespace, pod.owner_name)
+            except Exception as e:
+                # 조회 실패는 캐시하지 않음 (다음 relist/이벤트에서 재시도), 이번에는 ReplicaSet을 소유자로 사용
+                logger.warning(f"ReplicaSet {pod.namespace}/{pod.owner_name} 소유자 조회 실패: {e}")
+                return pod
+
+        kind, name = owner
+        if kind is None:
+            # 단독 ReplicaSet (또는 이미 삭제됨)
+            return pod
+        return pod._replace(owner_kind=kind, owner_name=name, replicaset=pod.owner_name)
+
+    def retain(self, pods: Iterable[PodInfo]):
+        """현재 파드가 참조하는 ReplicaSet 항목만 남김 (relist 시 호출, 캐시 크기 제한)"""
+        keys = {(pod.namespace, pod.replicaset or pod.owner_name) for pod in pods
+                if pod.replicaset or pod.owner_kind == 'ReplicaSet'}
+        self.owners = {key: owner for key, owner in self.owners.items() if key in keys}
+
+class PodInformer:
+    """
+    노드 범위 파드 list+watch 캐시
+    - 최초 1회 list 후 watch 이벤트로 인덱스 갱신 (resourceVersion으로 재개)
+    - 410 Gone 시에만 전체 list 재수행
+    - 수집 루프는 메모리 인덱스만 읽으므로 apiserver 응답을 기다리지 않음
+    """
+
+    def __init__(self, source, watch_timeout: int = 300, retry_delay: float = 5.0,
+                 cgroup_resolver: CgroupResolver = None):
+        self.source = source
+        self.watch_timeout = watch_timeout
+        self.retry_delay = retry_delay
+        self.cgroup_resolver = cgroup_resolver or CgroupResolver()
+        self.owner_resolver = OwnerResolver(source)
+
+        self.lock = Lock()
+        self.pods: Dict[str, PodInfo] = {}  # uid -> PodInfo
+        self.resource_version: Optional[str] = None
+
+        self.synced = Event()
+        self.shutdown_event = Event()
+        self._thread: Optional[Thread] = None
+
+    def relist(self):
+        """전체 list로 인덱스 재구성"""
+        with telemetry.timed('pod_list'):
+            pods, resource_version = self.source.list_pods()
+        pods = [self.owner_resolver.resolve(pod) for pod in pods]
+        self.owner_resolver.retain(pods)
+        index = {pod.uid: pod for pod in pods}
+        with self.lock:
+            self.pods = index
+            self.resource_version = resource_version
+        self.synced.set()
+        logger.info(f"파드 캐시 동기화 완료: {len(index)}개 파드 (resourceVersion={resource_version})")
+
+    def apply_event(self, event_type: str, pod: Optional[PodInfo], resource_version: Optional[str]):
+        """watch 이벤트 1건을 인덱스에 반영"""
+        if event_type in ('ADDED', 'MODIFIED') and pod is not None:
+            # 캐시에 없는 ReplicaSet만 apiserver 조회 (lock 밖에서)
+            pod = self.owner_resolver.resolve(pod)
+        with self.lock:
+            if event_type in ('ADDED', 'MODIFIED') and pod is not None:
+                self.pods[pod.uid] = pod
+            elif event_type == 'DELETED' and pod is not None:
+                self.pods.pop(pod.uid, None)
+
+            if resource_version:
+                self.resource_version = resource_version
+
+    def watch_once(self):
+        """현재 resourceVersion부터 watch 1회 수행 (타임아웃 시 정상 반환)"""
+        if self.resource_version is None:
+            self.relist()
+
+        try:
+            for event_type, pod, resource_version in self.source.watch_pods(self.resource_version, self.watch_timeout):
+                if self.shutdown_event.is_set():
+                    return
+                self.apply_event(event_type, pod, resource_version)
+        except ResourceVersionExpired:
+            logger.info("resourceVersion 만료, 파드 목록 재동기화")
+            with self.lock:
+                self.resource_version = None
+
+    def run(self):
+        """list+watch 루프 (백그라운드 스레드)"""
+        while not self.shutdown_event.is_set():
+            try:
+                self.watch_once()
+            except Exception as e:
+                logger.warning(f"파드 watch 실패, {self.retry_delay}초 후 재시도: {e}")
+                self.shutdown_event.wait(self.retry_delay)
+
+    def start(self):
+        """백그라운드 watch 스레드 시작"""
+        self._thread = Thread(target=self.run, name='pod-informer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """watch 스레드 중지"""
+        self.shutdown_event.set()
+
+    def running_pods(self) -> List[PodInfo]:
+        """실행 중인 파드 목록 (메모리 인덱스 스냅샷, cgroup 경로 포함)"""
+        with self.lock:
+            pods = [pod for pod in self.pods.values() if pod.phase == 'Running']
+
+        # cgroup 경로는 인덱스에서 조회 (새 파드는 QoS 클래스별 후보 경로만 확인)
+        cgroup_paths = self.cgroup_resolver.resolve(pod.uid for pod in pods)
+        return [pod._replace(cgroup_path=cgroup_paths.get(pod.uid)) for pod in pods]
@@ -0,0 +1,139 @@
+import math
+import time
+import logging
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from utils import ResourceParser, PodResourceParser
+
+logger = logging.getLogger(__name__)
+
+class SummaryAccumulator:
+    """보고 주기 동안의 고빈도 샘플을 min/max/mean/last/p95 요약으로 집계"""
+
+    def __init__(self):
+        self.values: List[float] = []
+
+    def add(self, value: float):
+        self.values.append(value)
+
+    def summary(self) -> Optional[Dict[str, float]]:
+        if not self.values:
+            return None
+        ordered = sorted(self.values)
+        # nearest-rank p95
+        p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+        return {
+            'min': ordered[0],
+            'max': ordered[-1],
+            'mean': round(sum(ordered) / len(ordered), 2),
+            'last': self.values[-1],
+            'p95': p95,
+            'count': len(ordered)
+        }
+
+class HighFrequencySampler:
+    """
+    보고 주기보다 짧은 간격(SAMPLE_INTERVAL)으로 값싼 카운터만 샘플링
+    - 노드: /proc/stat CPU, /proc/meminfo 메모리
+    - 파드: cgroup CPU 누적 시간, 메모리
+    노드/파드 수집 단계에서 take_*_summary()로 요약을 꺼내 샘플에 첨부 (꺼낼 때 초기화)
+    샘플링 대상 파드는 파드 수집 단계가 update_pods()로 갱신 (cgroup 인덱스를 직접 조회하지 않음)
+    """
+
+    def __init__(self, cgroup_version: int, sample_pods: bool = True):
+        self.cgroup_version = cgroup_version
+        self.sample_pods = sample_pods
+        self.lock = Lock()
+        self.pods: List[Tuple[str, str, Optional[str]]] = []  # (uid, memory 경로, cpu 경로)
+
+        self.prev_node_cpu: Dict[str, int] = {}
+        self.prev_pod_cpu: Dict[str, Tuple[float, int]] = {}  # uid -> (monotonic, cpu_ns)
+
+        self.node_accumulators: Dict[str, SummaryAccumulator] = {}
+        self.pod_accumulators: Dict[str, Dict[str, SummaryAccumulator]] = {}
+
+    @staticmethod
+    def _add(accumulators: Dict[str, SummaryAccumulator], metric: str, value: float):
+        accumulator = accumulators.get(metric)
+        if accumulator is None:
+            accumulator = accumulators[metric] = SummaryAccumulator()
+        accumulator.add(value)
+
+    def update_pods(self, pods: List[Tuple[str, str, Optional[str]]]):
+        """샘플링 대상 파드 목록 교체"""
+        self.pods = pods
+
+    def sample(self):
+        """고빈도 샘플 1회 (스케줄러 작업)"""
+        self._sample_node()
+        if self.sample_pods:
+            self._sample_pods()
+
+    def _sample_node(self):
+        curr_cpu = ResourceParser.parse_cpu_stats()
+        memory_bytes = ResourceParser.calculate_memory_usage(ResourceParser.parse_memory_info())
+
+        with self.lock:
+            if self.prev_node_cpu and curr_cpu:
+                cpu_percentage = ResourceParser.calculate_cpu_percentage(self.prev_node_cpu, curr_cpu)
+                self._add(self.node_accumulators, 'cpu_millicores',
+                          ResourceParser.cpu_percentage_to_millicores(cpu_percentage))
+            if memory_bytes:
+                self._add(self.node_accumulators, 'memory_bytes', memory_bytes)
+            self.prev_node_cpu = curr_cpu
+
+    def _sample_pods(self):
+        now = time.monotonic()
+        samples = []
+
+        for uid, memory_path, cpu_path in self.pods:
+            cpu_ns = PodResourceParser.parse_pod_cpu_usage(cpu_path, self.cgroup_version) if cpu_path else None
+            memory_bytes = PodResourceParser.parse_pod_memory_usage(memory_path, self.cgroup_version)
+            samples.append((uid, cpu_ns, memory_bytes))
+
+        with self.lock:
+            current_uids = set()
+            for uid, cpu_ns, memory_bytes in samples:
+                current_uids.add(uid)
+                accumulators = self.pod_accumulators.setdefault(uid, {})
+                if cpu_ns is not None:
+                    prev = self.prev_pod_cpu.get(uid)
+                    if prev and now > prev[0]:
+                        # ns / (s * 1e6) = millicores
+                        cpu_millicores = int(max(0, cpu_ns - prev[1]) / ((now - prev[0]) * 1e6))
+                        self._add(accumulators, 'cpu_millicores', cpu_millicores)
+                    self.prev_pod_cpu[uid] = (now, cpu_ns)
+                self._add(accumulators, 'memory_bytes', memory_bytes)
+
+            # 사라진 파드 정리
+            for uid in list(self.pod_accumulators):
+                if uid not in current_uids:
+                    self.prev_pod_cpu.pop(uid, None)
+                    del self.pod_accumulators[uid]
+
+    @staticmethod
+    def _summarize(accumulators: Dict[str, SummaryAccumulator]) -> Optional[Dict[str, Dict[str, float]]]:
+        summary = {}
+        for metric, accumulator in accumulators.items():
+            metric_summary = accumulator.summary()
+            if metric_summary:
+                summary[metric] = metric_summary
+        return summary or None
+
+    def take_node_summary(self) -> Optional[Dict[str, Dict[str, float]]]:
+        """노드 보고 주기 요약 반환 후 초기화"""
+        with self.lock:
+            summary = self._summarize(self.node_accumulators)
+            self.node_accumulators = {}
+        return summary
+
+    def take_pod_summary(self, uid: str) -> Optional[Dict[str, Dict[str, float]]]:
+        """파드 보고 주기 요약 반환 후 초기화"""
+        with self.lock:
+            accumulators = self.pod_accumulators.get(uid)
+            if not accumulators:
+                return None
+            summary = self._summarize(accumulators)
+            self.pod_accumulators[uid] = {}
+        return summary
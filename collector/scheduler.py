@@ -0,0 +1,86 @@
+import time
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+from telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+class PeriodicTask:
+    """
+    고정 주기 작업 (monotonic 기준, 드리프트 없음)
+    - n번째 실행 시각 = 시작 시각 + n * interval (실행 시간만큼 밀리지 않음)
+    - 실행이 다음 틱을 넘기면 overrun으로 기록하고 놓친 틱은 건너뜀
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], None], offset: float = 0.0):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.offset = offset  # 같은 주기 작업들이 동시에 몰리지 않도록 시작 지연
+        self.runs = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.last_duration = 0.0
+
+    async def run(self, stop_event: asyncio.Event):
+        start = time.monotonic() + self.offset
+        tick = 0
+
+        while not stop_event.is_set():
+            delay = start + tick * self.interval - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=delay)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+
+            began = time.monotonic()
+            try:
+                # 블로킹 I/O 작업은 스레드에서 실행하여 다른 작업을 막지 않음
+                await asyncio.to_thread(self.func)
+            except Exception as e:
+                logger.error(f"[{self.name}] 작업 실행 중 오류: {e}")
+            self.last_duration = time.monotonic() - began
+            self.runs += 1
+
+            tick += 1
+            behind = time.monotonic() - (start + tick * self.interval)
+            if behind > 0:
+                missed = int(behind // self.interval) + 1
+                tick += missed
+                self.overruns += 1
+                self.skipped_ticks += missed
+                telemetry.increment('scheduler_overruns')
+                telemetry.increment('scheduler_skipped_ticks', missed)
+                logger.warning(f"[{self.name}] 주기 초과: 실행 {self.last_duration:.2f}s > "
+                               f"주기 {self.interval}s, 틱 {missed}개 건너뜀")
+
+class Scheduler:
+    """독립 주기 작업들을 asyncio 이벤트 루프에서 동시에 실행"""
+
+    def __init__(self):
+        self.tasks: List[PeriodicTask] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    def add(self, name: str, interval: float, func: Callable[[], None], offset: float = 0.0) -> PeriodicTask:
+        task = PeriodicTask(name, interval, func, offset)
+        self.tasks.append(task)
+        return task
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        await asyncio.gather(*(task.run(self._stop_event) for task in self.tasks))
+
+    def run(self):
+        """모든 작업 실행 (stop() 호출 시까지 블로킹)"""
+        asyncio.run(self._main())
+
+    def stop(self):
+        """다른 스레드/시그널 핸들러에서 호출 가능"""
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
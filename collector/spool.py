@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import logging
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class MetricsSpool:
+    """
+    전송 실패 메트릭용 세그먼트 기반 append-only 스풀
+    - 레코드는 한 줄짜리 compact JSON ({"t": epoch, "e": endpoint, "p": payload})
+    - 세그먼트 크기(segment_bytes)마다 새 파일로 교체
+    - 전체 크기(max_bytes)/보관 기간(max_age_seconds) 초과 시 가장 오래된 세그먼트부터 삭제
+    - cursor 파일에 재전송 위치(세그먼트, 오프셋)를 기록하여 재시작 후에도 순서대로 이어서 재전송
+    """
+
+    SEGMENT_SUFFIX = '.seg'
+    CURSOR_FILE = 'cursor'
+
+    def __init__(self, directory: str, segment_bytes: int, max_bytes: int, max_age_seconds: int):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.lock = Lock()
+        self.dropped_records = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.segments: List[int] = self._discover_segments()  # 오래된 순 세그먼트 번호
+        self.sizes: Dict[int, int] = {seq: os.path.getsize(self._segment_path(seq)) for seq in self.segments}
+        self.cursor: Tuple[int, int] = self._load_cursor()
+        self._active_file = None
+
+        if self.segments:
+            logger.info(f"스풀 복구: 세그먼트 {len(self.segments)}개, {self.pending_bytes()} bytes 재전송 대기")
+
+    # ==================== 파일 관리 ====================
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:012d}{self.SEGMENT_SUFFIX}")
+
+    def _discover_segments(self) -> List[int]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.SEGMENT_SUFFIX):
+                try:
+                    segments.append(int(name[:-len(self.SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(segments)
+
+    def _load_cursor(self) -> Tuple[int, int]:
+        try:
+            with open(os.path.join(self.directory, self.CURSOR_FILE), 'r') as f:
+                seq, offset = f.read().split()
+                return int(seq), int(offset)
+        except (OSError, ValueError):
+            return (self.segments[0] if self.segments else 0), 0
+
+    def _save_cursor(self):
+        # 임시 파일에 쓰고 rename하여 원자적으로 교체
+        path = os.path.join(self.directory, self.CURSOR_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f"{self.cursor[0]} {self.cursor[1]}")
+        os.replace(tmp_path, path)
+
+    def _close_active(self):
+        if self._active_file is not None:
+            self._active_file.close()
+            self._active_file = None
+
+    def _delete_segment(self, seq: int):
+        if self._active_file is not None and seq == self.segments[-1]:
+            self._close_active()
+        try:
+            os.remove(self._segment_path(seq))
+        except OSError:
+            pass
+        self.segments.remove(seq)
+        self.sizes.pop(seq, None)
+
+    def _enforce_limits(self):
+        """크기/보관 기간 상한 초과 시 가장 오래된 세그먼트 삭제 (활성 세그먼트 제외)"""
+        now = time.time()
+        while len(self.segments) > 1:
+            oldest = self.segments[0]
+            too_big = sum(self.sizes.values()) > self.max_bytes
+            too_old = now - os.path.getmtime(self._segment_path(oldest)) > self.max_age_seconds
+            if not (too_big or too_old):
+                break
+
+            # 삭제되는 미전송 레코드 수 집계
+            start = self.cursor[1] if self.cursor[0] == oldest else 0
+            with open(self._segment_path(oldest), 'rb') as f:
+                f.seek(start)
+                dropped = sum(1 for _ in f)
+            self.dropped_records += dropped
+            logger.warning(f"스풀 상한 초과로 세그먼트 {oldest} 삭제 (레코드 {dropped}개 유실)")
+
+            self._delete_segment(oldest)
+            if self.cursor[0] <= oldest:
+                self.cursor = (self.segments[0], 0)
+                self._save_cursor()
+
+    # ==================== 쓰기 ====================
+
+    def append(self, endpoint: str, payload) -> bool:
+        """레코드 1건 추가"""
+        record = json.dumps({'t': time.time(), 'e': endpoint, 'p': payload}, separators=(',', ':'))
+        data = (record + '\n').encode('utf-8')
+
+        try:
+            with self.lock:
+                if not self.segments or self.sizes[self.segments[-1]] >= self.segment_bytes:
+                    self._close_active()
+                    seq = self.segments[-1] + 1 if self.segments else max(self.cursor[0], 1)
+                    self.segments.append(seq)
+                    self.sizes[seq] = 0
+                    if len(self.segments) == 1:
+                        self.cursor = (seq, 0)
+                        self._save_cursor()
+
+                if self._active_file is None:
+                    self._active_file = open(self._segment_path(self.segments[-1]), 'ab')
+
+                self._active_file.write(data)
+                self._active_file.flush()
+                self.sizes[self.segments[-1]] += len(data)
+
+                self._enforce_limits()
+            return True
+        except Exception as e:
+            logger.error(f"스풀 저장 실패: {e}")
+            return False
+
+    # ==================== 재전송 ====================
+
+    def has_backlog(self) -> bool:
+        """재전송 대기 레코드 존재 여부"""
+        with self.lock:
+            return self._pending_bytes_locked() > 0
+
+    def _pending_bytes_locked(self) -> int:
+        pending = 0
+        for seq in self.segments:
+            if seq == self.cursor[0]:
+                pending += self.sizes[seq] - self.cursor[1]
+            elif seq > self.cursor[0]:
+                pending += self.sizes[seq]
+        return pending
+
+    def pending_bytes(self) -> int:
+        """재전송 대기 바이트 수"""
+        with self.lock:
+            return self._pending_bytes_locked()
+
+    def read_batch(self, max_records: int, max_bytes: int) -> Tuple[List[Dict], Optional[Tuple[int, int]]]:
+        """
+        cursor부터 순서대로 최대 max_records개(max_bytes 이내) 레코드 읽기
+        Returns: (레코드 목록, 전송 성공 시 commit할 위치)
+        """
+        with self.lock:
+            records = []
+            total_bytes = 0
+            seq, offset = self.cursor
+
+            for segment in self.segments:
+                if segment < seq:
+                    continue
+                if segment > seq:
+                    seq, offset = segment, 0
+
+                with open(self._segment_path(seq), 'rb') as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            break  # 기록 중이거나 손상된 마지막 줄
+                        if records and total_bytes + len(line) > max_bytes:
+                            return records, (seq, offset)
+                        offset += len(line)
+                        try:
+                            records.append(json.loads(line))
+                            total_bytes += len(line)
+                        except ValueError:
+                            logger.warning(f"손상된 스풀 레코드 건너뜀 (세그먼트 {seq})")
+                            continue
+                        if len(records) >= max_records:
+                            return records, (seq, offset)
+
+            return records, ((seq, offset) if records else None)
+
+    def commit(self, position: Tuple[int, int]):
+        """전송 완료 위치까지 cursor 이동, 다 읽은 세그먼트 삭제"""
+        with self.lock:
+            self.cursor = position
+            for seq in list(self.segments):
+                fully_read = seq < position[0] or (seq == position[0] and position[1] >= self.sizes[seq])
+                if not fully_read:
+                    break
+                is_active = seq == self.segments[-1]
+                self._delete_segment(seq)
+                if is_active:
+                    # 활성 세그먼트까지 모두 전송됨: 다음 append에서 새 세그먼트 생성
+                    self.cursor = (seq + 1, 0)
+            self._save_cursor()
+
+    def close(self):
+        with self.lock:
+            self._close_active()
@@ -0,0 +1,166 @@
+import os
+import time
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 단계별 소요 시간 히스토그램 버킷 (초)
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 형식)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class CollectorTelemetry:
+    """
+    collector 자체 성능 지표
+    - 단계별 소요 시간 히스토그램 (노드/파드 수집, 전송, 스풀 재전송, 파드 list 등)
+    - 카운터 (전송 재시도, 전송 실패 등)
+    - 게이지 (스풀 대기량, RSS 등은 scrape 시점에 콜백으로 읽음)
+    기록은 perf_counter 2회 + 버킷 탐색뿐이며, 포맷팅은 /metrics 요청 시에만 수행
+    """
+
+    PREFIX = 'collector'
+
+    def __init__(self):
+        self.lock = Lock()
+        self.histograms: Dict[str, Histogram] = {}  # phase -> 히스토그램
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}  # 이름 -> (설명, 콜백)
+
+    def observe(self, phase: str, seconds: float):
+        """단계 소요 시간 기록"""
+        with self.lock:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timed(self, phase: str):
+        """with 블록 소요 시간을 phase 히스토그램에 기록"""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - began)
+
+    def increment(self, name: str, amount: int = 1):
+        """카운터 증가"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def register_gauge(self, name: str, help_text: str, func: Callable[[], float]):
+        """scrape 시점에 읽을 게이지 등록"""
+        self.gauges[name] = (help_text, func)
+
+    def render(self) -> str:
+        """Prometheus text exposition 형식으로 출력"""
+        with self.lock:
+            histograms = {phase: (h.buckets, list(h.counts), h.sum, h.count) for phase, h in self.histograms.items()}
+            counters = dict(self.counters)
+
+        name = f"{self.PREFIX}_phase_duration_seconds"
+        lines = [f"# HELP {name} Duration of collector phases",
+                 f"# TYPE {name} histogram"]
+        for phase, (buckets, counts, total, count) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {total:.6f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {count}')
+
+        for counter, value in sorted(counters.items()):
+            metric = f"{self.PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        for gauge, (help_text, func) in sorted(self.gauges.items()):
+            try:
+                value = func()
+            except Exception as e:
+                logger.debug(f"게이지 {gauge} 읽기 실패: {e}")
+                continue
+            metric = f"{self.PREFIX}_{gauge}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+def read_rss_bytes(proc_root: str = '/proc') -> int:
+    """현재 프로세스 RSS (bytes), /proc/self/statm 두 번째 필드 x 페이지 크기"""
+    with open(os.path.join(proc_root, 'self', 'statm'), 'r') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    routes: Dict[str, Callable[[], Tuple[bytes, str]]] = {}  # 경로 -> (본문, Content-Type) 생성 함수
+
+    def do_GET(self):
+        route = self.routes.get(self.path.split('?', 1)[0])
+        if route is None:
+            self.send_error(404)
+            return
+        try:
+            body, content_type = route()
+        except Exception as e:
+            logger.error(f"{self.path} 응답 생성 실패: {e}")
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # scrape 요청마다 stderr에 찍히지 않도록 debug 로그로만 남김
+        logger.debug(f"telemetry {self.address_string()} {format % args}")
+
+class TelemetryServer:
+    """
+    /metrics 엔드포인트를 제공하는 경량 HTTP 서버 (백그라운드 스레드)
+    add_route()로 다른 GET 엔드포인트(pull 모드 /snapshot 등)를 함께 제공
+    """
+
+    def __init__(self, telemetry: CollectorTelemetry, port: int, host: str = '0.0.0.0'):
+        self.routes = {
+            '/metrics': lambda: (telemetry.render().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8')
+        }
+        handler = type('MetricsHandler', (_MetricsHandler,), {'routes': self.routes})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[Thread] = None
+
+    def add_route(self, path: str, func: Callable[[], Tuple[bytes, str]]):
+        """GET 경로 추가 (func는 (본문, Content-Type) 반환)"""
+        self.routes[path] = func
+
+    def start(self):
+        self._thread = Thread(target=self.server.serve_forever, name='telemetry', daemon=True)
+        self._thread.start()
+        logger.info(f"telemetry 엔드포인트 시작: :{self.server.server_address[1]}/metrics")
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+# 전역 인스턴스
+telemetry = CollectorTelemetry()
@@ -0,0 +1,70 @@
+"""
+cgroup 경로 인덱스 테스트: 임시 디렉터리에 kubepods 계층을 만들어 첫 스캔과 새 파드 후보 경로 확인을 검증
+collector 디렉터리에서 실행: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from cgroups import CgroupResolver
+
+UIDS = [f"{index:08x}-aaaa-bbbb-cccc-{index:012x}" for index in range(1, 7)]
+
+
+class CgroupResolverTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        # cgroup v2 통합 계층
+        open(os.path.join(self.root, 'cgroup.controllers'), 'w').close()
+
+    def make(self, relative):
+        os.makedirs(os.path.join(self.root, relative))
+        return relative
+
+    def test_initial_scan_then_probe_without_rescan(self):
+        slice_uid = UIDS[0].replace('-', '_')
+        expected = {
+            UIDS[0]: self.make(f"kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod{slice_uid}.slice")
+        }
+        resolver = CgroupResolver(self.root)
+        self.assertEqual(resolver.resolve([UIDS[0]]), {UIDS[0]: os.path.join(self.root, expected[UIDS[0]])})
+
+        # 이후 생긴 파드는 QoS 클래스별 후보 경로만 확인 (systemd/cgroupfs 표기 모두)
+        expected[UIDS[1]] = self.make(f"kubepods.slice/kubepods-pod{UIDS[1].replace('-', '_')}.slice")
+        expected[UIDS[2]] = self.make(
+            f"kubepods.slice/kubepods-besteffort.slice/kubepods-besteffort-pod{UIDS[2].replace('-', '_')}.slice")
+        expected[UIDS[3]] = self.make(f"kubepods/burstable/pod{UIDS[3]}")
+        with mock.patch.object(resolver, 'scan', side_effect=AssertionError('full rescan')):
+            resolved = resolver.resolve(UIDS[:4])
+        self.assertEqual(resolved, {uid: os.path.join(self.root, path) for uid, path in expected.items()})
+
+        # 사라진 파드는 인덱스에서 제거
+        self.assertEqual(list(resolver.resolve(UIDS[1:2])), [UIDS[1]])
+        self.assertEqual(set(resolver.index), {UIDS[1]})
+
+    def test_unresolved_uid_is_probed_again_after_interval(self):
+        resolver = CgroupResolver(self.root, rescan_interval=30)
+        clock = [1000.0]
+        with mock.patch('cgroups.time.monotonic', lambda: clock[0]), \
+                mock.patch.object(resolver, 'probe', wraps=resolver.probe) as probe:
+            self.assertEqual(resolver.resolve([UIDS[4]]), {})
+            self.assertEqual(probe.call_count, 1)
+
+            # cgroup이 늦게 생성되어도 rescan_interval 전에는 다시 확인하지 않음
+            self.make(f"kubepods/pod{UIDS[4]}")
+            clock[0] += 10
+            self.assertEqual(resolver.resolve([UIDS[4]]), {})
+            self.assertEqual(probe.call_count, 1)
+
+            clock[0] += 30
+            self.assertEqual(resolver.resolve([UIDS[4]]), {UIDS[4]: os.path.join(self.root, f"kubepods/pod{UIDS[4]}")})
+            self.assertEqual(probe.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
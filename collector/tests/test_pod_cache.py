@@ -0,0 +1,148 @@
+"""
+파드 list+watch 캐시 테스트: 가짜 소스로 최초 list, ADDED/MODIFIED/DELETED 반영, BOOKMARK resourceVersion 추적,
+410 Gone 후 relist 확인
+collector 디렉터리에서 실행: python -m unittest discover tests
+"""
+
+import unittest
+
+from pod_cache import PodInfo, PodInformer, ResourceVersionExpired, RestPodSource
+from kube_client import KubeApiError
+
+
+def pod(name, phase='Running', owner=('ReplicaSet', 'web-abc'), uid=None):
+    return PodInfo(uid=uid or f"uid-{name}", namespace='default', name=name, phase=phase, host_network=False,
+                   container_ids=(), cgroup_path=None, owner_kind=owner[0], owner_name=owner[1], replicaset=None)
+
+
+class FakePodSource:
+    """list 결과와 watch 호출마다 돌려줄 이벤트(또는 예외)를 미리 정해 두는 소스"""
+
+    def __init__(self, lists, watches):
+        self.lists = list(lists)  # [(pods, resource_version)]
+        self.watches = list(watches)  # [[(event_type, pod, resource_version)] 또는 예외]
+        self.list_calls = 0
+        self.watch_versions = []
+        self.replicaset_calls = []
+
+    def list_pods(self):
+        self.list_calls += 1
+        return self.lists.pop(0)
+
+    def watch_pods(self, resource_version, timeout_seconds):
+        self.watch_versions.append(resource_version)
+        events = self.watches.pop(0)
+        if isinstance(events, Exception):
+            raise events
+        yield from events
+
+    def replicaset_owner(self, namespace, name):
+        self.replicaset_calls.append((namespace, name))
+        return 'Deployment', name.rsplit('-', 1)[0]
+
+
+class FakeCgroupResolver:
+
+    def resolve(self, pod_uids):
+        return {uid: f"/sys/fs/cgroup/kubepods/pod{uid}" for uid in pod_uids}
+
+
+class PodInformerTest(unittest.TestCase):
+
+    def informer(self, source):
+        return PodInformer(source, cgroup_resolver=FakeCgroupResolver())
+
+    def test_initial_list(self):
+        source = FakePodSource([([pod('web-1'), pod('job-1', phase='Succeeded', owner=('Job', 'job'))], '100')], [[]])
+        informer = self.informer(source)
+        informer.watch_once()
+
+        self.assertTrue(informer.synced.is_set())
+        self.assertEqual(informer.resource_version, '100')
+        self.assertEqual(source.watch_versions, ['100'])
+        self.assertEqual(set(informer.pods), {'uid-web-1', 'uid-job-1'})
+        (running,) = informer.running_pods()
+        # ReplicaSet 소유 파드는 Deployment로 해석하고 cgroup 경로를 채움
+        self.assertEqual((running.owner_kind, running.owner_name, running.replicaset), ('Deployment', 'web', 'web-abc'))
+        self.assertEqual(running.cgroup_path, '/sys/fs/cgroup/kubepods/poduid-web-1')
+
+    def test_added_modified_deleted_events(self):
+        source = FakePodSource([([pod('web-1')], '100')], [[
+            ('ADDED', pod('web-2', phase='Pending'), '101'),
+            ('MODIFIED', pod('web-2'), '102'),
+            ('ADDED', pod('web-3'), '103'),
+            ('DELETED', pod('web-1'), '104'),
+        ]])
+        informer = self.informer(source)
+        informer.watch_once()
+
+        self.assertEqual(informer.resource_version, '104')
+        self.assertEqual(sorted(p.name for p in informer.running_pods()), ['web-2', 'web-3'])
+        # 같은 ReplicaSet은 한 번만 조회
+        self.assertEqual(source.replicaset_calls, [('default', 'web-abc')])
+        self.assertEqual(source.list_calls, 1)
+
+    def test_bookmark_advances_resource_version(self):
+        source = FakePodSource([([pod('web-1')], '100')], [
+            [('BOOKMARK', None, '150')],
+            [('BOOKMARK', None, '180')],
+        ])
+        informer = self.informer(source)
+        informer.watch_once()
+        informer.watch_once()
+
+        # 다음 watch는 bookmark의 resourceVersion부터 재개하고 relist하지 않음
+        self.assertEqual(source.watch_versions, ['100', '150'])
+        self.assertEqual(informer.resource_version, '180')
+        self.assertEqual(set(informer.pods), {'uid-web-1'})
+        self.assertEqual(source.list_calls, 1)
+
+    def test_relist_after_410_gone(self):
+        source = FakePodSource(
+            [([pod('web-1'), pod('web-2')], '100'), ([pod('web-2'), pod('web-4')], '300')],
+            [[('ADDED', pod('web-3'), '101')],
+             ResourceVersionExpired('too old resource version'),
+             []])
+        informer = self.informer(source)
+        informer.watch_once()
+        self.assertEqual(set(informer.pods), {'uid-web-1', 'uid-web-2', 'uid-web-3'})
+
+        informer.watch_once()
+        self.assertIsNone(informer.resource_version)
+
+        # 만료 후 다음 watch 전에 전체 list로 인덱스를 교체 (그 사이 삭제된 파드 제거)
+        informer.watch_once()
+        self.assertEqual(source.list_calls, 2)
+        self.assertEqual(source.watch_versions, ['100', '101', '300'])
+        self.assertEqual(set(informer.pods), {'uid-web-2', 'uid-web-4'})
+
+
+class FakeKubeClient:
+
+    def __init__(self, events):
+        self.events = events
+
+    def watch(self, path, params, timeout_seconds):
+        yield from self.events
+
+
+class RestPodSourceTest(unittest.TestCase):
+
+    def test_error_event_410_raises_expired(self):
+        source = RestPodSource(FakeKubeClient([{'type': 'ERROR', 'object': {'code': 410, 'message': 'gone'}}]), 'node-1')
+        with self.assertRaises(ResourceVersionExpired):
+            list(source.watch_pods('100', 10))
+
+    def test_bookmark_event(self):
+        events = [{'type': 'BOOKMARK', 'object': {'metadata': {'resourceVersion': '200'}}}]
+        source = RestPodSource(FakeKubeClient(events), 'node-1')
+        self.assertEqual(list(source.watch_pods('100', 10)), [('BOOKMARK', None, '200')])
+
+    def test_other_error_event_raises_api_error(self):
+        source = RestPodSource(FakeKubeClient([{'type': 'ERROR', 'object': {'code': 500, 'message': 'boom'}}]), 'node-1')
+        with self.assertRaises(KubeApiError):
+            list(source.watch_pods('100', 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
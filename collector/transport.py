@@ -0,0 +1,149 @@
+import gzip
+import json
+import time
+import logging
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from telemetry import telemetry
+from wire import CompactEncoder, COMPACT_CONTENT_TYPE
+
+try:
+    import zstandard
+except ImportError:  # zstd는 선택 의존성 (없으면 gzip 사용)
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+class MetricsTransport:
+    """API 서버 전송 계층 (keep-alive 커넥션 풀 + 압축 + 1회 직렬화)"""
+
+    SUPPORTED_ENCODINGS = ('gzip', 'zstd', 'none')
+    SUCCESS_STATUS = (200, 201, 207)
+    CONFLICT_STATUS = 409  # compact 세션 불일치
+
+    def __init__(self, config):
+        self.config = config
+        self.base_url = config.API_SERVER_URL.rstrip('/')
+        self.encoding = self._resolve_encoding(config.API_COMPRESSION)
+        self._zstd_compressor = zstandard.ZstdCompressor(level=3) if self.encoding == 'zstd' else None
+
+        # 영구 세션: 같은 TCP 커넥션을 재사용 (urllib3 풀)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=config.API_POOL_SIZE,
+            max_retries=0  # 재시도는 post()에서 직접 처리
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive'
+        })
+
+        # 배치 전송용 compact 바이너리 인코더 (API_WIRE_FORMAT=compact)
+        self.compact_encoder = CompactEncoder() if config.API_WIRE_FORMAT == 'compact' else None
+
+    @classmethod
+    def _resolve_encoding(cls, encoding: str) -> str:
+        """설정된 압축 방식 검증 (zstd 미설치 시 gzip으로 대체)"""
+        encoding = (encoding or 'none').lower()
+        if encoding not in cls.SUPPORTED_ENCODINGS:
+            logger.warning(f"지원하지 않는 압축 방식 '{encoding}', gzip 사용")
+            return 'gzip'
+        if encoding == 'zstd' and zstandard is None:
+            logger.warning("zstandard 패키지가 없어 gzip으로 대체")
+            return 'gzip'
+        return encoding
+
+    def encode(self, payload) -> Tuple[bytes, Dict[str, str]]:
+        """페이로드를 한 번만 직렬화/압축하여 (body, headers) 반환"""
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return self._compress(body, {})
+
+    def _compress(self, body: bytes, headers: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+        """설정된 방식으로 본문 압축 (작은 본문은 그대로)"""
+        # 작은 요청은 압축 오버헤드가 더 크므로 그대로 전송
+        if self.encoding == 'none' or len(body) < self.config.API_COMPRESSION_MIN_BYTES:
+            return body, headers
+
+        if self.encoding == 'zstd':
+            body = self._zstd_compressor.compress(body)
+        else:
+            body = gzip.compress(body, compresslevel=5)
+        headers['Content-Encoding'] = self.encoding
+        return body, headers
+
+    def post(self, endpoint: str, payload) -> Optional[requests.Response]:
+        """메트릭 POST (재시도 포함), 성공 응답 또는 None 반환"""
+        with telemetry.timed('encode'):
+            body, headers = self.encode(payload)
+
+        response = self._post_body(endpoint, body, headers)
+        if response is None or response.status_code not in self.SUCCESS_STATUS:
+            return None
+        return response
+
+    def post_compact(self, endpoint: str, batches) -> Optional[requests.Response]:
+        """
+        배치 목록을 compact 형식으로 POST
+        서버가 세션을 모르면(409) 새 세션으로 전체 값을 다시 전송
+        """
+        for _ in range(2):
+            with telemetry.timed('encode'):
+                body, state = self.compact_encoder.encode(batches)
+                body, headers = self._compress(body, {'Content-Type': COMPACT_CONTENT_TYPE})
+
+            response = self._post_body(endpoint, body, headers)
+            if response is None:
+                return None
+            if response.status_code == self.CONFLICT_STATUS:
+                logger.info(f"compact 세션 재설정: {response.text}")
+                self.compact_encoder.reset()
+                continue
+            if response.status_code not in self.SUCCESS_STATUS:
+                return None
+
+            self.compact_encoder.commit(state)
+            return response
+        return None
+
+    def _post_body(self, endpoint: str, body: bytes, headers: Dict[str, str]) -> Optional[requests.Response]:
+        """인코딩된 본문 POST (재시도 포함), 성공/409 응답 또는 None 반환"""
+        url = f"{self.base_url}{endpoint}"
+        telemetry.increment('sent_bytes', len(body))
+
+        for attempt in range(self.config.API_RETRY_COUNT):
+            if attempt > 0:
+                telemetry.increment('send_retries')
+            try:
+                with telemetry.timed('http_post'):
+                    response = self.session.post(
+                        url,
+                        data=body,
+                        headers=headers,
+                        timeout=self.config.API_TIMEOUT
+                    )
+
+                if response.status_code in self.SUCCESS_STATUS:
+                    logger.debug(f"메트릭 전송 성공: {endpoint} ({len(body)} bytes)")
+                    return response
+                elif response.status_code == self.CONFLICT_STATUS:
+                    # 재시도해도 같은 결과이므로 호출자가 처리
+                    return response
+                else:
+                    logger.warning(f"메트릭 전송 실패 (HTTP {response.status_code}): {response.text}")
+
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"메트릭 전송 시도 {attempt + 1} 실패: {e}")
+                if attempt < self.config.API_RETRY_COUNT - 1:
+                    time.sleep(self.config.API_RETRY_DELAY)
+
+        return None
+
+    def close(self):
+        """커넥션 풀 정리"""
+        self.session.close()
@@ -1,13 +1,176 @@
+import os
 import time
 import re
 import logging
-from typing import Dict, Optional, Tuple
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 주요 디스크 장치 필터 (파티션 제외)
+DISK_DEVICE_PATTERN = re.compile(r'^(sd[a-z]|nvme\d+n\d+|vd[a-z])$')
+
+# 노드 메모리 사용량 계산에 필요한 /proc/meminfo 필드
+MEMINFO_FIELDS = {b'MemTotal:': 'MemTotal', b'MemFree:': 'MemFree', b'Buffers:': 'Buffers', b'Cached:': 'Cached'}
+
+class ProcReader:
+    """
+    상태 유지 procfs 리더
+    - 파일 디스크립터를 열어둔 채 os.pread(offset 0)로 재읽기
+    - 필요한 필드만 파싱
+    - CPU 코어 수, 디스크/인터페이스 필터 결과 등 불변 값은 캐시
+    - 샘플러 스레드와 수집 단계 워커가 공유하므로 fd 캐시 변경/읽기/닫기는 lock으로 보호
+    """
+    
+    DEFAULT_BUFFER_SIZE = 8192
+    
+    def __init__(self, proc_root: str = '/proc'):
+        self.proc_root = proc_root
+        self._fds: Dict[str, int] = {}
+        self._buffer_sizes: Dict[str, int] = {}
+        self._device_filter: Dict[bytes, bool] = {}
+        self._interface_filter: Dict[bytes, bool] = {}
+        self._cpu_count: Optional[int] = None
+        self._lock = Lock()
+    
+    def _read(self, name: str, size: Optional[int] = None) -> bytes:
+        """
+        열린 fd에서 파일 처음부터 읽기
+        size를 지정하면 앞부분만 읽음 (첫 줄만 필요한 /proc/stat 등)
+        """
+        # 다른 스레드가 읽는 도중 fd를 닫거나 같은 이름으로 fd를 중복 생성하지 않도록 전체를 lock 안에서 처리
+        with self._lock:
+            fd = self._fds.get(name)
+            if fd is None:
+                fd = os.open(os.path.join(self.proc_root, name), os.O_RDONLY)
+                self._fds[name] = fd
+            
+            try:
+                if size is not None:
+                    return os.pread(fd, size, 0)
+                
+                # 버퍼가 가득 차면 크기를 늘려 다시 읽고, 늘린 크기는 기억
+                size = self._buffer_sizes.get(name, self.DEFAULT_BUFFER_SIZE)
+                while True:
+                    data = os.pread(fd, size, 0)
+                    if len(data) < size:
+                        self._buffer_sizes[name] = size
+                        return data
+                    size *= 2
+            except OSError:
+                # fd가 무효화된 경우 다음 호출에서 다시 열도록 정리
+                self._fds.pop(name, None)
+                os.close(fd)
+                raise
+    
+    @property
+    def cpu_count(self) -> int:
+        """CPU 코어 수 (최초 1회만 /proc/cpuinfo 읽기)"""
+        if self._cpu_count is None:
+            try:
+                with open(os.path.join(self.proc_root, 'cpuinfo'), 'rb') as f:
+                    cores = sum(1 for line in f if line.startswith(b'processor'))
+                self._cpu_count = cores if cores > 0 else 1
+            except Exception:
+                self._cpu_count = 1
+        return self._cpu_count
+    
+    def cpu_stats(self) -> Dict[str, int]:
+        """/proc/stat 첫 줄(cpu 합계)만 파싱"""
+        data = self._read('stat', 512)
+        fields = data[:data.index(b'\n')].split()
+        return {
+            'user': int(fields[1]),
+            'nice': int(fields[2]),
+            'system': int(fields[3]),
+            'idle': int(fields[4]),
+            'iowait': int(fields[5]) if len(fields) > 5 else 0,
+            'irq': int(fields[6]) if len(fields) > 6 else 0,
+            'softirq': int(fields[7]) if len(fields) > 7 else 0,
+        }
+    
+    def memory_info(self) -> Dict[str, int]:
+        """/proc/meminfo에서 사용량 계산에 필요한 필드만 파싱 (bytes)"""
+        memory_info = {}
+        for line in self._read('meminfo', 1024).split(b'\n'):
+            fields = line.split()
+            key = MEMINFO_FIELDS.get(fields[0]) if fields else None
+            if key:
+                # kB를 bytes로 변환
+                memory_info[key] = int(fields[1]) * 1024
+                if len(memory_info) == len(MEMINFO_FIELDS):
+                    break
+        return memory_info
+    
+    def disk_stats(self) -> Dict[str, Dict[str, int]]:
+        """/proc/diskstats에서 주요 디스크 장치 I/O 통계 파싱"""
+        disk_stats = {}
+        device_filter = self._device_filter
+        for line in self._read('diskstats').split(b'\n'):
+            fields = line.split()
+            if len(fields) < 14:
+                continue
+            device = fields[2]
+            keep = device_filter.get(device)
+            if keep is None:
+                keep = device_filter[device] = bool(DISK_DEVICE_PATTERN.match(device.decode()))
+            if keep:
+                disk_stats[device.decode()] = {
+                    'read_sectors': int(fields[5]),
+                    'write_sectors': int(fields[9]),
+                    'read_time': int(fields[6]),
+                    'write_time': int(fields[10])
+                }
+        return disk_stats
+    
+    def network_stats(self) -> Dict[str, Dict[str, int]]:
+        """/proc/net/dev에서 실제 네트워크 인터페이스 I/O 통계 파싱"""
+        network_stats = {}
+        interface_filter = self._interface_filter
+        for line in self._read('net/dev').split(b'\n')[2:]:  # 헤더 2줄 스킵
+            interface, sep, values = line.partition(b':')
+            if not sep:
+                continue
+            interface = interface.strip()
+            keep = interface_filter.get(interface)
+            if keep is None:
+                # 루프백/도커 브리지 제외
+                keep = interface_filter[interface] = interface != b'lo' and not interface.startswith(b'docker')
+            if keep:
+                values = values.split()
+                if len(values) >= 16:
+                    network_stats[interface.decode()] = {
+                        'rx_bytes': int(values[0]),
+                        'tx_bytes': int(values[8])
+                    }
+        return network_stats
+    
+    def close(self):
+        """열린 fd 정리"""
+        with self._lock:
+            for fd in self._fds.values():
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self._fds.clear()
+
 class ResourceParser:
     """시스템 리소스 파싱 및 변환 유틸리티"""
     
+    # 공유 procfs 리더 (fd 및 불변 값 캐시)
+    _reader: Optional[ProcReader] = None
+    _reader_lock = Lock()
+    
+    @staticmethod
+    def get_reader() -> ProcReader:
+        """공유 ProcReader 반환 (최초 호출 시 생성, 여러 스레드에서 호출해도 1개만 생성)"""
+        if ResourceParser._reader is None:
+            with ResourceParser._reader_lock:
+                if ResourceParser._reader is None:
+                    ResourceParser._reader = ProcReader()
+        return ResourceParser._reader
+    
     @staticmethod
     def parse_cpu_stats() -> Dict[str, int]:
         """
@@ -15,19 +178,7 @@ class ResourceParser:
         Returns: CPU 시간 정보 (user, nice, system, idle, iowait, irq, softirq)
         """
         try:
-            with open('/proc/stat', 'r') as f:
-                line = f.readline()
-                fields = line.split()
-                
-            return {
-                'user': int(fields[1]),
-                'nice': int(fields[2]),
-                'system': int(fields[3]),
-                'idle': int(fields[4]),
-                'iowait': int(fields[5]) if len(fields) > 5 else 0,
-                'irq': int(fields[6]) if len(fields) > 6 else 0,
-                'softirq': int(fields[7]) if len(fields) > 7 else 0,
-            }
+            return ResourceParser.get_reader().cpu_stats()
         except Exception as e:
             logger.error(f"CPU 통계 파싱 실패: {e}")
             return {}
@@ -74,31 +225,17 @@ class ResourceParser:
     
     @staticmethod
     def get_cpu_count() -> int:
-        """CPU 코어 수 반환"""
-        try:
-            with open('/proc/cpuinfo', 'r') as f:
-                cores = len([line for line in f if line.startswith('processor')])
-            return cores if cores > 0 else 1
-        except Exception:
-            return 1
+        """CPU 코어 수 반환 (캐시됨)"""
+        return ResourceParser.get_reader().cpu_count
     
     @staticmethod
     def parse_memory_info() -> Dict[str, int]:
         """
         /proc/meminfo에서 메모리 정보 파싱
-        Returns: 메모리 정보 (bytes 단위)
+        Returns: 메모리 사용량 계산에 필요한 필드 (bytes 단위)
         """
         try:
-            memory_info = {}
-            with open('/proc/meminfo', 'r') as f:
-                for line in f:
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        # kB를 bytes로 변환
-                        value_kb = int(re.findall(r'\d+', value)[0])
-                        memory_info[key.strip()] = value_kb * 1024
-            
-            return memory_info
+            return ResourceParser.get_reader().memory_info()
         except Exception as e:
             logger.error(f"메모리 정보 파싱 실패: {e}")
             return {}
@@ -127,21 +264,7 @@ class ResourceParser:
         Returns: 디바이스별 I/O 통계
         """
         try:
-            disk_stats = {}
-            with open('/proc/diskstats', 'r') as f:
-                for line in f:
-                    fields = line.split()
-                    if len(fields) >= 14:
-                        device = fields[2]
-                        # 주요 디스크 장치만 필터링 (파티션 제외)
-                        if re.match(r'^(sd[a-z]|nvme\d+n\d+|vd[a-z])$', device):
-                            disk_stats[device] = {
-                                'read_sectors': int(fields[5]),
-                                'write_sectors': int(fields[9]),
-                                'read_time': int(fields[6]),
-                                'write_time': int(fields[10])
-                            }
-            return disk_stats
+            return ResourceParser.get_reader().disk_stats()
         except Exception as e:
             logger.error(f"디스크 통계 파싱 실패: {e}")
             return {}
@@ -186,23 +309,7 @@ class ResourceParser:
         /proc/net/dev에서 네트워크 I/O 통계 파싱
         """
         try:
-            network_stats = {}
-            with open('/proc/net/dev', 'r') as f:
-                lines = f.readlines()[2:]  # 헤더 2줄 스킵
-                
-                for line in lines:
-                    parts = line.split(':')
-                    if len(parts) == 2:
-                        interface = parts[0].strip()
-                        # 루프백 인터페이스 제외, 실제 네트워크 인터페이스만
-                        if interface != 'lo' and not interface.startswith('docker'):
-                            values = parts[1].split()
-                            if len(values) >= 16:
-                                network_stats[interface] = {
-                                    'rx_bytes': int(values[0]),
-                                    'tx_bytes': int(values[8])
-                                }
-            return network_stats
+            return ResourceParser.get_reader().network_stats()
         except Exception as e:
             logger.error(f"네트워크 통계 파싱 실패: {e}")
             return {}
@@ -241,34 +348,13 @@ class PodResourceParser:
     """파드별 리소스 사용량 파싱"""
     
     @staticmethod
-    def get_pod_cgroup_path(pod_uid: str, container_id: str) -> Optional[str]:
-        """
-        파드/컨테이너의 cgroup 경로 찾기
-        """
-        # 일반적인 cgroup 경로들
-        possible_paths = [
-            f"/sys/fs/cgroup/memory/kubepods/pod{pod_uid}/{container_id}",
-            f"/sys/fs/cgroup/memory/kubepods.slice/kubepods-pod{pod_uid}.slice",
-            f"/sys/fs/cgroup/cpu/kubepods/pod{pod_uid}/{container_id}",
-        ]
-        
-        for path in possible_paths:
-            try:
-                import os
-                if os.path.exists(path):
-                    return path
-            except:
-                continue
-        
-        return None
-    
-    @staticmethod
-    def parse_pod_memory_usage(cgroup_path: str) -> int:
+    def parse_pod_memory_usage(cgroup_path: str, cgroup_version: int = 1) -> int:
         """
-        cgroup에서 파드 메모리 사용량 파싱
+        cgroup에서 파드 메모리 사용량 파싱 (v1: memory.usage_in_bytes, v2: memory.current)
         """
         try:
-            memory_usage_path = f"{cgroup_path}/memory.usage_in_bytes"
+            usage_file = 'memory.current' if cgroup_version == 2 else 'memory.usage_in_bytes'
+            memory_usage_path = f"{cgroup_path}/{usage_file}"
             with open(memory_usage_path, 'r') as f:
                 return int(f.read().strip())
         except Exception as e:
@@ -276,17 +362,183 @@ class PodResourceParser:
             return 0
     
     @staticmethod
-    def parse_pod_cpu_usage(cgroup_path: str) -> int:
+    def parse_pod_cpu_usage(cgroup_path: str, cgroup_version: int = 1) -> int:
         """
-        cgroup에서 파드 CPU 사용량 파싱 (nanoseconds)
+        cgroup에서 파드 누적 CPU 사용 시간 파싱 (nanoseconds)
+        v1: cpuacct.usage (ns), v2: cpu.stat의 usage_usec (us)
         """
         try:
+            if cgroup_version == 2:
+                with open(f"{cgroup_path}/cpu.stat", 'r') as f:
+                    for line in f:
+                        if line.startswith('usage_usec'):
+                            return int(line.split()[1]) * 1000
+                return 0
+            
             cpu_usage_path = f"{cgroup_path}/cpuacct.usage"
             with open(cpu_usage_path, 'r') as f:
                 return int(f.read().strip())
         except Exception as e:
             logger.debug(f"파드 CPU 사용량 파싱 실패: {e}")
             return 0
+    
+    @staticmethod
+    def parse_pod_io_stats(cgroup_path: str, cgroup_version: int = 1) -> Dict[str, int]:
+        """
+        cgroup에서 파드 누적 디스크 I/O 바이트 파싱 (모든 디바이스 합계)
+        v1: blkio.throttle.io_service_bytes(_recursive), v2: io.stat의 rbytes/wbytes
+        """
+        read_bytes = 0
+        write_bytes = 0
+        try:
+            if cgroup_version == 2:
+                # 예: "8:0 rbytes=1234 wbytes=5678 rios=1 wios=2 dbytes=0 dios=0"
+                with open(f"{cgroup_path}/io.stat", 'r') as f:
+                    for line in f:
+                        for field in line.split()[1:]:
+                            key, _, value = field.partition('=')
+                            if key == 'rbytes':
+                                read_bytes += int(value)
+                            elif key == 'wbytes':
+                                write_bytes += int(value)
+            else:
+                # 예: "8:0 Read 1234" / "8:0 Write 5678" / "Total 6912"
+                path = f"{cgroup_path}/blkio.throttle.io_service_bytes_recursive"
+                if not os.path.exists(path):
+                    path = f"{cgroup_path}/blkio.throttle.io_service_bytes"
+                with open(path, 'r') as f:
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) != 3:
+                            continue
+                        if fields[1] == 'Read':
+                            read_bytes += int(fields[2])
+                        elif fields[1] == 'Write':
+                            write_bytes += int(fields[2])
+        except Exception as e:
+            logger.debug(f"파드 디스크 I/O 파싱 실패: {e}")
+        
+        return {'read_bytes': read_bytes, 'write_bytes': write_bytes}
+    
+    @staticmethod
+    def find_pod_pid(cgroup_path: str) -> Optional[int]:
+        """
+        파드 cgroup에 속한 프로세스 PID 하나 찾기 (네트워크 네임스페이스 조회용)
+        파드 내 모든 컨테이너는 같은 netns를 공유하므로 한 프로세스면 충분
+        v2에서는 파드 디렉토리 자체에 프로세스가 없으므로 컨테이너 하위 디렉토리 탐색
+        """
+        candidates = [cgroup_path]
+        try:
+            with os.scandir(cgroup_path) as entries:
+                candidates.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            return None
+        
+        for path in candidates:
+            try:
+                with open(f"{path}/cgroup.procs", 'r') as f:
+                    line = f.readline().strip()
+                if line:
+                    return int(line)
+            except (OSError, ValueError):
+                continue
+        return None
+    
+    @staticmethod
+    def parse_pid_network_stats(pid: int) -> Optional[Dict[str, int]]:
+        """
+        /proc/<pid>/net/dev에서 프로세스 netns의 누적 네트워크 바이트 파싱 (lo 제외)
+        프로세스가 종료되었으면 None 반환
+        """
+        try:
+            with open(f"/proc/{pid}/net/dev", 'r') as f:
+                lines = f.readlines()[2:]  # 헤더 2줄 스킵
+        except OSError:
+            return None
+        
+        rx_bytes = 0
+        tx_bytes = 0
+        for line in lines:
+            interface, _, values = line.partition(':')
+            if interface.strip() == 'lo':
+                continue
+            values = values.split()
+            if len(values) >= 16:
+                rx_bytes += int(values[0])
+                tx_bytes += int(values[8])
+        return {'rx_bytes': rx_bytes, 'tx_bytes': tx_bytes}
+    
+    @staticmethod
+    def read_pod_counters(memory_path: str, cpu_path: Optional[str], io_path: Optional[str],
+                          cgroup_version: int, pid: Optional[int] = None,
+                          collect_disk_io: bool = True, collect_network_io: bool = True) -> Dict[str, Any]:
+        """
+        파드 누적 카운터를 한 번에 수집 (파일별 1회 읽기)
+        파드 cgroup은 모든 컨테이너를 포함하므로 컨테이너 전체 합계가 수집됨
+        pid가 None이거나 종료된 경우 cgroup에서 다시 찾음
+        """
+        counters = {
+            'memory_bytes': PodResourceParser.parse_pod_memory_usage(memory_path, cgroup_version),
+            'cpu_ns': PodResourceParser.parse_pod_cpu_usage(cpu_path, cgroup_version) if cpu_path else 0,
+            'read_bytes': 0,
+            'write_bytes': 0,
+            'rx_bytes': 0,
+            'tx_bytes': 0,
+            'pid': None
+        }
+        
+        if collect_disk_io and io_path:
+            disk = PodResourceParser.parse_pod_io_stats(io_path, cgroup_version)
+            counters['read_bytes'] = disk['read_bytes']
+            counters['write_bytes'] = disk['write_bytes']
+        
+        if collect_network_io:
+            network = PodResourceParser.parse_pid_network_stats(pid) if pid else None
+            if network is None:
+                pid = PodResourceParser.find_pod_pid(memory_path)
+                network = PodResourceParser.parse_pid_network_stats(pid) if pid else None
+            if network is not None:
+                counters['rx_bytes'] = network['rx_bytes']
+                counters['tx_bytes'] = network['tx_bytes']
+                counters['pid'] = pid
+        
+        return counters
+    
+    @staticmethod
+    def calculate_pod_usage(prev_counters: Dict[str, Any], curr_counters: Dict[str, Any],
+                            time_delta: float) -> Dict[str, Any]:
+        """
+        두 누적 카운터 간의 파드 사용량 계산
+        CPU는 millicores(사용률), 디스크/네트워크는 노드와 동일하게 구간 바이트 수
+        """
+        if not prev_counters or time_delta <= 0:
+            return {
+                'cpu_millicores': 0,
+                'disk_io': {'read_bytes': 0, 'write_bytes': 0},
+                'network_io': {'bytes_sent': 0, 'bytes_recv': 0}
+            }
+        
+        def delta(key):
+            # 컨테이너 재시작으로 카운터가 리셋되면 음수가 되므로 0으로 보정
+            return max(0, curr_counters[key] - prev_counters[key])
+        
+        # ns / (s * 1e9) = cores -> * 1000 = millicores
+        cpu_millicores = int(delta('cpu_ns') / (time_delta * 1e6))
+        
+        # 네트워크는 netns가 바뀌면(파드 재생성 등) 이전 값과 비교할 수 없음
+        same_netns = prev_counters.get('pid') == curr_counters.get('pid')
+        
+        return {
+            'cpu_millicores': cpu_millicores,
+            'disk_io': {
+                'read_bytes': delta('read_bytes'),
+                'write_bytes': delta('write_bytes')
+            },
+            'network_io': {
+                'bytes_sent': delta('tx_bytes') if same_netns else 0,
+                'bytes_recv': delta('rx_bytes') if same_netns else 0
+            }
+        }
 
 def format_bytes(bytes_value: int) -> str:
     """바이트 수를 사람이 읽기 쉬운 형태로 변환"""
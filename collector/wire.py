@@ -0,0 +1,183 @@
+import os
+import struct
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# compact 바이너리 전송 형식 (API 서버 services/wire.py와 동일한 정의)
+#   header  <4sQIH   magic 'KMC1', session_id, seq, frame 수
+#   frame   <dBH     노드 수집 시각(epoch 초), flags(bit0: 노드 레코드 포함, bit1: 스풀 재전송,
+#                    bit2: 파드 레코드별 수집 시각 오프셋 포함), 시리즈 정의 수
+#           정의     <HH + utf-8 "namespace/pod_name" (소유자가 있으면 + "\0kind\0name\0replicaset")
+#           노드 레코드, <H 파드 레코드 수, (<i 프레임 시각 대비 밀리초 오프셋 + 파드 레코드) x N
+#   레코드  <HB      series_id, mask + 변경된 필드의 델타 (bit7: int64, 아니면 int32) + 요약 (bit6)
+COMPACT_CONTENT_TYPE = 'application/x-metrics-compact'
+COMPACT_MAGIC = b'KMC1'
+
+COMPACT_FIELDS = ('cpu_millicores', 'memory_bytes', 'read_bytes', 'write_bytes', 'bytes_sent', 'bytes_recv')
+SUMMARY_METRICS = ('cpu_millicores', 'memory_bytes')
+OWNER_FIELDS = ('owner_kind', 'owner_name', 'replicaset_name')
+
+FRAME_NODE = 0x01
+FRAME_REPLAYED = 0x02
+FRAME_POD_TIMES = 0x04
+MASK_SUMMARY = 0x40
+MASK_WIDE = 0x80
+NODE_SERIES_ID = 0
+MAX_SERIES_ID = 0xFFFF
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+HEADER = struct.Struct('<4sQIH')
+FRAME = struct.Struct('<dBH')
+DEFINITION = struct.Struct('<HH')
+COUNT = struct.Struct('<H')
+TIME_OFFSET = struct.Struct('<i')
+RECORD = struct.Struct('<HB')
+SUMMARY_MASK = struct.Struct('<B')
+SUMMARY = struct.Struct('<qqqqqI')
+
+class SeriesOverflow(Exception):
+    """세션 내 시리즈 ID 소진 - 새 세션 필요"""
+
+class CompactEncoder:
+    """
+    노드/파드 배치를 compact 형식으로 인코딩
+    - 시리즈(namespace/pod_name + 소유자)는 세션마다 한 번만 정의하고 이후 ID로 참조
+    - 값은 서버가 마지막으로 받은(전송 성공한) 값 대비 변경된 필드만 델타로 전송
+    - encode()는 상태를 바꾸지 않고, 전송 성공 시 commit()으로 반영
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """새 세션 시작 (서버 409 응답 또는 시리즈 ID 소진 시)"""
+        self.session_id = int.from_bytes(os.urandom(8), 'little')
+        self.seq = 0
+        self.series: Dict[Tuple, int] = {}  # (namespace, pod_name, 소유자 필드...) -> series_id
+        self.values: Dict[int, List[int]] = {}  # series_id -> 서버가 가진 마지막 값
+        self.next_series_id = NODE_SERIES_ID + 1
+
+    def encode(self, batches: List[Dict]) -> Tuple[bytes, Tuple]:
+        """배치 목록을 메시지 1건으로 인코딩, (body, commit용 상태) 반환"""
+        try:
+            return self._encode(batches)
+        except SeriesOverflow:
+            logger.info("compact 시리즈 ID 소진, 새 세션 시작")
+            self.reset()
+            return self._encode(batches)
+
+    def _encode(self, batches: List[Dict]) -> Tuple[bytes, Tuple]:
+        new_series: Dict[Tuple, int] = {}
+        new_values: Dict[int, List[int]] = {}
+        next_series_id = self.next_series_id
+
+        parts = [HEADER.pack(COMPACT_MAGIC, self.session_id, self.seq, len(batches))]
+        for batch in batches:
+            node_metrics = batch.get('node')
+            pods = batch.get('pods') or []
+
+            definitions = []
+            pod_series = []
+            for pod in pods:
+                # 소유자가 바뀐 파드(또는 나중에 해석된 소유자)는 새 시리즈로 정의
+                key = (pod['namespace'], pod['pod_name']) + tuple(pod.get(field) or '' for field in OWNER_FIELDS)
+                series_id = self.series.get(key) or new_series.get(key)
+                if series_id is None:
+                    if next_series_id > MAX_SERIES_ID:
+                        raise SeriesOverflow()
+                    series_id = new_series[key] = next_series_id
+                    next_series_id += 1
+                    name = f"{key[0]}/{key[1]}"
+                    if any(key[2:]):
+                        name += '\0' + '\0'.join(key[2:])
+                    name = name.encode('utf-8')
+                    definitions.append(DEFINITION.pack(series_id, len(name)) + name)
+                pod_series.append(series_id)
+
+            # 파드는 각자의 수집 시각을 프레임(노드) 시각 대비 오프셋으로 전송
+            frame_epoch = self._epoch(node_metrics or (pods[0] if pods else None))
+            flags = (FRAME_NODE if node_metrics else 0) | (FRAME_REPLAYED if batch.get('replayed') else 0)
+            if pods:
+                flags |= FRAME_POD_TIMES
+            parts.append(FRAME.pack(frame_epoch, flags, len(definitions)))
+            parts.extend(definitions)
+            if node_metrics:
+                parts.append(self._encode_record(NODE_SERIES_ID, node_metrics, new_values))
+            parts.append(COUNT.pack(len(pods)))
+            for series_id, pod in zip(pod_series, pods):
+                parts.append(TIME_OFFSET.pack(self._time_offset(pod, frame_epoch)))
+                parts.append(self._encode_record(series_id, pod, new_values))
+
+        return b''.join(parts), (new_series, new_values, next_series_id)
+
+    def commit(self, state: Tuple):
+        """전송 성공한 메시지의 시리즈 정의/값을 기준 상태로 반영"""
+        new_series, new_values, next_series_id = state
+        self.series.update(new_series)
+        self.values.update(new_values)
+        self.next_series_id = next_series_id
+        self.seq += 1
+
+    @staticmethod
+    def _epoch(sample: Optional[Dict]) -> float:
+        """샘플 타임스탬프(ISO 8601)를 epoch 초로 변환"""
+        try:
+            return datetime.fromisoformat(sample['timestamp'].replace('Z', '+00:00')).timestamp()
+        except (TypeError, KeyError, ValueError):
+            return datetime.utcnow().timestamp()
+
+    @classmethod
+    def _time_offset(cls, sample: Dict, frame_epoch: float) -> int:
+        """프레임 시각 대비 샘플 수집 시각 오프셋 (밀리초, int32 범위로 제한)"""
+        offset = round((cls._epoch(sample) - frame_epoch) * 1000)
+        return min(max(offset, INT32_MIN), INT32_MAX)
+
+    def _encode_record(self, series_id: int, metrics: Dict, new_values: Dict[int, List[int]]) -> bytes:
+        disk_io = metrics.get('disk_io') or {}
+        network_io = metrics.get('network_io') or {}
+        values = [
+            int(metrics.get('cpu_millicores', 0)),
+            int(metrics.get('memory_bytes', 0)),
+            int(disk_io.get('read_bytes', 0)),
+            int(disk_io.get('write_bytes', 0)),
+            int(network_io.get('bytes_sent', 0)),
+            int(network_io.get('bytes_recv', 0))
+        ]
+        previous = new_values.get(series_id) or self.values.get(series_id) or [0] * len(COMPACT_FIELDS)
+        new_values[series_id] = values
+
+        mask = 0
+        deltas = []
+        for index, (value, last) in enumerate(zip(values, previous)):
+            if value != last:
+                mask |= 1 << index
+                deltas.append(value - last)
+        if any(delta < INT32_MIN or delta > INT32_MAX for delta in deltas):
+            mask |= MASK_WIDE
+
+        summary = metrics.get('summary')
+        if summary:
+            mask |= MASK_SUMMARY
+
+        data = RECORD.pack(series_id, mask)
+        if deltas:
+            data += struct.pack('<' + ('q' if mask & MASK_WIDE else 'i') * len(deltas), *deltas)
+
+        if summary:
+            metric_mask = 0
+            blocks = []
+            for index, metric in enumerate(SUMMARY_METRICS):
+                stats = summary.get(metric)
+                if stats:
+                    metric_mask |= 1 << index
+                    blocks.append(SUMMARY.pack(
+                        int(stats['min']), int(stats['max']), int(round(stats['mean'] * 100)),
+                        int(stats['last']), int(stats['p95']), int(stats.get('count', 0))
+                    ))
+            data += SUMMARY_MASK.pack(metric_mask) + b''.join(blocks)
+
+        return data